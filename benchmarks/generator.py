@@ -0,0 +1,218 @@
+"""Deterministic generator of realistic raw Mashov API payloads."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+import random
+from typing import Any
+
+SUBJECTS = [
+    "מתמטיקה",
+    "אנגלית",
+    "עברית",
+    "מדעים",
+    "היסטוריה",
+    "תנ״ך",
+    "גאוגרפיה",
+    "ספרות",
+    "חינוך גופני",
+    "אומנות",
+    "מוזיקה",
+    "חינוך",
+]
+ACHVA = [
+    (1, "השתתפות פעילה", 1),
+    (2, "איחור", -1),
+    (3, "חיסור", -1),
+    (4, "אי הכנת שיעורי בית", -1),
+    (5, "הצטיינות", 1),
+]
+GRADE_TYPES = ["מבחן", "בוחן", "עבודה", "שיעורי בית", "מבחן מסכם"]
+LESSONS_PER_DAY = {1: 8, 2: 8, 3: 8, 4: 8, 5: 7, 6: 5}  # Mashov day (Sunday=1) -> lessons
+
+
+def _iso(d: date) -> str:
+    return f"{d.isoformat()}T00:00:00"
+
+
+def _mashov_day(d: date) -> int:
+    return (d.weekday() + 1) % 7 + 1
+
+
+def _school_days(start: date, end: date):
+    d = start
+    while d <= end:
+        if _mashov_day(d) in LESSONS_PER_DAY:
+            yield d
+        d += timedelta(days=1)
+
+
+def generate_holidays(year: int) -> list[dict[str, Any]]:
+    first = date(year - 1, 9, 1)
+    spans = [(30, 3, "ראש השנה"), (45, 8, "סוכות"), (120, 8, "חנוכה"), (210, 14, "פסח"), (260, 1, "שבועות")]
+    return [
+        {
+            "id": i,
+            "hollyDayName": name,
+            "startDate": _iso(first + timedelta(days=offset)),
+            "endDate": _iso(first + timedelta(days=offset + length - 1)),
+        }
+        for i, (offset, length, name) in enumerate(spans, start=1)
+    ]
+
+
+def generate_student(rng: random.Random, index: int, year: int, today: date) -> dict[str, Any]:
+    """Raw payloads for one student over a full school year up to today."""
+    sid = f"bench-student-{index}"
+    groups = [
+        {"groupId": f"{sid}-g{g}", "subject": SUBJECTS[g % len(SUBJECTS)], "teacher": f"מורה {g + 1}"}
+        for g in range(len(SUBJECTS))
+    ]
+
+    timetable = []
+    for day, count in LESSONS_PER_DAY.items():
+        for lesson in range(1, count + 1):
+            grp = rng.choice(groups)
+            timetable.append(
+                {
+                    "timeTable": {
+                        "day": day,
+                        "lesson": lesson,
+                        "groupId": grp["groupId"],
+                        "roomNum": f"{rng.randint(1, 40)} ",
+                    },
+                    "groupDetails": {
+                        "subjectName": grp["subject"],
+                        "groupName": f"{grp['subject']} ה{index}",
+                        "groupTeachers": [{"teacherName": grp["teacher"]}],
+                    },
+                }
+            )
+    slots = {(t["timeTable"]["day"], t["timeTable"]["lesson"]): t for t in timetable}
+
+    year_start = date(year - 1, 9, 1)
+    history, homework, behavior = [], [], []
+    for d in _school_days(year_start, today):
+        for lesson in range(1, LESSONS_PER_DAY[_mashov_day(d)] + 1):
+            slot = slots[(_mashov_day(d), lesson)]
+            group_id = slot["timeTable"]["groupId"]
+            subject = slot["groupDetails"]["subjectName"]
+            lesson_id = f"{group_id}-{d.isoformat()}-{lesson}"
+            hw_text = f"עמודים {rng.randint(1, 200)}-{rng.randint(201, 300)}" if rng.random() < 0.15 else None
+            history.append(
+                {
+                    "lessonLog": {
+                        "lessonID": lesson_id,
+                        "groupId": group_id,
+                        "lessonDate": _iso(d),
+                        "lesson": lesson,
+                        "tookPlace": rng.random() > 0.03,
+                        "remark": None,
+                        "homeWork": hw_text,
+                        "lessontype": 0,
+                        "reporterGuid": f"teacher-{group_id}",
+                    },
+                    "groupName": slot["groupDetails"]["groupName"],
+                    "subjectName": subject,
+                }
+            )
+            if hw_text:
+                homework.append(
+                    {
+                        "lessonId": lesson_id,
+                        "lessonDate": _iso(d),
+                        "lesson": lesson,
+                        "homework": hw_text,
+                        "groupId": group_id,
+                        "remark": None,
+                        "studentGuid": sid,
+                        "subjectName": subject,
+                    }
+                )
+            if rng.random() < 0.12:
+                code, name, aval = rng.choice(ACHVA)
+                behavior.append(
+                    {
+                        "studentGuid": sid,
+                        "eventCode": rng.randint(1, 9999),
+                        "justified": -1,
+                        "lessonId": lesson_id,
+                        "reporterGuid": f"teacher-{group_id}",
+                        "timestamp": f"{d.isoformat()}T{7 + lesson:02d}:15:00",
+                        "groupId": group_id,
+                        "lessonType": 0,
+                        "lesson": lesson,
+                        "lessonDate": _iso(d),
+                        "lessonReporter": slot["groupDetails"]["groupTeachers"][0]["teacherName"],
+                        "achvaCode": code,
+                        "achvaName": name,
+                        "achvaAval": aval,
+                        "justificationId": 0,
+                        "justification": "",
+                        "reporter": slot["groupDetails"]["groupTeachers"][0]["teacherName"],
+                        "subject": subject,
+                    }
+                )
+
+    grades = []
+    school_days = list(_school_days(year_start, today))
+    for n in range(rng.randint(150, 300)):
+        grp = rng.choice(groups)
+        d = rng.choice(school_days)
+        grades.append(
+            {
+                "gradingEventId": n + index * 100000,
+                "gradingEvent": f"{rng.choice(GRADE_TYPES)} {n + 1}",
+                "grade": rng.randint(55, 100),
+                "textualGrade": "",
+                "teacherName": grp["teacher"],
+                "subjectName": grp["subject"],
+                "gradeType": rng.choice(GRADE_TYPES),
+                "gradeTypeId": 1,
+                "eventDate": _iso(d),
+                "gradingPeriod": 1 if d.month >= 9 or d.month == 1 else 2,
+                "groupId": grp["groupId"],
+                "studentGuid": sid,
+            }
+        )
+
+    week_start = today - timedelta(days=_mashov_day(today) - 1)
+    plans = []
+    for d in _school_days(week_start, week_start + timedelta(days=6)):
+        for lesson in range(1, LESSONS_PER_DAY[_mashov_day(d)] + 1):
+            slot = slots[(_mashov_day(d), lesson)]
+            plans.append(
+                {
+                    "groupid": slot["timeTable"]["groupId"],
+                    "lessondate": _iso(d),
+                    "lesson": lesson,
+                    "plan": f"נושא השיעור: פרק {rng.randint(1, 20)}",
+                }
+            )
+
+    return {
+        "child": {
+            "childGuid": sid,
+            "privateName": f"תלמיד{index}",
+            "familyName": "בדיקה",
+            "classCode": "ה",
+            "classNum": index,
+            "groups": [g["groupId"] for g in groups],
+        },
+        "homework": homework,
+        "behavior": behavior,
+        "weekly_plan": plans,
+        "timetable": timetable,
+        "lessons_history": history,
+        "grades": grades,
+    }
+
+
+def generate_dataset(students: int = 3, seed: int = 1234, year: int = 2025, today: date | None = None):
+    """Raw payloads for N students plus holidays; same arguments always give the same data."""
+    rng = random.Random(seed)
+    today = today or date(year, 6, 15)
+    return {
+        "students": [generate_student(rng, i + 1, year, today) for i in range(students)],
+        "holidays": generate_holidays(year),
+    }
@@ -0,0 +1,172 @@
+"""The hand-written per-endpoint normalizers replaced by normalizers.SPECS, kept as a benchmark baseline.
+
+Each loops over the payload building rows with .get() calls inside one try/except, so a
+malformed row drops every row after it. benchmarks.run times them against the spec-driven
+converters on the same payloads.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from custom_components.mashov.symbols import SymbolTable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LegacyNormalizers:
+    """The former MashovClient._normalize_<key> methods, bound to a symbol table."""
+
+    def __init__(self, symbols: SymbolTable):
+        self.symbols = symbols
+
+    def _normalize_weekly_plan(self, raw):
+        items = []
+        try:
+            for plan in raw or []:
+                items.append(
+                    {
+                        "group_id": plan.get("groupid"),
+                        "lesson_date": plan.get("lessondate"),
+                        "lesson": plan.get("lesson"),
+                        "plan": plan.get("plan"),
+                    }
+                )
+        except Exception as e:
+            _LOGGER.debug("normalize weekly plan failed: %s", e)
+        return items
+
+    def _normalize_timetable(self, raw):
+        """Keep timetable structure (timeTable/groupDetails) mostly intact for UI formatting."""
+        items = []
+
+        def group_details(it):
+            details = self.symbols.intern_fields((it or {}).get("groupDetails") or {})
+            for teacher in details.get("groupTeachers") or []:
+                if isinstance(teacher, dict):
+                    self.symbols.intern_fields(teacher)
+            return details
+
+        try:
+            if isinstance(raw, list):
+                for it in raw:
+                    # Ensure keys exist with sane defaults
+                    items.append(
+                        {
+                            "timeTable": (it or {}).get("timeTable") or {},
+                            "groupDetails": group_details(it),
+                        }
+                    )
+            elif isinstance(raw, dict):
+                # Some deployments may wrap data
+                data_list = raw.get("items") or raw.get("data") or []
+                for it in data_list:
+                    items.append(
+                        {
+                            "timeTable": (it or {}).get("timeTable") or {},
+                            "groupDetails": group_details(it),
+                        }
+                    )
+        except Exception as e:
+            _LOGGER.debug("normalize timetable failed: %s", e)
+        return items
+
+    def _normalize_homework(self, raw):
+        items = []
+        intern = self.symbols.intern
+        try:
+            for hw in raw or []:
+                items.append(
+                    {
+                        "lesson_id": hw.get("lessonId"),
+                        "lesson_date": hw.get("lessonDate"),
+                        "lesson": hw.get("lesson"),
+                        "homework": hw.get("homework"),
+                        "group_id": hw.get("groupId"),
+                        "remark": hw.get("remark"),
+                        "student_guid": hw.get("studentGuid"),
+                        "subject_name": intern(hw.get("subjectName")),
+                    }
+                )
+        except Exception as e:
+            _LOGGER.debug("normalize homework failed: %s", e)
+        return items
+
+    def _normalize_behavior(self, raw):
+        items = []
+        intern = self.symbols.intern
+        try:
+            for ev in raw or []:
+                items.append(
+                    {
+                        "student_guid": ev.get("studentGuid"),
+                        "event_code": ev.get("eventCode"),
+                        "justified": ev.get("justified"),
+                        "lesson_id": ev.get("lessonId"),
+                        "reporter_guid": ev.get("reporterGuid"),
+                        "timestamp": ev.get("timestamp"),
+                        "group_id": ev.get("groupId"),
+                        "lesson_type": ev.get("lessonType"),
+                        "lesson": ev.get("lesson"),
+                        "lesson_date": ev.get("lessonDate"),
+                        "lesson_reporter": intern(ev.get("lessonReporter")),
+                        "achva_code": ev.get("achvaCode"),
+                        "achva_name": intern(ev.get("achvaName")),
+                        "achva_aval": ev.get("achvaAval"),
+                        "justification_id": ev.get("justificationId"),
+                        "justification": ev.get("justification"),
+                        "reporter": intern(ev.get("reporter")),
+                        "subject": intern(ev.get("subject")),
+                    }
+                )
+        except Exception as e:
+            _LOGGER.debug("normalize behavior failed: %s", e)
+        return items
+
+    def _normalize_holidays(self, raw):
+        items = []
+        try:
+            for h in raw or []:
+                items.append(
+                    {
+                        "id": h.get("id"),
+                        "name": h.get("hollyDayName") or h.get("holidayName") or h.get("name"),
+                        "start": h.get("startDate"),
+                        "end": h.get("endDate"),
+                    }
+                )
+        except Exception as e:
+            _LOGGER.debug("normalize holidays failed: %s", e)
+        return items
+
+    def _normalize_lessons_history(self, raw):
+        items = []
+        intern = self.symbols.intern
+        try:
+            for r in raw or []:
+                log = r.get("lessonLog") or {}
+                items.append(
+                    {
+                        "lesson_id": log.get("lessonID"),
+                        "group_id": log.get("groupId"),
+                        "lesson_date": log.get("lessonDate"),
+                        "lesson": log.get("lesson"),
+                        "took_place": log.get("tookPlace"),
+                        "remark": log.get("remark"),
+                        "homework": log.get("homeWork"),
+                        "lessontype": log.get("lessontype"),
+                        "reporter_guid": log.get("reporterGuid"),
+                        "group_name": intern(r.get("groupName")),
+                        "subject_name": intern(r.get("subjectName")),
+                    }
+                )
+        except Exception as e:
+            _LOGGER.debug("normalize lessons history failed: %s", e)
+        return items
+
+    def _normalize_grades(self, raw):
+        """Normalize grades data."""
+        if not raw or not isinstance(raw, list):
+            return []
+        # Grades come already normalized from the API; only their names are interned (in place)
+        return [self.symbols.intern_fields(g) if isinstance(g, dict) else g for g in raw]
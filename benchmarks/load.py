@@ -0,0 +1,223 @@
+"""Drive many Mashov clients against the local stub server and report throughput and tail latency.
+
+Each client stands in for one config entry: it logs in, then runs rounds of async_fetch_all
+concurrently with every other client, as a `mashov.refresh_now` without entry_id would.
+
+Usage:
+    python -m benchmarks.load [--entries 20] [--students 2] [--rounds 5] [--latency 0.02]
+                              [--error-rate 0.05] [--session-ttl 2] [--payload-scale 1]
+                              [--respect-rate-limit] [--prewarm] [--verbose] [--output load_results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, date, datetime
+import json
+import logging
+import sys
+import time
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.mashov.const import (
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+from custom_components.mashov.mashov_client import MashovClient
+from custom_components.mashov.metrics import percentile
+from custom_components.mashov.rate_limiter import configure_rate_limits, rate_limit_diagnostics
+
+from .generator import generate_dataset
+from .stub_server import MashovStubServer
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+async def run_load(
+    entries: int = 20,
+    students: int = 2,
+    rounds: int = 5,
+    latency: float = 0.02,
+    latency_jitter: float = 0.01,
+    error_rate: float = 0.0,
+    session_ttl: float | None = None,
+    payload_scale: float = 1.0,
+    respect_rate_limit: bool = False,
+    prewarm: bool = False,
+    seed: int = 1234,
+) -> dict[str, Any]:
+    """Run the load scenario and return the report."""
+    dataset = generate_dataset(students=students, seed=seed, today=date(2025, 1, 15))
+    stub = MashovStubServer(
+        dataset=dataset,
+        latency=latency,
+        latency_jitter=latency_jitter,
+        error_rate=error_rate,
+        session_ttl=session_ttl,
+        payload_scale=payload_scale,
+        seed=seed,
+    )
+    runner = web.AppRunner(stub.make_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    if not respect_rate_limit:
+        configure_rate_limits(
+            {
+                CONF_RATE_LIMIT_LOGINS_PER_MINUTE: 1e9,
+                CONF_RATE_LIMIT_REQUESTS_PER_SECOND: 1e9,
+                CONF_RATE_LIMIT_BURST: 1e9,
+            }
+        )
+
+    clients = [
+        MashovClient(
+            school_id="123456",
+            year=2025,
+            username=f"load-user-{i}",
+            password="load",
+            api_base=f"http://127.0.0.1:{port}/api/",
+        )
+        for i in range(entries)
+    ]
+    for client in clients:
+        client.retry_base_delay = 0.05
+        client.retry_max_delay = 0.5
+
+    refresh_latencies: list[float] = []
+    failed_refreshes = 0
+
+    async def refresh(client: MashovClient) -> None:
+        nonlocal failed_refreshes
+        start = time.perf_counter()
+        try:
+            await client.async_fetch_all()
+        except Exception:
+            failed_refreshes += 1
+        refresh_latencies.append(time.perf_counter() - start)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(c.async_init(None) for c in clients))
+        login_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            if prewarm:
+                # As the scheduler does ahead of timed refreshes; not counted as refresh latency
+                await asyncio.gather(*(c.async_prewarm() for c in clients))
+            await asyncio.gather(*(refresh(c) for c in clients))
+        duration = time.perf_counter() - started
+    finally:
+        limits = rate_limit_diagnostics()
+        await asyncio.gather(*(c.async_close() for c in clients))
+        await runner.cleanup()
+        configure_rate_limits(None)
+
+    endpoint_latencies: dict[str, list[float]] = {}
+    ttfb: dict[str, list[float]] = {}
+    for client in clients:
+        for name, ep in client.metrics.endpoints.items():
+            endpoint_latencies.setdefault(name, []).extend(ep.latencies)
+        for kind, samples in client.metrics.ttfb.items():
+            ttfb.setdefault(kind, []).extend(samples)
+
+    data_requests = sum(n for name, n in stub.requests.items() if name not in ("login", "schools"))
+    return {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "entries": entries,
+            "students_per_entry": students,
+            "rounds": rounds,
+            "latency_ms": _ms(latency),
+            "error_rate": error_rate,
+            "session_ttl": session_ttl,
+            "payload_scale": payload_scale,
+            "respect_rate_limit": respect_rate_limit,
+            "prewarm": prewarm,
+        },
+        "login_seconds": round(login_seconds, 3),
+        "duration_seconds": round(duration, 3),
+        "refreshes": len(refresh_latencies),
+        "failed_refreshes": failed_refreshes,
+        "refreshes_per_second": round(len(refresh_latencies) / duration, 2) if duration else None,
+        "requests": data_requests,
+        "requests_per_second": round(data_requests / duration, 2) if duration else None,
+        "logins": stub.logins,
+        "server_statuses": {str(k): v for k, v in sorted(stub.statuses.items())},
+        "bytes_sent": stub.bytes_sent,
+        "refresh_latency_ms": {
+            "p50": _ms(percentile(refresh_latencies, 50)),
+            "p95": _ms(percentile(refresh_latencies, 95)),
+            "p99": _ms(percentile(refresh_latencies, 99)),
+            "max": _ms(max(refresh_latencies) if refresh_latencies else None),
+        },
+        "endpoint_latency_ms": {
+            name: {"p50": _ms(percentile(lat, 50)), "p95": _ms(percentile(lat, 95)), "p99": _ms(percentile(lat, 99))}
+            for name, lat in sorted(endpoint_latencies.items())
+        },
+        "ttfb_ms": {
+            kind: {"p50": _ms(percentile(lat, 50)), "p95": _ms(percentile(lat, 95))}
+            for kind, lat in sorted(ttfb.items())
+        },
+        "rate_limits": limits,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--students", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added per request")
+    parser.add_argument("--latency-jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds before tokens expire (401)")
+    parser.add_argument("--payload-scale", type=float, default=1.0)
+    parser.add_argument("--respect-rate-limit", action="store_true", help="keep the default shared rate limits")
+    parser.add_argument("--prewarm", action="store_true", help="pre-warm every client before each round")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="load_results.json")
+    parser.add_argument("--verbose", action="store_true", help="show client warnings (401s, injected errors)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL)
+
+    report = asyncio.run(
+        run_load(
+            entries=args.entries,
+            students=args.students,
+            rounds=args.rounds,
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            session_ttl=args.session_ttl,
+            payload_scale=args.payload_scale,
+            respect_rate_limit=args.respect_rate_limit,
+            prewarm=args.prewarm,
+            seed=args.seed,
+        )
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    lat = report["refresh_latency_ms"]
+    print(
+        f"{report['refreshes']} refreshes ({report['failed_refreshes']} failed) in {report['duration_seconds']}s: "
+        f"{report['refreshes_per_second']} refresh/s, {report['requests_per_second']} req/s, "
+        f"{report['logins']} logins"
+    )
+    print(f"refresh latency p50 {lat['p50']} ms, p95 {lat['p95']} ms, p99 {lat['p99']} ms, max {lat['max']} ms")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
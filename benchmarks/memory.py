@@ -0,0 +1,150 @@
+"""Report the memory and cache-size savings of interning repeated names on a full-year dataset.
+
+Normalizes the same generated payloads twice, once through a client with a live symbol table
+and once with interning turned off, and compares the retained size of the resulting data and
+the JSON size of the legacy cache layout against the symbol-table layout. Also compares the
+lessons history as row dicts against its columnar form.
+
+Usage:
+    python -m benchmarks.memory [--students 3] [--output memory_results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+import json
+import sys
+from typing import Any
+
+from custom_components.mashov.const import (
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+from custom_components.mashov.history_columns import LessonsHistoryColumns
+from custom_components.mashov.rate_limiter import configure_rate_limits
+from custom_components.mashov.symbols import encode_cache
+
+from .generator import generate_dataset
+from .run import DATA_KEYS, _make_client
+
+
+class _NoInterning:
+    """Symbol table stand-in that keeps every parsed string, as before interning."""
+
+    def intern(self, value: Any) -> Any:
+        return value
+
+    def intern_fields(self, item: dict[str, Any]) -> dict[str, Any]:
+        return item
+
+
+def deep_size(obj: Any, seen: set[int] | None = None) -> int:
+    """Bytes retained by obj and everything it references, each object counted once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, list | tuple):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+def _json_bytes(obj: Any) -> int:
+    return len(json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+
+async def _fetch(dataset: dict[str, Any], interning: bool) -> tuple[dict[str, Any], int]:
+    client = _make_client(dataset)
+    if not interning:
+        client.symbols = _NoInterning()
+    try:
+        data = await client.async_fetch_all()
+    finally:
+        await client.async_close()
+    return data, len(client.symbols) if interning else 0
+
+
+async def run_memory_report(students: int = 3, seed: int = 1234) -> dict[str, Any]:
+    """Build the report; the dataset runs from September 1st to mid-June (a full school year)."""
+    dataset = generate_dataset(students=students, seed=seed)
+    configure_rate_limits(
+        {
+            CONF_RATE_LIMIT_LOGINS_PER_MINUTE: 1e9,
+            CONF_RATE_LIMIT_REQUESTS_PER_SECOND: 1e9,
+            CONF_RATE_LIMIT_BURST: 1e9,
+        }
+    )
+    try:
+        plain, _ = await _fetch(dataset, interning=False)
+        interned, symbol_count = await _fetch(dataset, interning=True)
+    finally:
+        configure_rate_limits(None)
+
+    plain_bytes = deep_size(plain)
+    interned_bytes = deep_size(interned)
+    legacy_cache = _json_bytes({"data": plain})
+    symbols, encoded = encode_cache(interned)
+    symbol_cache = _json_bytes({"symbols": symbols, "data": encoded})
+    history = [group["lessons_history"] for group in interned["by_slug"].values()]
+    history_rows = deep_size(history)
+    history_columns = deep_size([LessonsHistoryColumns(rows) for rows in history])
+    return {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "students": students,
+            "seed": seed,
+        },
+        "dataset": {key: sum(len(s[key]) for s in dataset["students"]) for key in DATA_KEYS},
+        "symbols": symbol_count,
+        "memory_bytes": {
+            "plain": plain_bytes,
+            "interned": interned_bytes,
+            "saved": plain_bytes - interned_bytes,
+            "saved_pct": round(100 * (plain_bytes - interned_bytes) / plain_bytes, 1),
+        },
+        "cache_bytes": {
+            "legacy": legacy_cache,
+            "symbol_table": symbol_cache,
+            "saved": legacy_cache - symbol_cache,
+            "saved_pct": round(100 * (legacy_cache - symbol_cache) / legacy_cache, 1),
+        },
+        "lessons_history_bytes": {
+            "rows": history_rows,
+            "columnar": history_columns,
+            "saved": history_rows - history_columns,
+            "saved_pct": round(100 * (history_rows - history_columns) / history_rows, 1),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="memory_results.json")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_memory_report(args.students, args.seed))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    mem, cache = report["memory_bytes"], report["cache_bytes"]
+    print(f"{report['symbols']} symbols across {sum(report['dataset'].values())} items")
+    print(f"memory: {mem['plain']} -> {mem['interned']} bytes ({mem['saved_pct']}% saved)")
+    print(f"cache:  {cache['legacy']} -> {cache['symbol_table']} bytes ({cache['saved_pct']}% saved)")
+    hist = report["lessons_history_bytes"]
+    print(f"lessons history: {hist['rows']} -> {hist['columnar']} bytes columnar ({hist['saved_pct']}% saved)")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Run Mashov performance benchmarks and write comparable results as JSON.
+
+Usage:
+    python -m benchmarks.run [--students 3] [--repeat 20] [--output bench.json]
+    python -m benchmarks.run --compare baseline.json [--max-regression 1.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.mashov.const import (
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
+    DEFAULT_MAX_ITEMS_IN_ATTRIBUTES,
+)
+from custom_components.mashov.mashov_client import MashovClient, _slugify
+from custom_components.mashov.rate_limiter import configure_rate_limits
+from custom_components.mashov.sensor import MashovListSensor
+
+from .generator import generate_dataset
+from .legacy_normalizers import LegacyNormalizers
+
+DATA_KEYS = ("homework", "behavior", "weekly_plan", "timetable", "lessons_history", "grades")
+
+# URL path fragment -> payload key, most specific first
+ROUTES = (
+    ("/lessons/plans", "weekly_plan"),
+    ("/lessons/history", "lessons_history"),
+    ("/homework", "homework"),
+    ("/behave", "behavior"),
+    ("/timetable", "timetable"),
+    ("/grades", "grades"),
+    ("/holidays", "holidays"),
+)
+
+FORMATTERS = {
+    "homework": "_format_homework_data",
+    "behavior": "_format_behavior_data",
+    "weekly_plan": "_format_weekly_plan_data",
+    "timetable": "_format_timetable_data",
+    "lessons_history": "_format_lessons_history",
+    "grades": "_format_grades_data",
+}
+
+# Spec-driven normalizers are timed against the hand-written ones they replaced
+LEGACY_NORMALIZERS = {
+    "homework": "_normalize_homework",
+    "behavior": "_normalize_behavior",
+    "weekly_plan": "_normalize_weekly_plan",
+    "timetable": "_normalize_timetable",
+    "lessons_history": "_normalize_lessons_history",
+    "grades": "_normalize_grades",
+    "holidays": "_normalize_holidays",
+}
+
+
+class _StubResponse:
+    def __init__(self, body: bytes):
+        self.status = 200
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StubSession:
+    """Minimal aiohttp.ClientSession stand-in serving pre-encoded payloads by URL."""
+
+    closed = False
+
+    def __init__(self, bodies: dict[tuple[str, str], bytes]):
+        self._bodies = bodies
+
+    def get(self, url: str, headers=None) -> _StubResponse:
+        path = url.split("?", 1)[0]
+        sid = path.split("/students/", 1)[1].split("/", 1)[0] if "/students/" in path else "*"
+        key = next(k for fragment, k in ROUTES if fragment in path)
+        return _StubResponse(self._bodies[(sid, key)])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _stats(samples: list[float]) -> dict[str, Any]:
+    ms = [s * 1000 for s in samples]
+    return {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "max_ms": round(max(ms), 4),
+    }
+
+
+def bench(fn: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples)
+
+
+async def abench(fn: Callable[[], Awaitable[Any]], repeat: int) -> dict[str, Any]:
+    await fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples)
+
+
+def _make_client(dataset: dict[str, Any]) -> MashovClient:
+    client = MashovClient(school_id="123456", year=2025, username="bench", password="bench")
+    bodies: dict[tuple[str, str], bytes] = {("*", "holidays"): json.dumps(dataset["holidays"]).encode()}
+    students = []
+    for stu in dataset["students"]:
+        child = stu["child"]
+        sid = child["childGuid"]
+        name = f"{child['privateName']} {child['familyName']}"
+        students.append({"id": sid, "name": name, "slug": _slugify(name) or sid})
+        for key in DATA_KEYS:
+            bodies[(sid, key)] = json.dumps(stu[key], ensure_ascii=False).encode("utf-8")
+    client._session = StubSession(bodies)
+    client._headers = {"Accept": "application/json", "X-Csrf-Token": "bench"}
+    client._students = students
+    return client
+
+
+async def run_benchmarks(students: int = 3, repeat: int = 20, seed: int = 1234) -> dict[str, Any]:
+    """Run every benchmark and return the results document."""
+    # Benchmarks measure our code, not the shared request budget
+    configure_rate_limits(
+        {
+            CONF_RATE_LIMIT_LOGINS_PER_MINUTE: 1e9,
+            CONF_RATE_LIMIT_REQUESTS_PER_SECOND: 1e9,
+            CONF_RATE_LIMIT_BURST: 1e9,
+        }
+    )
+    try:
+        dataset = generate_dataset(students=students, seed=seed)
+        client = _make_client(dataset)
+        results: dict[str, Any] = {}
+
+        results["fetch_all"] = await abench(client.async_fetch_all, repeat)
+        data = await client.async_fetch_all()
+
+        legacy = LegacyNormalizers(client.symbols)
+        for key, method in LEGACY_NORMALIZERS.items():
+            raws = [dataset["holidays"]] if key == "holidays" else [stu[key] for stu in dataset["students"]]
+            old = getattr(legacy, method)
+            results[f"normalize.{key}"] = bench(lambda k=key, r=raws: [client._normalize(k, raw) for raw in r], repeat)
+            results[f"normalize_legacy.{key}"] = bench(lambda n=old, r=raws: [n(raw) for raw in r], repeat)
+
+        coordinator = SimpleNamespace(
+            data=data,
+            entry=SimpleNamespace(options={}),
+            hass=SimpleNamespace(data={}),
+            archived_count=lambda slug, key: 0,
+            archived_totals=lambda slug, key: {},
+        )
+        stu = data["students"][0]
+        group = data["by_slug"][stu["slug"]]
+        for key in DATA_KEYS:
+            sensor = MashovListSensor(coordinator, stu["id"], stu["slug"], stu["name"], key, key, key)
+            items = group[key]
+            formatter = getattr(sensor, FORMATTERS[key])
+            results[f"format.{key}"] = bench(lambda f=formatter, i=items: f(i), repeat)
+            results[f"limit_items.{key}"] = bench(
+                lambda s=sensor, i=items: s._limit_items_for_storage(i, DEFAULT_MAX_ITEMS_IN_ATTRIBUTES), repeat
+            )
+            results[f"attributes.{key}"] = bench(sensor._build_attributes, repeat)
+
+        await client.async_close()
+    finally:
+        configure_rate_limits(None)
+
+    return {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "students": students,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "dataset": {key: sum(len(s[key]) for s in dataset["students"]) for key in DATA_KEYS},
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> dict[str, float]:
+    """Return current/baseline median ratio per benchmark present in both."""
+    ratios = {}
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base and base.get("median_ms"):
+            ratios[name] = cur["median_ms"] / base["median_ms"]
+    return ratios
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline results JSON to compare medians against")
+    parser.add_argument("--max-regression", type=float, default=None, help="fail if any median ratio exceeds this")
+    args = parser.parse_args(argv)
+
+    doc = asyncio.run(run_benchmarks(args.students, args.repeat, args.seed))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+
+    width = max(len(name) for name in doc["results"])
+    ratios: dict[str, float] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            ratios = compare(json.load(f), doc)
+    for name, res in doc["results"].items():
+        line = f"{name:<{width}}  median {res['median_ms']:>10.3f} ms"
+        if name in ratios:
+            line += f"  x{ratios[name]:.2f}"
+        print(line)
+    print(f"Results written to {args.output}")
+
+    if args.max_regression and any(r > args.max_regression for r in ratios.values()):
+        print(f"Regression above x{args.max_regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""In-process stub of the Mashov API for fault-injection tests and load testing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import json
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+STUB_CSRF = "stub-csrf-token"
+STUB_CHILD_GUID = "stub-student-1"
+
+# Route name -> path (relative to /api/); names match the client's ENDPOINTS keys
+STUB_ROUTES = {
+    "homework": "students/{sid}/homework",
+    "behavior": "students/{sid}/behave",
+    "weekly_plan": "students/{sid}/lessons/plans",
+    "timetable": "students/{sid}/timetable",
+    "lessons_history": "students/{sid}/lessons/history",
+    "grades": "students/{sid}/grades",
+    "holidays": "holidays",
+}
+
+STUB_SCHOOLS = [
+    {"semel": 123456, "name": "בית ספר לבדיקה"},
+    {"semel": 654321, "name": "תיכון לדוגמה"},
+]
+
+DEFAULT_CHILD = {
+    "childGuid": STUB_CHILD_GUID,
+    "privateName": "Stub",
+    "familyName": "Student",
+    "classCode": "ה",
+    "classNum": 1,
+    "groups": [],
+}
+
+
+def _scale(items: Any, factor: float) -> Any:
+    """Repeat or truncate a list payload to roughly factor x its size."""
+    if not isinstance(items, list) or factor == 1.0 or not items:
+        return items
+    whole, frac = divmod(factor, 1)
+    return items * int(whole) + items[: int(len(items) * frac)]
+
+
+class MashovStubServer:
+    """Serve canned Mashov payloads with injectable faults.
+
+    payloads: {route: payload} served to every student, or
+    dataset: benchmarks.generator.generate_dataset() output for per-student payloads and children.
+    latency / latency_jitter: seconds added to every request (jitter is uniform random).
+    error_rate: fraction of data requests answered with fail_status.
+    session_ttl: seconds a login token stays valid; afterwards data requests get 401.
+    payload_scale: multiply list payload sizes (e.g. 0.5, 3).
+    fail_next: {route: n} answers the next n requests of a route with fail_status.
+    down: routes that always answer fail_status ("login" included).
+    expire_session: the next data request answers 401 and invalidates every token.
+    reject_logins: logins answer 401 (wrong or revoked credentials).
+    """
+
+    def __init__(
+        self,
+        payloads: dict[str, Any] | None = None,
+        dataset: dict[str, Any] | None = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        session_ttl: float | None = None,
+        payload_scale: float = 1.0,
+        seed: int = 0,
+    ):
+        self.payloads: dict[str, Any] = payloads or {}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.session_ttl = session_ttl
+        self.payload_scale = payload_scale
+        self.fail_next: Counter[str] = Counter()
+        self.fail_status = 503
+        self.down: set[str] = set()
+        self.expire_session = False
+        self.reject_logins = False
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.bytes_sent = 0
+        self.logins = 0
+        self._rng = random.Random(seed)
+        self._tokens: dict[str, float] = {}  # token -> issued (monotonic)
+        self._token_serial = 0
+        self._bodies: dict[tuple[str, str], bytes] = {}
+
+        self.children: list[dict[str, Any]] = [DEFAULT_CHILD]
+        self._by_student: dict[str, dict[str, Any]] = {}
+        if dataset:
+            self.children = [stu["child"] for stu in dataset["students"]]
+            self._by_student = {stu["child"]["childGuid"]: stu for stu in dataset["students"]}
+            self.payloads.setdefault("holidays", dataset.get("holidays", []))
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/login", self._login)
+        app.router.add_get("/api/schools", self._schools)
+        for name, path in STUB_ROUTES.items():
+            app.router.add_get(f"/api/{path}", self._make_handler(name))
+        return app
+
+    def _body(self, name: str, sid: str) -> bytes:
+        """Encode each (route, student) payload once; load runs shouldn't benchmark the stub."""
+        key = (name, sid)
+        if key not in self._bodies:
+            stu = self._by_student.get(sid)
+            payload = stu[name] if stu and name in stu else self.payloads.get(name, [])
+            self._bodies[key] = json.dumps(_scale(payload, self.payload_scale), ensure_ascii=False).encode("utf-8")
+        return self._bodies[key]
+
+    async def _delay(self) -> None:
+        delay = self.latency + (self._rng.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _respond(self, body: bytes | None = None, status: int = 200, **kwargs) -> web.Response:
+        body = body if body is not None else b"[]"
+        self.statuses[status] += 1
+        self.bytes_sent += len(body)
+        return web.Response(body=body, status=status, content_type="application/json", **kwargs)
+
+    def _token_valid(self, token: str | None) -> bool:
+        issued = self._tokens.get(token or "")
+        if issued is None:
+            return False
+        return self.session_ttl is None or time.monotonic() - issued < self.session_ttl
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self.logins += 1
+        self.requests["login"] += 1
+        await self._delay()
+        if "login" in self.down:
+            return self._respond(b'{"error": "down"}', self.fail_status)
+        if self.reject_logins:
+            return self._respond(b'{"error": "invalid credentials"}', 401)
+        self._token_serial += 1
+        token = f"{STUB_CSRF}-{self._token_serial}"
+        self._tokens[token] = time.monotonic()
+        body = {"accessToken": {"children": self.children}, "credential": {"userId": "stub-user"}}
+        return self._respond(json.dumps(body, ensure_ascii=False).encode("utf-8"), headers={"X-Csrf-Token": token})
+
+    async def _schools(self, request: web.Request) -> web.Response:
+        self.requests["schools"] += 1
+        await self._delay()
+        query = request.query.get("search", "")
+        schools = [s for s in STUB_SCHOOLS if query in s["name"] or query == str(s["semel"])]
+        return self._respond(json.dumps(schools, ensure_ascii=False).encode("utf-8"))
+
+    def _make_handler(self, name: str):
+        async def handler(request: web.Request) -> web.Response:
+            self.requests[name] += 1
+            await self._delay()
+            if self.expire_session:
+                self.expire_session = False
+                self._tokens.clear()
+            if not self._token_valid(request.headers.get("X-Csrf-Token")):
+                return self._respond(b'{"error": "unauthorized"}', 401)
+            if self.fail_next[name] > 0:
+                self.fail_next[name] -= 1
+                return self._respond(b'{"error": "unavailable"}', self.fail_status)
+            if name in self.down or (self.error_rate and self._rng.random() < self.error_rate):
+                return self._respond(b'{"error": "unavailable"}', self.fail_status)
+            return self._respond(self._body(name, request.match_info.get("sid", "*")))
+
+        return handler
@@ -1,43 +1,102 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable
 import contextlib
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry  # type: ignore
-from homeassistant.core import HomeAssistant, ServiceCall, callback  # type: ignore
-from homeassistant.helpers.event import async_track_time_change  # type: ignore
+from homeassistant.core import (  # type: ignore
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady  # type: ignore
+import homeassistant.helpers.config_validation as cv  # type: ignore
+from homeassistant.helpers.event import (  # type: ignore
+    async_call_later,
+    async_track_point_in_time,
+    async_track_time_change,
+)
+from homeassistant.helpers.start import async_at_started  # type: ignore
 from homeassistant.helpers.storage import Store  # type: ignore
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed  # type: ignore
+from homeassistant.loader import async_get_integration  # type: ignore
+from homeassistant.util import dt as dt_util  # type: ignore
 import voluptuous as vol  # type: ignore
 
+from .change_tracker import ChangeTracker, item_key
 from .const import (
+    ADAPTIVE_IDLE_REPLAN_SECONDS,
+    CHANGE_EVENTS,
     CONF_API_BASE,
+    CONF_DIAGNOSTICS_FULL_DATA,
+    CONF_HISTORY_RETENTION_DAYS,
     CONF_HOMEWORK_DAYS_BACK,
     CONF_HOMEWORK_DAYS_FORWARD,
+    CONF_LESSONS_HISTORY_COLUMNAR,
+    CONF_LESSONS_WINDOW_DAYS,
+    CONF_MIN_REFRESH_SPACING,
     CONF_PASSWORD,
+    CONF_PROBE_MAX_AGE,
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
     CONF_SCHEDULE_DAY,
     CONF_SCHEDULE_DAYS,
     CONF_SCHEDULE_INTERVAL,
+    CONF_SCHEDULE_JITTER_MINUTES,
     CONF_SCHEDULE_TIME,
     CONF_SCHEDULE_TYPE,
     CONF_SCHOOL_ID,
     CONF_SCHOOL_NAME,
+    CONF_STARTUP_MODE,
     CONF_USERNAME,
     CONF_YEAR,
     DEFAULT_API_BASE,
+    DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_HOMEWORK_DAYS_BACK,
     DEFAULT_HOMEWORK_DAYS_FORWARD,
+    DEFAULT_LESSONS_HISTORY_COLUMNAR,
+    DEFAULT_LESSONS_WINDOW_DAYS,
+    DEFAULT_MIN_REFRESH_SPACING,
+    DEFAULT_PROBE_MAX_AGE,
     DEFAULT_SCHEDULE_DAY,
     DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SCHEDULE_JITTER_MINUTES,
     DEFAULT_SCHEDULE_TIME,
     DEFAULT_SCHEDULE_TYPE,
+    DEFAULT_STARTUP_MODE,
     DOMAIN,
     PLATFORMS,
+    STARTUP_MODES,
+    STARTUP_RETRY_BASE_SECONDS,
+    STARTUP_RETRY_MAX_SECONDS,
+)
+from .grade_analytics import GradeAnalytics
+from .history_columns import LessonsHistoryColumns
+from .mashov_client import PREWARM_LEAD_SECONDS, STUDENT_DATA_KEYS, MashovAuthError, MashovClient, MashovError
+from .rate_limiter import configure_rate_limits
+from .refresh_arbiter import RefreshArbiter
+from .retention import (
+    RETENTION_DATE_FIELDS,
+    hot_cutoffs,
+    in_range,
+    retention_policy,
+    segment_digest,
+    segment_totals,
+    split_hot_cold,
 )
-from .mashov_client import MashovAuthError, MashovClient, MashovError
+from .schedule_utils import adaptive_plan, next_adaptive_fire, shift_time, stagger_offsets
+from .symbols import decode_cache, encode_cache
+from .timetable_utils import materialize_lessons
+from .tracing import TraceRecorder, span
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,26 +104,91 @@ CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
             {
-                vol.Optional(CONF_SCHEDULE_TYPE): vol.In(["daily", "weekly", "interval"]),
+                vol.Optional(CONF_SCHEDULE_TYPE): vol.In(["daily", "weekly", "interval", "adaptive"]),
                 vol.Optional(CONF_SCHEDULE_TIME): str,
                 vol.Optional(CONF_SCHEDULE_DAY): vol.All(int, vol.Range(min=0, max=6)),
                 vol.Optional(CONF_SCHEDULE_DAYS): [vol.All(int, vol.Range(min=0, max=6))],
                 vol.Optional(CONF_SCHEDULE_INTERVAL): vol.All(int, vol.Range(min=5, max=1440)),
+                vol.Optional(CONF_SCHEDULE_JITTER_MINUTES): vol.All(int, vol.Range(min=0, max=60)),
+                vol.Optional(CONF_MIN_REFRESH_SPACING): vol.All(int, vol.Range(min=0, max=3600)),
+                vol.Optional(CONF_PROBE_MAX_AGE): vol.All(int, vol.Range(min=0, max=1440)),
                 vol.Optional(CONF_HOMEWORK_DAYS_BACK): vol.All(int, vol.Range(min=0, max=60)),
                 vol.Optional(CONF_HOMEWORK_DAYS_FORWARD): vol.All(int, vol.Range(min=1, max=120)),
+                vol.Optional(CONF_LESSONS_WINDOW_DAYS): vol.All(int, vol.Range(min=1, max=60)),
                 vol.Optional(CONF_API_BASE): str,
+                vol.Optional(CONF_LESSONS_HISTORY_COLUMNAR): bool,
+                # One number for every history key, or days per key
+                vol.Optional(CONF_HISTORY_RETENTION_DAYS): vol.Any(
+                    vol.All(int, vol.Range(min=0, max=365)),
+                    {vol.In(list(RETENTION_DATE_FIELDS)): vol.All(int, vol.Range(min=0, max=365))},
+                ),
+                vol.Optional(CONF_DIAGNOSTICS_FULL_DATA): bool,
+                vol.Optional(CONF_STARTUP_MODE): vol.In(STARTUP_MODES),
+                vol.Optional(CONF_RATE_LIMIT_LOGINS_PER_MINUTE): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+                vol.Optional(CONF_RATE_LIMIT_REQUESTS_PER_SECOND): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.1, max=100)
+                ),
+                vol.Optional(CONF_RATE_LIMIT_BURST): vol.All(int, vol.Range(min=1, max=200)),
             }
         )
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+GET_REFRESH_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+REFRESH_NOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("student"): str,
+        vol.Optional("data_keys"): vol.All(cv.ensure_list, [vol.In([*STUDENT_DATA_KEYS, "holidays"])]),
+    }
+)
+
+GET_LESSONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("student"): str,
+        vol.Optional("start"): cv.date,
+        vol.Optional("days"): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("student"): str,
+        vol.Required("data_key"): vol.In(list(RETENTION_DATE_FIELDS)),
+        vol.Optional("start"): cv.date,
+        vol.Optional("end"): cv.date,
+        vol.Optional("limit", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+    }
+)
+
+QUERY_LESSONS_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("student"): str,
+        vol.Optional("start"): cv.date,
+        vol.Optional("end"): cv.date,
+        vol.Optional("subject"): str,
+        vol.Optional("took_place"): bool,
+        vol.Optional("limit", default=50): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up from YAML (optional)."""
     hass.data.setdefault(DOMAIN, {})
     yaml_conf = config.get(DOMAIN) or {}
     hass.data[DOMAIN]["yaml_options"] = yaml_conf
+    configure_rate_limits(yaml_conf)
     if yaml_conf:
         _LOGGER.info("Loaded YAML options for Mashov: %s", {k: yaml_conf.get(k) for k in yaml_conf})
     else:
@@ -72,33 +196,20 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    # Try to log version info (best effort)
+async def _async_integration_version(hass: HomeAssistant) -> str:
     try:
-        import json
-        import os
-
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        version_file = os.path.abspath(os.path.join(current_dir, "..", "..", "VERSION"))
-        if not os.path.exists(version_file):
-            alt = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "VERSION"))
-            if os.path.exists(alt):
-                version_file = alt
-        if os.path.exists(version_file):
-            with open(version_file, encoding="utf-8") as f:
-                version = f.read().strip()
-            _LOGGER.info("Setting up Mashov integration v%s for entry: %s", version, entry.title)
-        else:
-            manifest_file = os.path.join(current_dir, "manifest.json")
-            if os.path.exists(manifest_file):
-                with open(manifest_file, encoding="utf-8") as f:
-                    version = json.load(f).get("version", "unknown")
-                _LOGGER.info("Setting up Mashov integration v%s for entry: %s (from manifest)", version, entry.title)
-            else:
-                _LOGGER.info("Setting up Mashov integration for entry: %s", entry.title)
+        integration = await async_get_integration(hass, DOMAIN)
     except Exception as e:
-        _LOGGER.warning("Version discovery failed: %s", e)
-        _LOGGER.info("Setting up Mashov integration for entry: %s", entry.title)
+        _LOGGER.debug("Version discovery failed: %s", e)
+        return "unknown"
+    return str(integration.version or "unknown")
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
+    setup_started = time.monotonic()
+    # Version comes from the manifest Home Assistant already parsed and caches; no file I/O here
+    version = await _async_integration_version(hass)
+    _LOGGER.info("Setting up Mashov integration v%s for entry: %s", version, entry.title)
 
     hass.data.setdefault(DOMAIN, {})
 
@@ -114,9 +225,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             getattr(entry, "supports_options", None),
             yaml_present,
         )
-        import sys  # local import to avoid unused-import when stripped by HA
-
-        has_options_flow = hasattr(sys.modules[__name__], "async_get_options_flow")
+        has_options_flow = "async_get_options_flow" in globals()
         _LOGGER.debug("Module has async_get_options_flow: %s", has_options_flow)
         # Always log a concise INFO so it's visible even without DEBUG
         _LOGGER.info(
@@ -155,10 +264,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     try:
         cached = await store.async_load()
         if isinstance(cached, dict) and cached.get("data"):
-            coordinator.data = cached.get("data")
+            coordinator.data = coordinator.decode_cached_data(cached)
             _LOGGER.debug("Loaded cached data for entry %s (ts=%s)", entry.entry_id, cached.get("last_refresh_ts"))
     except Exception as e:
         _LOGGER.debug("No cache available for entry %s: %s", entry.entry_id, e)
+    await coordinator.async_load_change_state()
+
+    # Persisted authenticated session: reuse cookies/CSRF/children across restarts instead of logging in
+    session_store: Store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.session")
+    session_restored = False
+    try:
+        session_restored = await client.async_restore_session(await session_store.async_load()) is True
+    except Exception as e:
+        _LOGGER.debug("No persisted session for entry %s: %s", entry.entry_id, e)
+    client.on_session_change = lambda: session_store.async_delay_save(client.session_state, 1)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
@@ -206,7 +325,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         merged_opts.update({k: v for k, v in yaml_opts.items() if v is not None})
 
     schedule_type = str(merged_opts.get(CONF_SCHEDULE_TYPE, DEFAULT_SCHEDULE_TYPE))
-    if schedule_type not in ("daily", "weekly", "interval"):
+    if schedule_type not in ("daily", "weekly", "interval", "adaptive"):
         schedule_type = DEFAULT_SCHEDULE_TYPE
 
     # Determine if to perform startup refresh at all
@@ -235,7 +354,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             "Skipping startup refresh in interval mode due to cooldown (last=%s)",
             datetime.fromtimestamp(last_ts).isoformat(timespec="seconds"),
         )
-    if schedule_type in ("daily", "weekly"):
+    if schedule_type in ("daily", "weekly", "adaptive"):
         if not has_students:
             _LOGGER.info("Startup refresh enabled to warm up students (no cache present) [type=%s]", schedule_type)
         else:
@@ -243,24 +362,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 "Startup refresh disabled for schedule_type=%s (defer to timers or manual service)", schedule_type
             )
 
-    if do_startup_refresh:
-        try:
-            await asyncio.create_task(client.async_init(hass))
-            await coordinator.async_config_entry_first_refresh()
-            # Save cache after successful refresh
+    startup_mode = str(merged_opts.get(CONF_STARTUP_MODE, DEFAULT_STARTUP_MODE))
+    if startup_mode not in STARTUP_MODES:
+        startup_mode = DEFAULT_STARTUP_MODE
+    startup: dict[str, Any] = {"mode": startup_mode, "refresh": "pending" if do_startup_refresh else "skipped"}
+    hass.data[DOMAIN][entry.entry_id]["startup"] = startup
+
+    async def _async_startup_refresh() -> None:
+        nonlocal session_restored
+        started = time.monotonic()
+        if not session_restored:
             try:
-                await store.async_save(
-                    {
-                        "last_refresh_ts": time.time(),
-                        "data": coordinator.data,
-                    }
-                )
-            except Exception as e:
-                _LOGGER.debug("Failed saving cache: %s", e)
-        except Exception as e:
+                await asyncio.create_task(client.async_init(hass))
+            except MashovAuthError as e:
+                raise ConfigEntryAuthFailed(str(e)) from e
+            session_restored = True  # a retry after a failed refresh doesn't log in again
+        if startup_blocks:
+            await coordinator.async_config_entry_first_refresh()
+        else:
+            await coordinator.async_refresh()
+        startup["refresh_seconds"] = round(time.monotonic() - started, 3)
+        startup["refresh"] = "ok" if coordinator.last_update_success else "failed"
+        if not coordinator.last_update_success:
+            return
+        # Save cache after successful refresh
+        await coordinator.async_save_cache()
+
+    if schedule_type == "interval":
+        # Set before the first refresh so it records the fingerprint the first interval poll compares against
+        coordinator.probe_max_age_seconds = _probe_max_age_seconds(merged_opts)
+
+    # Only the "blocking" mode waits for Mashov during setup. Without cached students (first boot) the entry
+    # still loads at once: entry-level entities stay unavailable and student entities are added when the
+    # background refresh lands, which retries connection errors and starts reauth on rejected credentials
+    startup_blocks = do_startup_refresh and startup_mode == "blocking"
+    if startup_blocks:
+        try:
+            await _async_startup_refresh()
+        except (ConfigEntryAuthFailed, ConfigEntryNotReady) as e:
             _LOGGER.error("Failed to perform startup refresh: %s", e)
             await client.async_close()
             raise
+        except Exception as e:
+            _LOGGER.error("Failed to perform startup refresh: %s", e)
+            await client.async_close()
+            raise ConfigEntryNotReady(str(e)) from e
 
     # Configure scheduler per options/YAML (also ensures timers; interval mode sets polling)
     await _async_setup_scheduler(hass, entry)
@@ -274,22 +420,83 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if do_startup_refresh and not startup_blocks:
+        # Entities are registered now from cached data (unavailable without it); the first refresh runs once
+        # Home Assistant has started so boot never waits on Mashov. Platforms add students as they appear.
+        # A failed refresh is retried with backoff until it (or any later refresh) succeeds; an auth error starts reauth.
+        retry: dict[str, Any] = {"attempt": 0, "unsub": None}
+
+        async def _async_deferred_refresh() -> None:
+            retry["unsub"] = None
+            try:
+                await _async_startup_refresh()
+            except ConfigEntryAuthFailed as e:
+                startup["refresh"] = "auth_failed"
+                _LOGGER.error("Background startup refresh failed for %s: %s", entry.title, e)
+                entry.async_start_reauth(hass)
+                return
+            except Exception as e:
+                startup["refresh"] = "failed"
+                _LOGGER.error("Background startup refresh failed for %s: %s", entry.title, e)
+            if coordinator.last_update_success and startup["refresh"] == "ok":
+                return
+            if isinstance(coordinator.last_exception, ConfigEntryAuthFailed):
+                startup["refresh"] = "auth_failed"  # the coordinator started reauth already
+                return
+            delay = min(STARTUP_RETRY_MAX_SECONDS, STARTUP_RETRY_BASE_SECONDS * 2 ** retry["attempt"])
+            retry["attempt"] += 1
+            startup["retries"] = retry["attempt"]
+            startup["next_retry_seconds"] = delay
+            _LOGGER.info("Retrying startup refresh for %s in %ss", entry.title, delay)
+            retry["unsub"] = async_call_later(hass, delay, _retry_deferred_refresh)
+
+        @callback
+        def _retry_deferred_refresh(_now: datetime) -> None:
+            retry["unsub"] = None
+            if coordinator.last_update_success:
+                startup["refresh"] = "ok"  # a scheduled or manual refresh got there first
+                return
+            entry.async_create_task(hass, _async_deferred_refresh(), "mashov startup refresh retry")
+
+        @callback
+        def _cancel_retry() -> None:
+            if retry["unsub"] is not None:
+                retry["unsub"]()
+                retry["unsub"] = None
+
+        @callback
+        def _at_started(_hass: HomeAssistant) -> None:
+            _LOGGER.debug("Starting background warm refresh for %s", entry.title)
+            entry.async_create_task(hass, _async_deferred_refresh(), "mashov startup refresh")
+
+        entry.async_on_unload(async_at_started(hass, _at_started))
+        entry.async_on_unload(_cancel_retry)
+
     async def _handle_refresh(call: ServiceCall):
         entry_id = call.data.get("entry_id")
+        student = call.data.get("student")
+        data_keys = call.data.get("data_keys")
+
+        def _refresh(coord: MashovCoordinator):
+            # student / data_keys narrow the refresh to those endpoints; otherwise refresh everything
+            if student or data_keys:
+                return coord.async_refresh_partial(student, data_keys)
+            return coord.async_request_refresh()
+
         tasks = []
         if entry_id:
             ce = hass.data[DOMAIN].get(entry_id)
             if isinstance(ce, dict) and "coordinator" in ce:
-                tasks.append(ce["coordinator"].async_request_refresh())
+                tasks.append(_refresh(ce["coordinator"]))
         else:
             for maybe_entry in hass.data.get(DOMAIN, {}).values():
                 if isinstance(maybe_entry, dict) and "coordinator" in maybe_entry:
-                    tasks.append(maybe_entry["coordinator"].async_request_refresh())
+                    tasks.append(_refresh(maybe_entry["coordinator"]))
         if tasks:
             await asyncio.gather(*tasks)
 
     if DOMAIN not in hass.services.async_services():
-        hass.services.async_register(DOMAIN, "refresh_now", _handle_refresh)
+        hass.services.async_register(DOMAIN, "refresh_now", _handle_refresh, schema=REFRESH_NOW_SCHEMA)
 
         # Service: set_options – allows updating options without Configure UI
         async def _handle_set_options(call: ServiceCall):
@@ -305,6 +512,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 CONF_SCHEDULE_DAY,
                 CONF_SCHEDULE_DAYS,
                 CONF_SCHEDULE_INTERVAL,
+                CONF_SCHEDULE_JITTER_MINUTES,
+                CONF_MIN_REFRESH_SPACING,
+                CONF_PROBE_MAX_AGE,
+                CONF_LESSONS_WINDOW_DAYS,
+                CONF_LESSONS_HISTORY_COLUMNAR,
+                CONF_HISTORY_RETENTION_DAYS,
+                CONF_DIAGNOSTICS_FULL_DATA,
+                CONF_STARTUP_MODE,
             }
             for k, _v in list(payload.items()):
                 if k not in known_keys:
@@ -315,6 +530,99 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
         hass.services.async_register(DOMAIN, "set_options", _handle_set_options)
 
+        # Service: get_lessons – dated lesson instances from the materialized timetable
+        async def _handle_get_lessons(call: ServiceCall) -> ServiceResponse:
+            entry_id = call.data.get("entry_id")
+            student = call.data.get("student")
+            result: dict[str, Any] = {}
+            for eid, ce in hass.data.get(DOMAIN, {}).items():
+                if not isinstance(ce, dict) or "coordinator" not in ce or (entry_id and eid != entry_id):
+                    continue
+                coord: MashovCoordinator = ce["coordinator"]
+                for stu in (coord.data or {}).get("students", []):
+                    if student and student not in (stu.get("slug"), stu.get("name"), str(stu.get("id"))):
+                        continue
+                    result[stu["slug"]] = coord.get_lessons(stu["slug"], call.data.get("start"), call.data.get("days"))
+            return {"students": result}
+
+        hass.services.async_register(
+            DOMAIN,
+            "get_lessons",
+            _handle_get_lessons,
+            schema=GET_LESSONS_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+        # Service: query_lessons_history – counts, per-subject totals and rows from the lessons log
+        async def _handle_query_lessons_history(call: ServiceCall) -> ServiceResponse:
+            entry_id = call.data.get("entry_id")
+            filters = {k: call.data[k] for k in ("start", "end", "subject", "took_place") if k in call.data}
+            result: dict[str, Any] = {}
+            for eid, ce in hass.data.get(DOMAIN, {}).items():
+                if not isinstance(ce, dict) or "coordinator" not in ce or (entry_id and eid != entry_id):
+                    continue
+                coord: MashovCoordinator = ce["coordinator"]
+                for slug in coord.resolve_students(call.data.get("student")):
+                    history = await coord.async_lessons_history(slug, call.data.get("start"))
+                    selected = history.select(**filters)
+                    result[slug] = {
+                        "count": len(selected),
+                        "by_subject": history.by_subject(**filters),
+                        # Newest first; only these rows are built as dicts
+                        "lessons": history.rows(selected[::-1], call.data["limit"]),
+                    }
+            return {"students": result}
+
+        hass.services.async_register(
+            DOMAIN,
+            "query_lessons_history",
+            _handle_query_lessons_history,
+            schema=QUERY_LESSONS_HISTORY_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+        # Service: get_history – lessons history, behavior or grades in a date range, archive included
+        async def _handle_get_history(call: ServiceCall) -> ServiceResponse:
+            entry_id = call.data.get("entry_id")
+            key = call.data["data_key"]
+            result: dict[str, Any] = {}
+            for eid, ce in hass.data.get(DOMAIN, {}).items():
+                if not isinstance(ce, dict) or "coordinator" not in ce or (entry_id and eid != entry_id):
+                    continue
+                coord: MashovCoordinator = ce["coordinator"]
+                for slug in coord.resolve_students(call.data.get("student")):
+                    items = await coord.async_history(slug, key, call.data.get("start"), call.data.get("end"))
+                    items.sort(key=lambda it: str(it.get(RETENTION_DATE_FIELDS[key]) or ""), reverse=True)
+                    result[slug] = {"count": len(items), "items": items[: call.data["limit"]]}
+            return {"students": result}
+
+        hass.services.async_register(
+            DOMAIN,
+            "get_history",
+            _handle_get_history,
+            schema=GET_HISTORY_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+        # Service: get_refresh_trace – recent refresh phase timings per entry
+        async def _handle_get_refresh_trace(call: ServiceCall) -> ServiceResponse:
+            entry_id = call.data.get("entry_id")
+            result: dict[str, Any] = {}
+            for eid, ce in hass.data.get(DOMAIN, {}).items():
+                if not isinstance(ce, dict) or "coordinator" not in ce or (entry_id and eid != entry_id):
+                    continue
+                result[eid] = ce["coordinator"].traces.as_list(call.data.get("limit"))
+            return {"entries": result}
+
+        hass.services.async_register(
+            DOMAIN,
+            "get_refresh_trace",
+            _handle_get_refresh_trace,
+            schema=GET_REFRESH_TRACE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    startup["setup_seconds"] = round(time.monotonic() - setup_started, 3)
     return True
 
 
@@ -354,6 +662,17 @@ def async_get_options_flow(config_entry: ConfigEntry):
     return OptionsFlowHandler(config_entry)
 
 
+def _probe_max_age_seconds(options: dict[str, Any]) -> int:
+    """Interval-mode change probe max age from merged options (0 = always run the full fetch)."""
+    try:
+        minutes = int(options.get(CONF_PROBE_MAX_AGE, DEFAULT_PROBE_MAX_AGE))
+    except (TypeError, ValueError):
+        minutes = DEFAULT_PROBE_MAX_AGE
+    if not 0 <= minutes <= 1440:
+        minutes = DEFAULT_PROBE_MAX_AGE
+    return minutes * 60
+
+
 async def _async_setup_scheduler(hass: HomeAssistant, entry: ConfigEntry):
     """Apply merged (YAML-overriding-UI) options and configure polling/timers."""
     from .const import (
@@ -410,7 +729,7 @@ async def _async_setup_scheduler(hass: HomeAssistant, entry: ConfigEntry):
             return default
 
     schedule_type = str(merged.get(CONF_SCHEDULE_TYPE, DEFAULT_SCHEDULE_TYPE))
-    if schedule_type not in ("daily", "weekly", "interval"):
+    if schedule_type not in ("daily", "weekly", "interval", "adaptive"):
         schedule_type = DEFAULT_SCHEDULE_TYPE
 
     schedule_time = _as_hhmm(merged.get(CONF_SCHEDULE_TIME, DEFAULT_SCHEDULE_TIME), DEFAULT_SCHEDULE_TIME)
@@ -432,63 +751,168 @@ async def _async_setup_scheduler(hass: HomeAssistant, entry: ConfigEntry):
     coordinator: MashovCoordinator = data["coordinator"]
     unsubs = []
 
+    # Deterministic per-entry jitter, staggered against the other Mashov entries of this instance
+    windows = {}
+    for other in hass.config_entries.async_entries(DOMAIN):
+        other_opts = dict(other.options)
+        other_opts.update({k: v for k, v in yaml_opts.items() if v is not None})
+        jitter_minutes = _as_int(
+            other_opts.get(CONF_SCHEDULE_JITTER_MINUTES, DEFAULT_SCHEDULE_JITTER_MINUTES),
+            DEFAULT_SCHEDULE_JITTER_MINUTES,
+            0,
+            60,
+        )
+        windows[other.entry_id] = jitter_minutes * 60
+    offset = stagger_offsets(windows).get(entry.entry_id, 0)
+    coordinator.schedule_offset_seconds = offset
+
+    coordinator.refresh_arbiter.min_spacing = _as_int(
+        merged.get(CONF_MIN_REFRESH_SPACING, DEFAULT_MIN_REFRESH_SPACING), DEFAULT_MIN_REFRESH_SPACING, 0, 3600
+    )
+
     @callback
     async def _refresh_data(now=None):
         _LOGGER.debug("Scheduled refresh fired at %s", now)
-        await coordinator.async_request_refresh()
-        # Persist cache after each scheduled refresh
-        try:
-            store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.cache")
-            await store.async_save(
-                {
-                    "last_refresh_ts": time.time(),
-                    "data": coordinator.data,
-                }
-            )
-        except Exception as e:
-            _LOGGER.debug("Failed saving cache after refresh: %s", e)
+        # Through the arbiter: joins a refresh already running, or reuses one that just finished
+        await coordinator.async_refresh()
+        # Persist cache after each scheduled refresh (skipped when the data is the one already saved)
+        await coordinator.async_save_cache()
+
+    async def _prewarm(now=None):
+        # DNS, TCP/TLS and session check a few seconds ahead, so the refresh itself starts warm
+        warm = await coordinator.client.async_prewarm()
+        _LOGGER.debug("Pre-warm before scheduled refresh at %s: %s", now, "ok" if warm else "failed")
 
     if schedule_type == "interval":
         # Use *only* coordinator.update_interval (no extra timer)
         coordinator.set_interval_minutes(interval_minutes)
-        _LOGGER.info("Interval mode: coordinator polling every %d minutes", interval_minutes)
+        coordinator.probe_max_age_seconds = _probe_max_age_seconds(merged)
+        _LOGGER.info(
+            "Interval mode: coordinator polling every %d minutes (change probe max age %d minutes)",
+            interval_minutes,
+            coordinator.probe_max_age_seconds // 60,
+        )
 
     else:
         # Disable periodic polling and schedule time-based jobs
         coordinator.set_interval_minutes(None)
+        coordinator.probe_max_age_seconds = 0
         try:
             hh, mm = [int(x) for x in schedule_time.split(":")]
         except Exception:
             hh, mm = 2, 30
 
+        eh, em, es = shift_time(hh, mm, offset)
+        wh, wm, ws = shift_time(hh, mm, offset - PREWARM_LEAD_SECONDS)
+
         if schedule_type == "daily":
-            _LOGGER.info("Daily mode: refresh at %02d:%02d", hh, mm)
-            unsubs.append(async_track_time_change(hass, _refresh_data, hour=hh, minute=mm, second=0))
+            _LOGGER.info("Daily mode: refresh at %02d:%02d (effective %02d:%02d:%02d)", hh, mm, eh, em, es)
+            unsubs.append(async_track_time_change(hass, _prewarm, hour=wh, minute=wm, second=ws))
+            unsubs.append(async_track_time_change(hass, _refresh_data, hour=eh, minute=em, second=es))
 
         elif schedule_type == "weekly":
-            _LOGGER.info("Weekly mode: days=%s at %02d:%02d", days, hh, mm)
+            _LOGGER.info("Weekly mode: days=%s at %02d:%02d (effective %02d:%02d:%02d)", days, hh, mm, eh, em, es)
 
-            @callback
-            async def _maybe_refresh_weekly(now=None):
+            def _weekly_day_due(shift: int) -> bool:
+                # Weekday of the configured time, even when the jitter pushed the fire past midnight
                 try:
-                    today_idx = datetime.now().weekday()
+                    today_idx = (datetime.now() - timedelta(seconds=shift)).weekday()
                 except Exception:
                     try:
                         # Fallback to UTC if needed
-                        today_idx = datetime.utcnow().weekday()  # type: ignore[attr-defined]
+                        today_idx = (datetime.utcnow() - timedelta(seconds=shift)).weekday()  # type: ignore[attr-defined]
                     except Exception:
                         today_idx = -1
-                if today_idx in days:
+                if today_idx not in days:
+                    _LOGGER.debug("Weekly mode: skipping (today=%s not in %s)", today_idx, days)
+                    return False
+                return True
+
+            @callback
+            async def _maybe_refresh_weekly(now=None):
+                if _weekly_day_due(offset):
                     await _refresh_data(now)
-                else:
-                    _LOGGER.debug("Weekly mode: skipping refresh (today=%s not in %s)", today_idx, days)
+
+            @callback
+            async def _maybe_prewarm_weekly(now=None):
+                if _weekly_day_due(offset - PREWARM_LEAD_SECONDS):
+                    await _prewarm(now)
 
             # Schedule once daily at the specified time; gate by weekday inside the callback
-            unsubs.append(async_track_time_change(hass, _maybe_refresh_weekly, hour=hh, minute=mm, second=0))
+            unsubs.append(async_track_time_change(hass, _maybe_prewarm_weekly, hour=wh, minute=wm, second=ws))
+            unsubs.append(async_track_time_change(hass, _maybe_refresh_weekly, hour=eh, minute=em, second=es))
+
+        elif schedule_type == "adaptive":
+            # One timer at a time, planned again after every refresh (scheduled, manual or partial) from the
+            # fresh timetable/holidays; with no school day ahead, planned again daily
+            timer: dict[str, Any] = {"unsub": None, "unsub_prewarm": None, "cancelled": False}
+
+            @callback
+            def _cancel_timers() -> None:
+                for key in ("unsub", "unsub_prewarm"):
+                    if timer[key]:
+                        timer[key]()
+                        timer[key] = None
+
+            @callback
+            def _schedule_next_adaptive() -> None:
+                if timer["cancelled"]:
+                    return
+                _cancel_timers()
+                next_dt = coordinator.next_adaptive_fire()
+                if next_dt is None:
+                    _LOGGER.info(
+                        "Adaptive mode: no school days ahead; planning again in %d hours",
+                        ADAPTIVE_IDLE_REPLAN_SECONDS // 3600,
+                    )
+                    timer["unsub"] = async_call_later(hass, ADAPTIVE_IDLE_REPLAN_SECONDS, _idle_replan)
+                    return
+                _LOGGER.debug("Adaptive mode: next refresh at %s", next_dt.isoformat(timespec="minutes"))
+                timer["unsub"] = async_track_point_in_time(hass, _adaptive_refresh, next_dt)
+                prewarm_dt = next_dt - timedelta(seconds=PREWARM_LEAD_SECONDS)
+                if prewarm_dt > dt_util.now():
+                    timer["unsub_prewarm"] = async_track_point_in_time(hass, _adaptive_prewarm, prewarm_dt)
+
+            @callback
+            def _idle_replan(_now=None) -> None:
+                timer["unsub"] = None
+                _schedule_next_adaptive()
+
+            async def _adaptive_prewarm(now=None):
+                timer["unsub_prewarm"] = None
+                await _prewarm(now)
+
+            async def _adaptive_refresh(now=None):
+                timer["unsub"] = None
+                await _refresh_data(now)
+                _schedule_next_adaptive()
+
+            @callback
+            def _cancel_adaptive() -> None:
+                timer["cancelled"] = True
+                _cancel_timers()
+
+            _LOGGER.info("Adaptive mode: refresh around school hours (timetable and holidays aware)")
+            _schedule_next_adaptive()
+            unsubs.append(_cancel_adaptive)
+            # Manual and partial refreshes (refresh_now) bring new holidays/timetables too
+            unsubs.append(coordinator.async_add_listener(_schedule_next_adaptive))
 
     hass.data[DOMAIN][entry.entry_id]["unsub_daily"] = unsubs
 
 
+def _context_affected(context: Any, slugs: set[str], keys: frozenset[str]) -> bool:
+    """Whether a listener registered with context (slug | None, data keys) must see a partial update.
+
+    Listeners without a context always update; holidays apply to every student.
+    """
+    if not context:
+        return True
+    slug, deps = context
+    hit = deps & keys
+    return bool(hit) and (slug is None or slug in slugs or "holidays" in hit)
+
+
 class MashovCoordinator(DataUpdateCoordinator):
     """Coordinator for Mashov, supporting dynamic interval changes."""
 
@@ -501,6 +925,245 @@ class MashovCoordinator(DataUpdateCoordinator):
         )
         self.client = client
         self.entry = entry
+        # (slug, start, days) -> ((timetable, weekly_plan, holidays), lessons)
+        self._lessons_cache: dict[tuple, tuple[tuple, list[dict[str, Any]]]] = {}
+        # slug -> (lessons_history list, columnar view of it); unused when the data is stored columnar
+        self._history_columns: dict[str, tuple[list[dict[str, Any]], LessonsHistoryColumns]] = {}
+        self._data_generation = 0
+        self._generation_data: Any = None
+        self._change_tracker = ChangeTracker()
+        self._grade_analytics: dict[str, GradeAnalytics] = {}
+        self._change_store: Store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.seen")
+        self._cache_store: Store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.cache")
+        self._cache_saved_data: Any = None
+        # Retention: records older than the hot window live in the archive store, read only on demand.
+        # slug -> data key -> {"count", "digest"} of the archived segment; saved with the cache
+        self._archive_store: Store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.archive")
+        self._archive_index: dict[str, dict[str, dict[str, Any]]] = {}
+        self.refresh_arbiter = RefreshArbiter(DEFAULT_MIN_REFRESH_SPACING)
+        # (slugs, data keys) of the partial refresh being announced to listeners; None for full updates
+        self._partial_scope: tuple[set[str], frozenset[str]] | None = None
+        # Change probe (interval mode): fingerprint of the last probe, when the last full fetch started
+        self.probe_max_age_seconds = 0
+        self._probe_fingerprint: str | None = None
+        self._last_full_fetch: float | None = None  # monotonic
+        self._probe_poll = False
+        self._probe_stats = {"probes": 0, "unchanged": 0, "full_fetches": 0}
+        self.traces = TraceRecorder()
+        self.schedule_offset_seconds = 0  # per-entry jitter/stagger applied to timed schedules
+
+    @property
+    def data_generation(self) -> int:
+        """Counter bumped whenever coordinator.data is replaced; used as a cache key by entities."""
+        if self.data is not self._generation_data:
+            self._generation_data = self.data
+            self._data_generation += 1
+        return self._data_generation
+
+    def merged_options(self) -> dict[str, Any]:
+        """Return entry options with YAML overrides applied."""
+        merged = dict(self.entry.options)
+        yaml_opts = self.hass.data.get(DOMAIN, {}).get("yaml_options", {}) or {}
+        merged.update({k: v for k, v in yaml_opts.items() if v is not None})
+        return merged
+
+    def lessons_window_days(self) -> int:
+        try:
+            days = int(self.merged_options().get(CONF_LESSONS_WINDOW_DAYS, DEFAULT_LESSONS_WINDOW_DAYS))
+            return max(1, min(60, days))
+        except Exception:
+            return DEFAULT_LESSONS_WINDOW_DAYS
+
+    def get_lessons(self, slug: str, start: date | None = None, days: int | None = None) -> list[dict[str, Any]]:
+        """Return dated lesson instances for a student over [start, start + days).
+
+        Results are cached until the student's timetable, weekly plan or the holidays list
+        is replaced by a refresh (identity check, so a cache hit is O(1)).
+        """
+        data = self.data or {}
+        group = data.get("by_slug", {}).get(slug) or {}
+        inputs = (group.get("timetable"), group.get("weekly_plan"), data.get("holidays"))
+        start = start or dt_util.now().date()
+        days = days or self.lessons_window_days()
+
+        key = (slug, start, days)
+        cached = self._lessons_cache.get(key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], inputs, strict=True)):
+            return cached[1]
+
+        lessons = materialize_lessons(inputs[0] or [], inputs[1] or [], inputs[2] or [], start, days)
+        if len(self._lessons_cache) >= 32:
+            # Windows roll forward daily; drop stale keys wholesale rather than tracking LRU
+            self._lessons_cache.clear()
+        self._lessons_cache[key] = (inputs, lessons)
+        return lessons
+
+    def lessons_history(self, slug: str) -> LessonsHistoryColumns:
+        """Columnar view of a student's lessons history for queries.
+
+        The stored one when lessons_history_columnar is on; otherwise built from the list and
+        reused until a refresh replaces that list.
+        """
+        group = (self.data or {}).get("by_slug", {}).get(slug) or {}
+        items = group.get("lessons_history") or []
+        if isinstance(items, LessonsHistoryColumns):
+            return items
+        cached = self._history_columns.get(slug)
+        if cached is not None and cached[0] is items:
+            return cached[1]
+        columns = LessonsHistoryColumns(items, self.client.symbols)
+        self._history_columns[slug] = (items, columns)
+        return columns
+
+    async def async_lessons_history(self, slug: str, start: date | None = None) -> LessonsHistoryColumns:
+        """lessons_history() plus archived lessons from start on, when start reaches before the hot window."""
+        archived = await self.async_archived_items(slug, "lessons_history", start)
+        if not archived:
+            return self.lessons_history(slug)
+        return LessonsHistoryColumns([*archived, *self.lessons_history(slug)], self.client.symbols)
+
+    def _retention_policy(self) -> dict[str, int]:
+        return retention_policy(self.merged_options().get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS))
+
+    def _hot_cutoff(self, data_key: str) -> date | None:
+        return hot_cutoffs(self._retention_policy(), dt_util.now().date()).get(data_key)
+
+    def archived_count(self, slug: str, data_key: str) -> int:
+        """Records of a student's data key moved out of the hot window."""
+        return ((self._archive_index.get(slug) or {}).get(data_key) or {}).get("count", 0)
+
+    def archived_totals(self, slug: str, data_key: str) -> dict[str, Any]:
+        """Count plus retention.segment_totals of a student's archived records; {} when nothing is archived."""
+        segment = (self._archive_index.get(slug) or {}).get(data_key) or {}
+        if not segment.get("count"):
+            return {}
+        return {"count": segment["count"], **(segment.get("totals") or {})}
+
+    async def _async_load_archive(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        stored = await self._archive_store.async_load()
+        if not isinstance(stored, dict):
+            return {}
+        return decode_cache(stored.get("symbols") or [], stored.get("segments") or {})
+
+    async def async_archived_items(
+        self, slug: str, data_key: str, start: date | None = None, end: date | None = None
+    ) -> list[dict[str, Any]]:
+        """Archived records of a data key in [start, end); the archive is read only if the range reaches it."""
+        cutoff = self._hot_cutoff(data_key)
+        if cutoff is None or not self.archived_count(slug, data_key) or (start is not None and start >= cutoff):
+            return []
+        with span("archive_load"):
+            archive = await self._async_load_archive()
+        items = (archive.get(slug) or {}).get(data_key) or []
+        return in_range(items, RETENTION_DATE_FIELDS[data_key], start, end)
+
+    async def async_history(
+        self, slug: str, data_key: str, start: date | None = None, end: date | None = None
+    ) -> list[dict[str, Any]]:
+        """Records of a history key in [start, end): the hot window plus the archive when the range reaches it."""
+        hot = ((self.data or {}).get("by_slug", {}).get(slug) or {}).get(data_key) or []
+        if isinstance(hot, LessonsHistoryColumns):
+            hot = hot.rows(hot.select(start=start, end=end)) if start or end else hot.to_list()
+        else:
+            hot = in_range(hot, RETENTION_DATE_FIELDS[data_key], start, end)
+        return [*await self.async_archived_items(slug, data_key, start, end), *hot]
+
+    async def _async_apply_retention(self, data: dict[str, Any], keys: Iterable[str] | None = None) -> dict[str, Any]:
+        """Move records older than the hot window out of data (in place) and into the archive.
+
+        keys: data keys freshly fetched for data's students (all of them by default); lists not
+        refetched are left alone so their segment isn't overwritten with only the newly aged records.
+        The archive is rewritten only when a segment's content changed.
+        """
+        policy = self._retention_policy()
+        if not policy:
+            if self._archive_index:
+                # Retention turned off: the fetch brought everything back hot
+                self._archive_index = {}
+                await self._archive_store.async_remove()
+            return data
+        fetched = set(keys) if keys is not None else set(RETENTION_DATE_FIELDS)
+        cutoffs = {k: c for k, c in hot_cutoffs(policy, dt_util.now().date()).items() if k in fetched}
+        changed: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for slug, group in (data.get("by_slug") or {}).items():
+            for key, cutoff in cutoffs.items():
+                items = (group or {}).get(key)
+                if not isinstance(items, list):
+                    continue
+                group[key], cold = split_hot_cold(items, RETENTION_DATE_FIELDS[key], cutoff)
+                digest = segment_digest(cold)
+                index = self._archive_index.setdefault(slug, {})
+                previous = index.get(key) or {}
+                if previous.get("digest") != digest:
+                    changed.setdefault(slug, {})[key] = cold
+                totals = previous.get("totals")
+                if totals is None or previous.get("digest") != digest:
+                    totals = segment_totals(key, cold)
+                index[key] = {"count": len(cold), "digest": digest, "totals": totals}
+        if changed:
+            try:
+                with span("archive_save"):
+                    archive = await self._async_load_archive()
+                    for slug, segments in changed.items():
+                        archive.setdefault(slug, {}).update(segments)
+                    symbols, segments = encode_cache(archive)
+                    await self._archive_store.async_save({"symbols": symbols, "segments": segments})
+            except Exception as e:
+                _LOGGER.warning("Failed saving history archive for %s: %s", self.entry.title, e)
+                # Forget the digests so the next refresh writes these segments again
+                for slug, segments in changed.items():
+                    for key in segments:
+                        self._archive_index[slug][key]["digest"] = None
+        return data
+
+    def retention_diagnostics(self) -> dict[str, Any]:
+        return {
+            "policy_days": self._retention_policy(),
+            "archived": {
+                slug: {key: seg["count"] for key, seg in keys.items()} for slug, keys in self._archive_index.items()
+            },
+        }
+
+    def _keep_unavailable(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Fill lists the client left out (endpoint unavailable) with the previous ones (in place).
+
+        Runs after change events and retention, which skip missing lists, so the previous
+        (already processed) lists are carried over as they are.
+        """
+        previous = self.data or {}
+        previous_groups = previous.get("by_slug") or {}
+        for slug, group in (data.get("by_slug") or {}).items():
+            for key in STUDENT_DATA_KEYS:
+                if key not in group:
+                    group[key] = (previous_groups.get(slug) or {}).get(key) or []
+        if "holidays" not in data:
+            data["holidays"] = previous.get("holidays") or []
+        return data
+
+    def _columnize(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Store lessons history lists as columns when lessons_history_columnar is on (in place)."""
+        if not self.merged_options().get(CONF_LESSONS_HISTORY_COLUMNAR, DEFAULT_LESSONS_HISTORY_COLUMNAR):
+            return data
+        for group in (data.get("by_slug") or {}).values():
+            items = (group or {}).get("lessons_history")
+            if isinstance(items, list):
+                group["lessons_history"] = LessonsHistoryColumns(items, self.client.symbols)
+        return data
+
+    def adaptive_plan(self, now: datetime | None = None, days: int = 2) -> list[dict[str, Any]]:
+        """Upcoming adaptive-mode refreshes from all students' timetables and the holidays, jitter applied."""
+        data = self.data or {}
+        timetables = [g.get("timetable") or [] for g in (data.get("by_slug") or {}).values()]
+        shift = timedelta(seconds=self.schedule_offset_seconds)
+        plan = adaptive_plan(timetables, data.get("holidays") or [], (now or dt_util.now()) - shift, days)
+        return [{**p, "at": p["at"] + shift} for p in plan]
+
+    def next_adaptive_fire(self, now: datetime | None = None) -> datetime | None:
+        data = self.data or {}
+        timetables = [g.get("timetable") or [] for g in (data.get("by_slug") or {}).values()]
+        shift = timedelta(seconds=self.schedule_offset_seconds)
+        nxt = next_adaptive_fire(timetables, data.get("holidays") or [], (now or dt_util.now()) - shift)
+        return nxt + shift if nxt else None
 
     def set_interval_minutes(self, minutes: int | None):
         """Set/clear periodic polling interval."""
@@ -511,18 +1174,253 @@ class MashovCoordinator(DataUpdateCoordinator):
             self.update_interval = timedelta(minutes=minutes)
             _LOGGER.info("Coordinator update_interval set to %d minutes.", minutes)
 
+    async def async_load_change_state(self) -> None:
+        """Restore seen items and grade aggregates so restarts don't replay or double count."""
+        try:
+            state = await self._change_store.async_load() or {}
+            self._change_tracker = ChangeTracker(state.get("seen"))
+            self._grade_analytics = {}
+            for slug, agg in (state.get("grade_stats") or {}).items():
+                if "grades" in agg:
+                    self._grade_analytics[slug] = GradeAnalytics(agg)
+                else:
+                    # Totals saved without per-grade values can't follow corrections; rebuild from a new baseline
+                    self._change_tracker.forget(slug, "grades")
+        except Exception as e:
+            _LOGGER.debug("No change-tracking state for entry %s: %s", self.entry.entry_id, e)
+
+    async def async_save_cache(self) -> None:
+        """Persist data for warm restarts; skipped when this exact data was saved already."""
+        if self.data is None or self.data is self._cache_saved_data:
+            return
+        try:
+            with span("cache_save", self.traces.last):
+                symbols, data = encode_cache(self.data)
+                await self._cache_store.async_save(
+                    {
+                        "last_refresh_ts": time.time(),
+                        "symbols": symbols,
+                        "data": data,
+                        "archived": self._archive_index,
+                    }
+                )
+            self._cache_saved_data = self.data
+        except Exception as e:
+            _LOGGER.debug("Failed saving cache: %s", e)
+
+    def decode_cached_data(self, cached: dict[str, Any]) -> dict[str, Any]:
+        """Return the data of a loaded cache; names are interned into the client's symbol table."""
+        self._archive_index = cached.get("archived") or {}
+        if "symbols" not in cached:
+            return self._columnize(cached["data"])  # saved before the symbol-table format
+        return self._columnize(decode_cache(cached["symbols"], cached["data"], self.client.symbols))
+
+    def probe_diagnostics(self) -> dict[str, Any]:
+        age = time.monotonic() - self._last_full_fetch if self._last_full_fetch is not None else None
+        return {
+            "max_age_seconds": self.probe_max_age_seconds,
+            **self._probe_stats,
+            "last_full_fetch_age_seconds": round(age, 1) if age is not None else None,
+        }
+
+    def _change_state(self) -> dict[str, Any]:
+        # Saved together so seen items and the aggregates built from them never drift apart
+        return {
+            "seen": self._change_tracker.as_dict(),
+            "grade_stats": {slug: ga.as_dict() for slug, ga in self._grade_analytics.items()},
+        }
+
+    def get_grade_stats(self, slug: str) -> dict[str, Any] | None:
+        analytics = self._grade_analytics.get(slug)
+        return analytics.summary() if analytics else None
+
+    def _fire_change_events(self, data: dict[str, Any]) -> None:
+        """Diff the new snapshot against seen items and fire one event per new/changed item.
+
+        Baseline, new and changed grades are also folded into the per-student grade aggregates,
+        and grades no longer returned are taken out of them.
+        """
+        try:
+            changes = self._change_tracker.process(data.get("by_slug") or {})
+        except Exception as e:
+            _LOGGER.warning("Change detection failed: %s", e)
+            return
+        students = {s.get("slug"): s for s in data.get("students", [])}
+        announced = 0
+        for slug, data_key, kind, item in changes:
+            if data_key == "grades":
+                self._grade_analytics.setdefault(slug, GradeAnalytics()).add(item)
+            if kind == "baseline":
+                continue
+            announced += 1
+            event_new, event_changed = CHANGE_EVENTS[data_key]
+            stu = students.get(slug, {})
+            self.hass.bus.async_fire(
+                event_new if kind == "new" else event_changed,
+                {
+                    "entry_id": self.entry.entry_id,
+                    "student_slug": slug,
+                    "student_id": stu.get("id"),
+                    "student_name": stu.get("name"),
+                    "data_key": data_key,
+                    "item": item,
+                },
+            )
+        for slug, group in (data.get("by_slug") or {}).items():
+            grades = (group or {}).get("grades")
+            # An empty list is usually a failed fetch, as for the change tracker
+            if grades and slug in self._grade_analytics:
+                self._grade_analytics[slug].retain({item_key("grades", g) for g in grades if isinstance(g, dict)})
+        if announced:
+            _LOGGER.info("Detected %d new/changed item(s) for %s", announced, self.entry.title)
+        self._change_store.async_delay_save(self._change_state, 5)
+
+    def resolve_students(self, student: str | None) -> list[str]:
+        """Return slugs matching a slug, name or id (every student when student is empty)."""
+        return [
+            stu["slug"]
+            for stu in (self.data or {}).get("students", [])
+            if not student or student in (stu.get("slug"), stu.get("name"), str(stu.get("id")))
+        ]
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> Callable[[], None]:
+        """Listen for updates; a (slug | None, data keys) context skips partial updates that don't touch it."""
+
+        @callback
+        def _update() -> None:
+            if self._partial_scope is None or _context_affected(context, *self._partial_scope):
+                update_callback()
+
+        return super().async_add_listener(_update, context)
+
+    async def async_refresh_partial(self, student: str | None = None, data_keys: list[str] | None = None) -> None:
+        """Refetch only some students and/or data keys and merge them into the current data.
+
+        Lists that weren't refetched keep their identity, so identity-keyed caches stay warm, and
+        only entities whose listener context names an affected student and key are updated.
+        A student-only refresh leaves the shared holidays alone.
+        """
+        if not self.data:
+            # Nothing to merge into yet
+            await self.async_request_refresh()
+            return
+        slugs = self.resolve_students(student)
+        if student and not slugs:
+            _LOGGER.warning("refresh_now: no student matching '%s' in %s", student, self.entry.title)
+            return
+        keys = list(data_keys or (*STUDENT_DATA_KEYS, "holidays"))
+        if student:
+            keys = [k for k in keys if k != "holidays"]
+            if not keys:
+                _LOGGER.warning("refresh_now: holidays aren't per student; nothing to refresh for '%s'", student)
+                return
+
+        partial = await self.refresh_arbiter.async_run_partial(
+            lambda: self._async_fetch_partial(slugs if student else None, keys)
+        )
+        # None: a full refresh was already fetching everything and answered this request
+        self.refresh_arbiter.record_partial(coalesced=partial is None)
+
+    async def _async_fetch_partial(self, slugs: list[str] | None, keys: list[str]) -> dict[str, Any]:
+        trace = self.traces.start()
+        try:
+            with span("fetch_partial"):
+                partial = await self.client.async_fetch_partial(slugs, keys)
+        except MashovError as exc:
+            _LOGGER.error("Partial refresh failed for %s: %s", self.entry.title, exc)
+            trace.finish(f"error: {exc}")
+            return {}
+
+        data = dict(self.data)
+        by_slug = dict(data.get("by_slug") or {})
+        for slug, group in partial["by_slug"].items():
+            by_slug[slug] = {**(by_slug.get(slug) or {}), **group}
+        data["by_slug"] = by_slug
+        if "holidays" in partial:
+            data["holidays"] = partial["holidays"]
+        with span("change_events"):
+            self._fire_change_events({"students": data.get("students", []), "by_slug": partial["by_slug"]})
+        refetched = {"by_slug": {slug: by_slug[slug] for slug in partial["by_slug"]}}
+        await self._async_apply_retention(refetched, keys)
+        self._columnize(refetched)
+        trace.finish("ok")
+
+        self.data = data
+        self._partial_scope = (set(partial["by_slug"]), frozenset(keys))
+        try:
+            self.async_update_listeners()
+        finally:
+            self._partial_scope = None
+        return partial
+
+    async def _handle_refresh_interval(self, _now: datetime | None = None) -> None:
+        # Only interval polls may be answered by the change probe; explicit refreshes fetch everything
+        self._probe_poll = True
+        try:
+            await super()._handle_refresh_interval(_now)
+        finally:
+            self._probe_poll = False
+
+    def _probe_due(self) -> bool:
+        """Whether this fetch may be answered by the probe instead of the full fan-out."""
+        return (
+            self._probe_poll
+            and bool(self.data)
+            and self._probe_fingerprint is not None
+            and self._last_full_fetch is not None
+            and time.monotonic() - self._last_full_fetch < self.probe_max_age_seconds
+        )
+
     async def _async_update_data(self):
+        # Every trigger (startup, schedule, interval poll, refresh_now) lands here
+        try:
+            return await self.refresh_arbiter.async_run(self._async_fetch_data, self.data)
+        finally:
+            # The fetch ran in the arbiter's task; entity updates that follow belong to its trace
+            self.traces.resume()
+
+    async def _async_fetch_data(self):
         _LOGGER.debug("Coordinator update started: %s", self.name)
+        trace = self.traces.start()
         try:
-            data = await asyncio.create_task(self.client.async_fetch_all())
+            fingerprint = None
+            if self._probe_due():
+                self._probe_stats["probes"] += 1
+                fingerprint = await self.client.async_probe()
+                if fingerprint is not None and fingerprint == self._probe_fingerprint:
+                    self._probe_stats["unchanged"] += 1
+                    _LOGGER.debug("Change probe unchanged for %s; skipping full fetch", self.entry.title)
+                    trace.finish("ok (probe unchanged)")
+                    return self.data
+
+            self._probe_stats["full_fetches"] += 1
+            self._last_full_fetch = time.monotonic()
+            with span("fetch_all"):
+                if self.probe_max_age_seconds and fingerprint is None:
+                    # Baseline fingerprint for the next poll, taken alongside the full fetch
+                    data, fingerprint = await asyncio.gather(self.client.async_fetch_all(), self.client.async_probe())
+                else:
+                    data = await asyncio.create_task(self.client.async_fetch_all())
+            # Kept only once the full fetch succeeded, so a failed fetch is retried on the next poll
+            self._probe_fingerprint = fingerprint
             _LOGGER.debug("Coordinator update completed; students=%d", len(data.get("students", [])))
-            return data
+            with span("change_events"):
+                self._fire_change_events(data)
+            # After change events, which must see every record; aged records go to the archive
+            await self._async_apply_retention(data)
+            trace.finish("ok")
+            return self._keep_unavailable(self._columnize(data))
         except MashovAuthError as exc:
             _LOGGER.error("Authentication error during data update: %s", exc)
-            raise UpdateFailed(f"Auth error: {exc}") from exc
+            trace.finish(f"auth error: {exc}")
+            # Starts the reauth flow (or fails a blocking first refresh)
+            raise ConfigEntryAuthFailed(f"Auth error: {exc}") from exc
         except MashovError as exc:
             _LOGGER.error("Mashov error during data update: %s", exc)
+            trace.finish(f"error: {exc}")
             raise UpdateFailed(f"Mashov error: {exc}") from exc
         except Exception as exc:
             _LOGGER.error("Unexpected error during data update: %s", exc)
+            trace.finish(f"error: {exc}")
             raise UpdateFailed(f"Unexpected error: {exc}") from exc
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 import logging
+from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
+from .calendar_index import DateIndex
 from .const import (
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
@@ -23,6 +25,9 @@ from .holidays_utils import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Data keys the student calendar reads (get_lessons covers timetable, weekly plan and holidays)
+CALENDAR_DATA_KEYS = ("lessons_history", "timetable", "weekly_plan", "holidays", "homework", "behavior")
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up Mashov calendar entities."""
@@ -31,10 +36,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     coord = data["coordinator"]
 
     entities = [MashovHolidaysCalendar(coord, entry.entry_id)]
+    known: set[str] = set()
+    for stu in (coord.data or {}).get("students", []):
+        known.add(stu["slug"])
+        entities.append(MashovStudentCalendar(coord, stu["id"], stu["slug"], stu["name"]))
 
     _LOGGER.info("Adding %d Mashov calendar entities", len(entities))
     async_add_entities(entities)
 
+    @callback
+    def _add_new_students() -> None:
+        new = [s for s in (coord.data or {}).get("students", []) if s["slug"] not in known]
+        if not new:
+            return
+        known.update(s["slug"] for s in new)
+        _LOGGER.info("Adding %d Mashov calendar entities for new students", len(new))
+        async_add_entities(MashovStudentCalendar(coord, s["id"], s["slug"], s["name"]) for s in new)
+
+    entry.async_on_unload(coord.async_add_listener(_add_new_students))
+
 
 class MashovHolidaysCalendar(CoordinatorEntity, CalendarEntity):
     """Calendar entity for Mashov holidays."""
@@ -43,11 +63,16 @@ class MashovHolidaysCalendar(CoordinatorEntity, CalendarEntity):
 
     def __init__(self, coordinator, entry_id: str):
         """Initialize the calendar entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (None, frozenset({"holidays"})))
         self._entry_id = entry_id
         self._attr_name = "Mashov Holidays Calendar"
         self._attr_unique_id = f"mashov_{entry_id}_holidays_calendar"
 
+    @property
+    def available(self) -> bool:
+        """Unavailable until the first refresh after a boot without cache."""
+        return super().available and self.coordinator.data is not None
+
     @property
     def event(self) -> CalendarEvent | None:
         """Return the current or next upcoming event."""
@@ -149,3 +174,137 @@ class MashovHolidaysCalendar(CoordinatorEntity, CalendarEntity):
     def device_info(self):
         """Return device information."""
         return create_holidays_device_info(DOMAIN, self._entry_id, DEVICE_MANUFACTURER, DEVICE_MODEL)
+
+
+class MashovStudentCalendar(CoordinatorEntity, CalendarEntity):
+    """Per-student calendar of lessons, homework and behavior events."""
+
+    _attr_icon = "mdi:calendar-school"
+
+    def __init__(self, coordinator, student_id: str, student_slug: str, student_name: str):
+        super().__init__(coordinator, (student_slug, frozenset(CALENDAR_DATA_KEYS)))
+        self._student_id = student_id
+        self._student_slug = student_slug
+        self._student_name = student_name
+        self._attr_name = f"Mashov {student_name} Calendar"
+        self._attr_unique_id = f"mashov_{student_id}_calendar"
+        # ((data generation, today), index of CalendarEvent objects)
+        self._index_key: tuple | None = None
+        self._index: DateIndex | None = None
+
+    def _get_index(self) -> DateIndex:
+        """Return the event index, rebuilt only when data is replaced or the day rolls over."""
+        today = dt_util.now().date()
+        key = (self.coordinator.data_generation, today)
+        if self._index is None or self._index_key != key:
+            self._index = DateIndex(self._build_events(today))
+            self._index_key = key
+        return self._index
+
+    def _build_events(self, today: date) -> list[tuple[date, CalendarEvent]]:
+        data = self.coordinator.data or {}
+        group = data.get("by_slug", {}).get(self._student_slug, {})
+        events: list[tuple[date, CalendarEvent]] = []
+
+        def add(day: date | None, summary: str, description: str | None = None):
+            if day:
+                events.append((day, _all_day_event(day, summary, description)))
+
+        # Past lessons come from the lessons log; today onwards from the materialized timetable
+        for it in group.get("lessons_history") or []:
+            day, summary, description = _history_lesson_fields(it)
+            if day and day < today:
+                add(day, summary, description)
+
+        for le in self.coordinator.get_lessons(self._student_slug, today):
+            add(
+                parse_iso_date_to_date(le["date"]),
+                f"שיעור {le.get('lesson')} - {le.get('subject')}",
+                _join_lines(le.get("teacher"), le.get("room"), le.get("plan")),
+            )
+
+        for hw in group.get("homework") or []:
+            add(
+                parse_iso_date_to_date(hw.get("lesson_date") or ""),
+                f"ש.ב: {hw.get('subject_name') or ''}",
+                _join_lines(hw.get("homework"), hw.get("remark")),
+            )
+
+        for ev in group.get("behavior") or []:
+            add(*_behavior_fields(ev))
+
+        return events
+
+    async def _async_archived_events(self, start: date, end: date) -> list[CalendarEvent]:
+        """Events for lessons and behavior older than the retention window, read from the archive."""
+        events = []
+        for data_key, fields in (("lessons_history", _history_lesson_fields), ("behavior", _behavior_fields)):
+            for item in await self.coordinator.async_archived_items(self._student_slug, data_key, start, end):
+                day, summary, description = fields(item)
+                if day:
+                    events.append(_all_day_event(day, summary, description))
+        return events
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the first event today or later."""
+        return self._get_index().first_on_or_after(dt_util.now().date())
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+        start = dt_util.as_local(start_date).date()
+        end_local = dt_util.as_local(end_date)
+        # All-day events occupy [day, day + 1); a range ending mid-day still overlaps that day
+        end = end_local.date() + timedelta(days=1) if end_local.time() != time.min else end_local.date()
+        events = self._get_index().between(start, end)
+        archived = await self._async_archived_events(start, end)
+        if archived:
+            events = sorted(events + archived, key=lambda e: e.start)
+        return events
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"student_name": self._student_name, "student_id": self._student_id}
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"{self._student_id}")},
+            "name": f"Mashov – {self._student_name}",
+            "manufacturer": DEVICE_MANUFACTURER,
+            "model": DEVICE_MODEL,
+        }
+
+
+def _all_day_event(day: date, summary: str, description: str | None) -> CalendarEvent:
+    return CalendarEvent(start=day, end=day + timedelta(days=1), summary=summary, description=description)
+
+
+def _history_lesson_fields(it: dict[str, Any]) -> tuple[date | None, str, str | None]:
+    subject = it.get("subject_name") or it.get("group_name") or ""
+    summary = f"שיעור {it.get('lesson')} - {subject}"
+    if it.get("took_place") is False:
+        summary += " [לא התקיים]"
+    return (
+        parse_iso_date_to_date(it.get("lesson_date") or ""),
+        summary,
+        _join_lines(it.get("remark"), it.get("homework")),
+    )
+
+
+def _behavior_fields(ev: dict[str, Any]) -> tuple[date | None, str, str | None]:
+    return (
+        parse_iso_date_to_date(ev.get("lesson_date") or ""),
+        f"{ev.get('achva_name') or ''} - {ev.get('subject') or ''}",
+        _join_lines(ev.get("reporter"), ev.get("justification")),
+    )
+
+
+def _join_lines(*parts) -> str | None:
+    text = "\n".join(str(p).strip() for p in parts if p and str(p).strip())
+    return text or None
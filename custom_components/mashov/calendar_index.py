@@ -0,0 +1,31 @@
+"""Date-indexed storage for Mashov calendar events."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+
+class DateIndex:
+    """Single-day items sorted by date, answering range queries with two bisects."""
+
+    def __init__(self, entries: Iterable[tuple[date, Any]]):
+        pairs = sorted(entries, key=lambda e: e[0])
+        self._ordinals = [d.toordinal() for d, _ in pairs]
+        self._values = [v for _, v in pairs]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def between(self, start: date, end: date) -> list[Any]:
+        """Return items dated within [start, end)."""
+        lo = bisect_left(self._ordinals, start.toordinal())
+        hi = bisect_left(self._ordinals, end.toordinal(), lo)
+        return self._values[lo:hi]
+
+    def first_on_or_after(self, day: date) -> Any | None:
+        """Return the earliest item dated on or after the given day."""
+        i = bisect_left(self._ordinals, day.toordinal())
+        return self._values[i] if i < len(self._values) else None
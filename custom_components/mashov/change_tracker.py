@@ -0,0 +1,92 @@
+"""Keyed change detection between successive Mashov data snapshots."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+# Data keys with per-item identity worth announcing
+TRACKED_KEYS = ("homework", "grades", "behavior")
+
+# Seen entries kept per (student, data key); items that left the fetch window are forgotten oldest-first
+MAX_SEEN_PER_KEY = 5000
+
+
+def item_key(data_key: str, item: dict[str, Any]) -> str:
+    """Return a stable identity for an item of the given data key."""
+    if data_key == "homework":
+        if item.get("lesson_id"):
+            return f"{item.get('lesson_id')}|{item.get('group_id')}"
+        return f"{item.get('lesson_date')}|{item.get('lesson')}|{item.get('group_id')}"
+    if data_key == "behavior":
+        if item.get("lesson_id"):
+            return f"{item.get('lesson_id')}|{item.get('event_code')}|{item.get('achva_code')}"
+        return f"{item.get('lesson_date')}|{item.get('lesson')}|{item.get('achva_name')}"
+    if data_key == "grades":
+        event_id = item.get("gradingEventId") or item.get("id")
+        if event_id:
+            return str(event_id)
+        return f"{item.get('eventDate')}|{item.get('subjectName')}|{item.get('gradingEvent')}"
+    return item_fingerprint(item)
+
+
+def item_fingerprint(item: dict[str, Any]) -> str:
+    """Return a short content hash used to notice edits to an already-seen item."""
+    raw = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ChangeTracker:
+    """Remember seen items per student and data key, and report what is new or changed.
+
+    Items of the first snapshot of a (student, data key) are reported as "baseline" so
+    consumers can seed state without announcing the whole history as new.
+    """
+
+    def __init__(self, state: dict[str, Any] | None = None):
+        # {slug: {data_key: {item_key: fingerprint}}}
+        self._seen: dict[str, dict[str, dict[str, str]]] = state if isinstance(state, dict) else {}
+
+    def as_dict(self) -> dict[str, Any]:
+        return self._seen
+
+    def forget(self, slug: str, data_key: str) -> None:
+        """Drop seen items of one student's data key; its next snapshot is reported as baseline again."""
+        (self._seen.get(slug) or {}).pop(data_key, None)
+
+    def process(self, by_slug: dict[str, dict[str, Any]]) -> list[tuple[str, str, str, dict[str, Any]]]:
+        """Diff a new by_slug snapshot against seen state.
+
+        Returns (slug, data_key, kind, item) tuples where kind is "baseline", "new" or "changed".
+        """
+        changes: list[tuple[str, str, str, dict[str, Any]]] = []
+        for slug, group in (by_slug or {}).items():
+            student_seen = self._seen.setdefault(slug, {})
+            for data_key in TRACKED_KEYS:
+                items = (group or {}).get(data_key) or []
+                if not items:
+                    # Empty lists are usually a failed fetch; never let them reset the baseline
+                    continue
+                seen = student_seen.get(data_key)
+                baseline = seen is None
+                seen = seen if seen is not None else {}
+                for item in items:
+                    if not isinstance(item, dict):
+                        continue
+                    key = item_key(data_key, item)
+                    fp = item_fingerprint(item)
+                    prev = seen.get(key)
+                    if prev == fp:
+                        continue
+                    if baseline:
+                        changes.append((slug, data_key, "baseline", item))
+                    else:
+                        changes.append((slug, data_key, "new" if prev is None else "changed", item))
+                    seen.pop(key, None)
+                    seen[key] = fp
+                if len(seen) > MAX_SEEN_PER_KEY:
+                    for key in list(seen)[: len(seen) - MAX_SEEN_PER_KEY]:
+                        del seen[key]
+                student_seen[data_key] = seen
+        return changes
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
+from typing import Any
 
 from homeassistant import config_entries  # type: ignore[import-not-found]
 from homeassistant.core import callback  # type: ignore[import-not-found]
@@ -18,27 +20,45 @@ import contextlib
 
 from .const import (
     CONF_API_BASE,
+    CONF_DIAGNOSTICS_FULL_DATA,
+    CONF_HISTORY_RETENTION_DAYS,
     CONF_HOMEWORK_DAYS_BACK,
     CONF_HOMEWORK_DAYS_FORWARD,
+    CONF_LESSONS_HISTORY_COLUMNAR,
+    CONF_LESSONS_WINDOW_DAYS,
     CONF_MAX_ITEMS_IN_ATTRIBUTES,
+    CONF_MIN_REFRESH_SPACING,
     CONF_PASSWORD,
+    CONF_PROBE_MAX_AGE,
     CONF_SCHEDULE_DAY,
     CONF_SCHEDULE_DAYS,
     CONF_SCHEDULE_INTERVAL,
+    CONF_SCHEDULE_JITTER_MINUTES,
     CONF_SCHEDULE_TIME,
     CONF_SCHEDULE_TYPE,
     CONF_SCHOOL_ID,
     CONF_SCHOOL_NAME,
+    CONF_STARTUP_MODE,
     CONF_USERNAME,
+    CONF_YEAR,
     DEFAULT_API_BASE,
+    DEFAULT_DIAGNOSTICS_FULL_DATA,
+    DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_HOMEWORK_DAYS_BACK,
     DEFAULT_HOMEWORK_DAYS_FORWARD,
+    DEFAULT_LESSONS_HISTORY_COLUMNAR,
+    DEFAULT_LESSONS_WINDOW_DAYS,
     DEFAULT_MAX_ITEMS_IN_ATTRIBUTES,
+    DEFAULT_MIN_REFRESH_SPACING,
+    DEFAULT_PROBE_MAX_AGE,
     DEFAULT_SCHEDULE_DAY,
     DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SCHEDULE_JITTER_MINUTES,
     DEFAULT_SCHEDULE_TIME,
     DEFAULT_SCHEDULE_TYPE,
+    DEFAULT_STARTUP_MODE,
     DOMAIN,
+    STARTUP_MODES,
 )
 from .mashov_client import MashovAuthError, MashovClient, MashovError
 
@@ -47,6 +67,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     def __init__(self):
+        self._reauth_entry: config_entries.ConfigEntry | None = None
         self._cached_user = None
         self._school_choices = None
         self._catalog_options = None  # list of {"value": semel, "label": display}
@@ -247,6 +268,44 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
         return self.async_show_form(step_id="pick_school", data_schema=schema, errors=errors)
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Mashov rejected the stored credentials; ask for the password again."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None) -> FlowResult:
+        errors = {}
+        entry = self._reauth_entry
+        if user_input is not None:
+            client = MashovClient(
+                school_id=entry.data[CONF_SCHOOL_ID],
+                year=entry.data.get(CONF_YEAR),
+                username=entry.data[CONF_USERNAME],
+                password=user_input[CONF_PASSWORD],
+                api_base=entry.options.get(CONF_API_BASE, DEFAULT_API_BASE),
+            )
+            try:
+                await client.async_init(self.hass)
+            except MashovAuthError as e:
+                _LOGGER.error("Authentication error: %s", e)
+                errors["base"] = "auth"
+            except Exception as e:
+                _LOGGER.error("Error during re-authentication: %s", e)
+                errors["base"] = "cannot_connect"
+            else:
+                return self.async_update_reload_and_abort(
+                    entry, data={**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+                )
+            finally:
+                await client.async_close()
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={"username": entry.data[CONF_USERNAME]},
+            errors=errors,
+        )
+
     # Ensure HA can discover options flow via the ConfigFlow class (for cores that expect it)
     @staticmethod
     @callback
@@ -295,6 +354,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 # Drop legacy key
                 if CONF_SCHEDULE_DAYS in normalized and CONF_SCHEDULE_DAY in normalized:
                     normalized.pop(CONF_SCHEDULE_DAY, None)
+                # A per-key retention mapping (YAML / set_options) isn't editable here; keep it
+                retention = self.config_entry.options.get(CONF_HISTORY_RETENTION_DAYS)
+                if CONF_HISTORY_RETENTION_DAYS not in normalized and isinstance(retention, dict):
+                    normalized[CONF_HISTORY_RETENTION_DAYS] = retention
             except Exception as e:
                 _LOGGER.debug("Options normalization failed: %s", e)
 
@@ -320,11 +383,38 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             CONF_SCHEDULE_DAY: self.config_entry.options.get(CONF_SCHEDULE_DAY, DEFAULT_SCHEDULE_DAY),
             CONF_SCHEDULE_DAYS: self.config_entry.options.get(CONF_SCHEDULE_DAYS, [DEFAULT_SCHEDULE_DAY]),
             CONF_SCHEDULE_INTERVAL: self.config_entry.options.get(CONF_SCHEDULE_INTERVAL, DEFAULT_SCHEDULE_INTERVAL),
+            CONF_SCHEDULE_JITTER_MINUTES: self.config_entry.options.get(
+                CONF_SCHEDULE_JITTER_MINUTES, DEFAULT_SCHEDULE_JITTER_MINUTES
+            ),
+            CONF_MIN_REFRESH_SPACING: self.config_entry.options.get(
+                CONF_MIN_REFRESH_SPACING, DEFAULT_MIN_REFRESH_SPACING
+            ),
+            CONF_PROBE_MAX_AGE: self.config_entry.options.get(CONF_PROBE_MAX_AGE, DEFAULT_PROBE_MAX_AGE),
             CONF_MAX_ITEMS_IN_ATTRIBUTES: self.config_entry.options.get(
                 CONF_MAX_ITEMS_IN_ATTRIBUTES, DEFAULT_MAX_ITEMS_IN_ATTRIBUTES
             ),
+            CONF_LESSONS_WINDOW_DAYS: self.config_entry.options.get(
+                CONF_LESSONS_WINDOW_DAYS, DEFAULT_LESSONS_WINDOW_DAYS
+            ),
+            CONF_LESSONS_HISTORY_COLUMNAR: self.config_entry.options.get(
+                CONF_LESSONS_HISTORY_COLUMNAR, DEFAULT_LESSONS_HISTORY_COLUMNAR
+            ),
+            CONF_HISTORY_RETENTION_DAYS: self.config_entry.options.get(
+                CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS
+            ),
+            CONF_DIAGNOSTICS_FULL_DATA: self.config_entry.options.get(
+                CONF_DIAGNOSTICS_FULL_DATA, DEFAULT_DIAGNOSTICS_FULL_DATA
+            ),
+            CONF_STARTUP_MODE: self.config_entry.options.get(CONF_STARTUP_MODE, DEFAULT_STARTUP_MODE),
         }
         _LOGGER.debug("Options defaults resolved: %s", options)
+        retention_field = {}
+        if not isinstance(options[CONF_HISTORY_RETENTION_DAYS], dict):
+            retention_field = {
+                vol.Optional(CONF_HISTORY_RETENTION_DAYS, default=options[CONF_HISTORY_RETENTION_DAYS]): vol.All(
+                    int, vol.Range(min=0, max=365)
+                )
+            }
         schema = vol.Schema(
             {
                 vol.Optional(CONF_HOMEWORK_DAYS_BACK, default=options[CONF_HOMEWORK_DAYS_BACK]): vol.All(
@@ -335,7 +425,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 ),
                 vol.Optional(CONF_API_BASE, default=options[CONF_API_BASE]): str,
                 vol.Optional(CONF_SCHEDULE_TYPE, default=options[CONF_SCHEDULE_TYPE]): vol.In(
-                    ["daily", "weekly", "interval"]
+                    ["daily", "weekly", "interval", "adaptive"]
                 ),
                 vol.Optional(CONF_SCHEDULE_TIME, default=options[CONF_SCHEDULE_TIME]): str,
                 # Hide legacy single-day field by not including it in the schema
@@ -358,9 +448,25 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(CONF_SCHEDULE_INTERVAL, default=options[CONF_SCHEDULE_INTERVAL]): vol.All(
                     int, vol.Range(min=5, max=1440)
                 ),
+                vol.Optional(CONF_SCHEDULE_JITTER_MINUTES, default=options[CONF_SCHEDULE_JITTER_MINUTES]): vol.All(
+                    int, vol.Range(min=0, max=60)
+                ),
+                vol.Optional(CONF_MIN_REFRESH_SPACING, default=options[CONF_MIN_REFRESH_SPACING]): vol.All(
+                    int, vol.Range(min=0, max=3600)
+                ),
+                vol.Optional(CONF_PROBE_MAX_AGE, default=options[CONF_PROBE_MAX_AGE]): vol.All(
+                    int, vol.Range(min=0, max=1440)
+                ),
                 vol.Optional(CONF_MAX_ITEMS_IN_ATTRIBUTES, default=options[CONF_MAX_ITEMS_IN_ATTRIBUTES]): vol.All(
                     int, vol.Range(min=10, max=500)
                 ),
+                vol.Optional(CONF_LESSONS_WINDOW_DAYS, default=options[CONF_LESSONS_WINDOW_DAYS]): vol.All(
+                    int, vol.Range(min=1, max=60)
+                ),
+                vol.Optional(CONF_LESSONS_HISTORY_COLUMNAR, default=options[CONF_LESSONS_HISTORY_COLUMNAR]): bool,
+                **retention_field,
+                vol.Optional(CONF_DIAGNOSTICS_FULL_DATA, default=options[CONF_DIAGNOSTICS_FULL_DATA]): bool,
+                vol.Optional(CONF_STARTUP_MODE, default=options[CONF_STARTUP_MODE]): vol.In(STARTUP_MODES),
             }
         )
         _LOGGER.debug(
@@ -11,11 +11,23 @@ CONF_PASSWORD = "password"
 CONF_HOMEWORK_DAYS_BACK = "homework_days_back"
 CONF_HOMEWORK_DAYS_FORWARD = "homework_days_forward"
 CONF_API_BASE = "api_base"
-CONF_SCHEDULE_TYPE = "schedule_type"  # "daily", "weekly", "interval"
+CONF_SCHEDULE_TYPE = "schedule_type"  # "daily", "weekly", "interval", "adaptive"
 CONF_SCHEDULE_TIME = "schedule_time"  # "HH:MM" for daily/weekly
 CONF_SCHEDULE_DAY = "schedule_day"  # 0-6 for weekly (0=Monday) - backwards compat
 CONF_SCHEDULE_DAYS = "schedule_days"  # list of 0-6 for weekly
 CONF_SCHEDULE_INTERVAL = "schedule_interval"  # minutes for interval
+CONF_SCHEDULE_JITTER_MINUTES = "schedule_jitter_minutes"  # per-entry spread window after schedule_time
+CONF_MIN_REFRESH_SPACING = "min_refresh_spacing_seconds"  # refreshes closer than this reuse the last result
+CONF_PROBE_MAX_AGE = "probe_max_age_minutes"  # interval mode: full fetch at least this often (0 = no probe)
+CONF_LESSONS_WINDOW_DAYS = "lessons_window_days"  # days of dated lessons materialized from the timetable
+CONF_HISTORY_RETENTION_DAYS = "history_retention_days"  # days of lessons history/behavior/grades kept hot (0 = all)
+CONF_LESSONS_HISTORY_COLUMNAR = "lessons_history_columnar"  # keep lessons history as columns, not a dict per lesson
+CONF_DIAGNOSTICS_FULL_DATA = "diagnostics_full_data"  # include the full dataset in diagnostics downloads
+CONF_STARTUP_MODE = "startup_mode"  # "deferred" (refresh in background after HA started) or "blocking"
+# YAML-only: request rate limits shared by all entries
+CONF_RATE_LIMIT_LOGINS_PER_MINUTE = "rate_limit_logins_per_minute"
+CONF_RATE_LIMIT_REQUESTS_PER_SECOND = "rate_limit_requests_per_second"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
 
 PLATFORMS = ["sensor", "calendar"]
 
@@ -26,6 +38,24 @@ DEFAULT_SCHEDULE_TYPE = "daily"
 DEFAULT_SCHEDULE_TIME = "14:00"
 DEFAULT_SCHEDULE_DAY = 0  # Monday
 DEFAULT_SCHEDULE_INTERVAL = 60  # 60 minutes
+DEFAULT_SCHEDULE_JITTER_MINUTES = 10
+DEFAULT_MIN_REFRESH_SPACING = 60
+DEFAULT_PROBE_MAX_AGE = 60
+DEFAULT_LESSONS_WINDOW_DAYS = 7
+DEFAULT_HISTORY_RETENTION_DAYS = 0
+DEFAULT_LESSONS_HISTORY_COLUMNAR = False
+DEFAULT_DIAGNOSTICS_FULL_DATA = False
+DEFAULT_STARTUP_MODE = "deferred"
+STARTUP_MODES = ["deferred", "blocking"]
+STARTUP_RETRY_BASE_SECONDS = 30  # first retry of a failed deferred startup refresh; doubles per attempt
+STARTUP_RETRY_MAX_SECONDS = 30 * 60
+ADAPTIVE_IDLE_REPLAN_SECONDS = 24 * 3600  # adaptive mode with no school day ahead: plan again daily
+DIAGNOSTICS_SAMPLE_ITEMS = 3  # items per data key shown in summary diagnostics
+DIAGNOSTICS_SIZE_SAMPLE_ROWS = 20  # rows serialized per data key to estimate its size
+DEFAULT_RATE_LIMIT_LOGINS_PER_MINUTE = 6
+DEFAULT_RATE_LIMIT_REQUESTS_PER_SECOND = 10
+DEFAULT_RATE_LIMIT_BURST = 20
+RATE_LIMIT_LOGIN_BURST = 3
 
 # Maximum items to store in sensor attributes (to avoid DB size issues)
 # Full data is always available via coordinator.data
@@ -40,6 +70,35 @@ SENSOR_KEY_TIMETABLE = "timetable"
 SENSOR_KEY_LESSONS_HISTORY = "lessons_history"
 SENSOR_KEY_GRADES = "grades"
 SENSOR_KEY_HOLIDAYS = "holidays"
+SENSOR_KEY_TOMORROW_BAG = "tomorrow_bag"
+SENSOR_KEY_GRADE_STATS = "grade_stats"
+SENSOR_KEY_API_LATENCY = "api_latency"
+SENSOR_KEY_API_REQUESTS = "api_requests"
+SENSOR_KEY_API_BYTES = "api_bytes"
+
+# Grade analytics: weight per gradeType for the weighted mean (unknown types weigh 1)
+GRADE_TYPE_WEIGHTS = {
+    "מבחן מסכם": 3.0,
+    "מבחן": 2.0,
+    "בוחן": 1.0,
+    "עבודה": 1.0,
+    "שיעורי בית": 0.5,
+}
+DEFAULT_GRADE_TYPE_WEIGHT = 1.0
+GRADE_TREND_WINDOW = 5  # last N grades used for the trend slope
+
+# Events fired when a refresh brings new or edited items: data_key -> (new, changed)
+EVENT_NEW_HOMEWORK = "mashov_new_homework"
+EVENT_HOMEWORK_CHANGED = "mashov_homework_changed"
+EVENT_NEW_GRADE = "mashov_new_grade"
+EVENT_GRADE_CHANGED = "mashov_grade_changed"
+EVENT_NEW_BEHAVIOR = "mashov_new_behavior"
+EVENT_BEHAVIOR_CHANGED = "mashov_behavior_changed"
+CHANGE_EVENTS = {
+    SENSOR_KEY_HOMEWORK: (EVENT_NEW_HOMEWORK, EVENT_HOMEWORK_CHANGED),
+    SENSOR_KEY_GRADES: (EVENT_NEW_GRADE, EVENT_GRADE_CHANGED),
+    SENSOR_KEY_BEHAVIOR: (EVENT_NEW_BEHAVIOR, EVENT_BEHAVIOR_CHANGED),
+}
 
 DEVICE_MANUFACTURER = "Mashov (Unofficial)"
 DEVICE_MODEL = "Mashov Student Data"
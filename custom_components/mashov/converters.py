@@ -0,0 +1,136 @@
+"""Row converters generated from field_specs.SPECS by normalizers.render_converters.
+
+Do not edit: change the spec and run `python scripts/gen_converters.py`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from .field_specs import _group_details, _time_table
+from .symbols import SymbolTable
+
+Converter = Callable[[list[Any], SymbolTable], list[dict[str, Any]]]
+
+
+def _homework(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    intern = symbols.intern
+    return [
+        {
+            "lesson_id": row.get("lessonId"),
+            "lesson_date": row.get("lessonDate"),
+            "lesson": row.get("lesson"),
+            "homework": row.get("homework"),
+            "group_id": row.get("groupId"),
+            "remark": row.get("remark"),
+            "student_guid": row.get("studentGuid"),
+            "subject_name": intern(row.get("subjectName")),
+        }
+        for row in rows
+        if isinstance(row, dict)
+    ]
+
+
+def _behavior(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    intern = symbols.intern
+    return [
+        {
+            "student_guid": row.get("studentGuid"),
+            "event_code": row.get("eventCode"),
+            "justified": row.get("justified"),
+            "lesson_id": row.get("lessonId"),
+            "reporter_guid": row.get("reporterGuid"),
+            "timestamp": row.get("timestamp"),
+            "group_id": row.get("groupId"),
+            "lesson_type": row.get("lessonType"),
+            "lesson": row.get("lesson"),
+            "lesson_date": row.get("lessonDate"),
+            "lesson_reporter": intern(row.get("lessonReporter")),
+            "achva_code": row.get("achvaCode"),
+            "achva_name": intern(row.get("achvaName")),
+            "achva_aval": row.get("achvaAval"),
+            "justification_id": row.get("justificationId"),
+            "justification": row.get("justification"),
+            "reporter": intern(row.get("reporter")),
+            "subject": intern(row.get("subject")),
+        }
+        for row in rows
+        if isinstance(row, dict)
+    ]
+
+
+def _weekly_plan(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    return [
+        {
+            "group_id": row.get("groupid"),
+            "lesson_date": row.get("lessondate"),
+            "lesson": row.get("lesson"),
+            "plan": row.get("plan"),
+        }
+        for row in rows
+        if isinstance(row, dict)
+    ]
+
+
+def _timetable(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    return [
+        {
+            "timeTable": _time_table(row, symbols),
+            "groupDetails": _group_details(row, symbols),
+        }
+        for row in rows
+        if isinstance(row, dict)
+    ]
+
+
+def _lessons_history(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    intern = symbols.intern
+    return [
+        {
+            "lesson_id": obj1.get("lessonID"),
+            "group_id": obj1.get("groupId"),
+            "lesson_date": obj1.get("lessonDate"),
+            "lesson": obj1.get("lesson"),
+            "took_place": obj1.get("tookPlace"),
+            "remark": obj1.get("remark"),
+            "homework": obj1.get("homeWork"),
+            "lessontype": obj1.get("lessontype"),
+            "reporter_guid": obj1.get("reporterGuid"),
+            "group_name": intern(row.get("groupName")),
+            "subject_name": intern(row.get("subjectName")),
+        }
+        for row in rows
+        if isinstance(row, dict)
+        for obj1 in [row.get("lessonLog") or {}]
+        if isinstance(obj1, dict)
+    ]
+
+
+def _grades(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    intern_fields = symbols.intern_fields
+    return [intern_fields(row) for row in rows if isinstance(row, dict)]
+
+
+def _holidays(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": row.get("id"),
+            "name": row.get("hollyDayName") or row.get("holidayName") or row.get("name"),
+            "start": row.get("startDate"),
+            "end": row.get("endDate"),
+        }
+        for row in rows
+        if isinstance(row, dict)
+    ]
+
+
+CONVERTERS: dict[str, Converter] = {
+    "homework": _homework,
+    "behavior": _behavior,
+    "weekly_plan": _weekly_plan,
+    "timetable": _timetable,
+    "lessons_history": _lessons_history,
+    "grades": _grades,
+    "holidays": _holidays,
+}
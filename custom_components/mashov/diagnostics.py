@@ -1,16 +1,98 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
+import json
+from typing import Any
+
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from .const import (
+    CONF_DIAGNOSTICS_FULL_DATA,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DEFAULT_DIAGNOSTICS_FULL_DATA,
+    DIAGNOSTICS_SAMPLE_ITEMS,
+    DIAGNOSTICS_SIZE_SAMPLE_ROWS,
+    DOMAIN,
+)
+from .history_columns import LessonsHistoryColumns
+from .rate_limiter import rate_limit_diagnostics
 
 TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
 
 
-async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+def _estimate_json_size(items: Sequence[Any]) -> int:
+    """Approximate serialized size of a list from up to DIAGNOSTICS_SIZE_SAMPLE_ROWS evenly spaced rows."""
+    count = len(items)
+    if not count:
+        return 2
+    step = max(1, count // DIAGNOSTICS_SIZE_SAMPLE_ROWS)
+    sample = [items[i] for i in range(0, count, step)][:DIAGNOSTICS_SIZE_SAMPLE_ROWS]
+    sample_bytes = len(json.dumps(sample, ensure_ascii=False, default=str).encode("utf-8"))
+    # Brackets and separators are counted once per sampled row, so scaling by the row count stays close
+    return round(sample_bytes * count / len(sample))
+
+
+def _summarize_items(items: Any) -> dict[str, Any]:
+    if not isinstance(items, list | LessonsHistoryColumns):
+        items = []
     return {
+        "count": len(items),
+        "bytes": _estimate_json_size(items),
+        "sample": list(items[:DIAGNOSTICS_SAMPLE_ITEMS]),
+    }
+
+
+async def _async_summarize_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Counts, estimated serialized sizes and a few sample items per student and data key.
+
+    Sizes are extrapolated from a handful of rows, so the summary never serializes whole lists.
+    """
+    by_slug: dict[str, Any] = {}
+    for slug, group in (data.get("by_slug") or {}).items():
+        by_slug[slug] = {key: _summarize_items(items) for key, items in (group or {}).items()}
+        await asyncio.sleep(0)
+    holidays = _summarize_items(data.get("holidays") or [])
+    return {
+        "students": [{"slug": s.get("slug"), "year": s.get("year")} for s in data.get("students", [])],
+        "by_slug": by_slug,
+        "holidays": {"count": holidays["count"], "bytes": holidays["bytes"]},
+    }
+
+
+async def _async_full_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Copy the full dataset one student/key at a time, yielding to the event loop in between."""
+    by_slug: dict[str, Any] = {}
+    for slug, group in (data.get("by_slug") or {}).items():
+        by_slug[slug] = {}
+        for key, items in (group or {}).items():
+            if isinstance(items, LessonsHistoryColumns):
+                items = items.to_list()
+            by_slug[slug][key] = async_redact_data(items, set())
+            await asyncio.sleep(0)
+    return {**{k: v for k, v in data.items() if k != "by_slug"}, "by_slug": by_slug}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+    coordinator_data = coordinator.data or {}
+    full = coordinator.merged_options().get(CONF_DIAGNOSTICS_FULL_DATA, DEFAULT_DIAGNOSTICS_FULL_DATA)
+    result = {
         "entry": async_redact_data(entry.as_dict(), TO_REDACT),
-        "coordinator_data": async_redact_data(hass.data[DOMAIN][entry.entry_id]["coordinator"].data, set()),
+        "data_summary": await _async_summarize_data(coordinator_data),
+        "resilience": data["client"].resilience_diagnostics(),
+        "rate_limits": rate_limit_diagnostics(),
+        "request_metrics": data["client"].metrics_diagnostics(),
+        "refresh_traces": coordinator.traces.as_list(),
+        "refresh_arbiter": coordinator.refresh_arbiter.as_dict(),
+        "change_probe": coordinator.probe_diagnostics(),
+        "retention": coordinator.retention_diagnostics(),
+        "startup": data.get("startup"),
     }
+    if full:
+        result["coordinator_data"] = await _async_full_data(coordinator_data)
+    return result
@@ -0,0 +1,99 @@
+"""Per-endpoint field specs: output field -> source in the Mashov payload.
+
+The row converters in converters.py are generated from SPECS (see normalizers.render_converters);
+regenerate them with `python scripts/gen_converters.py` after changing a spec.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .symbols import SymbolTable
+
+
+def _time_table(row: dict[str, Any], symbols: SymbolTable) -> dict[str, Any]:
+    table = row.get("timeTable") or {}
+    return table if isinstance(table, dict) else {}
+
+
+def _group_details(row: dict[str, Any], symbols: SymbolTable) -> dict[str, Any]:
+    details = row.get("groupDetails") or {}
+    if not isinstance(details, dict):
+        return {}
+    symbols.intern_fields(details)
+    teachers = details.get("groupTeachers") or []
+    for teacher in teachers if isinstance(teachers, list) else []:
+        if isinstance(teacher, dict):
+            symbols.intern_fields(teacher)
+    return details
+
+
+# Output field -> source: "key"; ("parent", "key") for a key of a nested object (missing
+# parent = {}); ["a", "b"] for the first truthy of several keys; or callable(row, symbols), a
+# module-level function here that never raises on a malformed row.
+# Output fields listed in symbols.INTERNED_FIELDS are interned. None keeps rows as they are,
+# interning their names in place.
+SPECS: dict[str, dict[str, Any] | None] = {
+    "homework": {
+        "lesson_id": "lessonId",
+        "lesson_date": "lessonDate",
+        "lesson": "lesson",
+        "homework": "homework",
+        "group_id": "groupId",
+        "remark": "remark",
+        "student_guid": "studentGuid",
+        "subject_name": "subjectName",
+    },
+    "behavior": {
+        "student_guid": "studentGuid",
+        "event_code": "eventCode",
+        "justified": "justified",
+        "lesson_id": "lessonId",
+        "reporter_guid": "reporterGuid",
+        "timestamp": "timestamp",
+        "group_id": "groupId",
+        "lesson_type": "lessonType",
+        "lesson": "lesson",
+        "lesson_date": "lessonDate",
+        "lesson_reporter": "lessonReporter",
+        "achva_code": "achvaCode",
+        "achva_name": "achvaName",
+        "achva_aval": "achvaAval",
+        "justification_id": "justificationId",
+        "justification": "justification",
+        "reporter": "reporter",
+        "subject": "subject",
+    },
+    "weekly_plan": {
+        "group_id": "groupid",
+        "lesson_date": "lessondate",
+        "lesson": "lesson",
+        "plan": "plan",
+    },
+    # Structure kept mostly intact (timeTable/groupDetails) for UI formatting
+    "timetable": {
+        "timeTable": _time_table,
+        "groupDetails": _group_details,
+    },
+    "lessons_history": {
+        "lesson_id": ("lessonLog", "lessonID"),
+        "group_id": ("lessonLog", "groupId"),
+        "lesson_date": ("lessonLog", "lessonDate"),
+        "lesson": ("lessonLog", "lesson"),
+        "took_place": ("lessonLog", "tookPlace"),
+        "remark": ("lessonLog", "remark"),
+        "homework": ("lessonLog", "homeWork"),
+        "lessontype": ("lessonLog", "lessontype"),
+        "reporter_guid": ("lessonLog", "reporterGuid"),
+        "group_name": "groupName",
+        "subject_name": "subjectName",
+    },
+    # Grades come already normalized from the API
+    "grades": None,
+    "holidays": {
+        "id": "id",
+        "name": ["hollyDayName", "holidayName", "name"],
+        "start": "startDate",
+        "end": "endDate",
+    },
+}
@@ -0,0 +1,159 @@
+"""Incremental per-subject grade aggregates."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .change_tracker import item_key
+from .const import DEFAULT_GRADE_TYPE_WEIGHT, GRADE_TREND_WINDOW, GRADE_TYPE_WEIGHTS
+
+SUBJECT_UNKNOWN = "מקצוע לא ידוע"
+
+
+def grade_value(item: dict[str, Any]) -> float | None:
+    """Return the numeric grade of a record, or None for textual/missing grades."""
+    value = item.get("grade")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def grade_weight(item: dict[str, Any]) -> float:
+    return GRADE_TYPE_WEIGHTS.get((item.get("gradeType") or "").strip(), DEFAULT_GRADE_TYPE_WEIGHT)
+
+
+def _slope(values: list[float]) -> float | None:
+    """Least-squares slope of values over their index (grade points per event)."""
+    n = len(values)
+    if n < 2:
+        return None
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+class GradeAggregate:
+    """Running count/mean/weighted mean; values can be taken out again when a grade changes."""
+
+    def __init__(self):
+        self.count: int = 0
+        self.total: float = 0.0
+        self.weighted_total: float = 0.0
+        self.weight: float = 0.0
+
+    def add(self, value: float, weight: float, sign: int = 1) -> None:
+        self.count += sign
+        self.total += sign * value
+        self.weighted_total += sign * value * weight
+        self.weight += sign * weight
+
+    def remove(self, value: float, weight: float) -> None:
+        self.add(value, weight, -1)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    @property
+    def weighted_mean(self) -> float | None:
+        return self.weighted_total / self.weight if self.count and self.weight else None
+
+    def summary(self, recent: list[float]) -> dict[str, Any]:
+        """Aggregates plus the trend over recent, the last GRADE_TREND_WINDOW values by date."""
+
+        def rnd(v):
+            return round(v, 2) if v is not None else None
+
+        return {
+            "count": self.count,
+            "mean": rnd(self.mean),
+            "weighted_mean": rnd(self.weighted_mean),
+            "trend": rnd(_slope(recent)),
+            "last": recent[-1] if recent else None,
+        }
+
+
+class GradeAnalytics:
+    """Per-student grade aggregates, overall and per subject, fed with new, changed and removed records.
+
+    Each grade's contribution is kept by its identity, so a corrected grade replaces its old
+    value and a grade gone from the fetch is taken out of the aggregates. The summary is built
+    once per change and reused by every read until the next grade is folded in or removed.
+    """
+
+    def __init__(self, state: dict[str, Any] | None = None):
+        state = state or {}
+        # {grade key: [subject, value, weight, eventDate]}
+        self.grades: dict[str, list[Any]] = {}
+        self.overall = GradeAggregate()
+        self.subjects: dict[str, GradeAggregate] = {}
+        self._summary: dict[str, Any] | None = None
+        for key, (subject, value, weight, day) in (state.get("grades") or {}).items():
+            self._put(key, subject, value, weight, day)
+
+    def _put(self, key: str, subject: str, value: float, weight: float, day: str) -> None:
+        self.grades[key] = [subject, value, weight, day]
+        self._summary = None
+        self.overall.add(value, weight)
+        self.subjects.setdefault(subject, GradeAggregate()).add(value, weight)
+
+    def add(self, item: dict[str, Any]) -> bool:
+        """Fold a new or changed grade record in; returns False for non-numeric grades.
+
+        A record already folded in (same identity) has its previous value taken out first.
+        """
+        key = item_key("grades", item)
+        self.remove(key)
+        value = grade_value(item)
+        if value is None:
+            return False
+        subject = item.get("subjectName") or SUBJECT_UNKNOWN
+        self._put(key, subject, value, grade_weight(item), str(item.get("eventDate") or ""))
+        return True
+
+    def remove(self, key: str) -> None:
+        """Take one grade's contribution out of the aggregates, if it was folded in."""
+        old = self.grades.pop(key, None)
+        if old is None:
+            return
+        subject, value, weight, _ = old
+        self._summary = None
+        self.overall.remove(value, weight)
+        agg = self.subjects[subject]
+        agg.remove(value, weight)
+        if not agg.count:
+            del self.subjects[subject]
+
+    def retain(self, keys: set[str]) -> None:
+        """Remove every grade whose key is not in keys (records no longer returned by Mashov)."""
+        for key in [k for k in self.grades if k not in keys]:
+            self.remove(key)
+
+    def _recent(self) -> dict[str | None, list[float]]:
+        """Last GRADE_TREND_WINDOW values by eventDate, overall (None) and per subject."""
+        recent: dict[str | None, list[float]] = {None: []}
+        # Stable sort: same-day grades keep the order they were seen in
+        for subject, value, _, _ in sorted(self.grades.values(), key=lambda g: g[3]):
+            recent[None].append(value)
+            recent.setdefault(subject, []).append(value)
+        return {subject: values[-GRADE_TREND_WINDOW:] for subject, values in recent.items()}
+
+    def summary(self) -> dict[str, Any]:
+        """Overall and per-subject aggregates; cached until the grades change (treat as read-only)."""
+        if self._summary is None:
+            recent = self._recent()
+            self._summary = {
+                **self.overall.summary(recent[None]),
+                "subjects": {subject: agg.summary(recent[subject]) for subject, agg in sorted(self.subjects.items())},
+            }
+        return self._summary
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"grades": self.grades}
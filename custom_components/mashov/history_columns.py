@@ -0,0 +1,260 @@
+"""Columnar lessons history: parallel arrays per field, queried without a dict per lesson.
+
+A school year is well over a thousand lessons per student, each an 11-key dict. Consumers
+mostly filter by date or subject and count, so dates, lesson numbers, subject/group names
+and took-place flags are kept as typed arrays; filters, counts and per-subject aggregates
+run over them and rows are built as dicts only for output.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from datetime import date
+from typing import Any, overload
+
+from .symbols import SymbolTable
+
+# Normalized lessons_history row fields, in normalizers.SPECS order
+ROW_FIELDS = (
+    "lesson_id",
+    "group_id",
+    "lesson_date",
+    "lesson",
+    "took_place",
+    "remark",
+    "homework",
+    "lessontype",
+    "reporter_guid",
+    "group_name",
+    "subject_name",
+)
+_OBJECT_FIELDS = ("lesson_id", "group_id", "remark", "homework", "lessontype", "reporter_guid")
+_NO_LESSON = -32768
+_NO_NAME = -1
+_TOOK = {True: 1, False: 0, None: -1}
+_TOOK_VALUES = {1: True, 0: False, -1: None}
+
+
+def _date_ordinal(value: Any) -> tuple[int, bool]:
+    """(ordinal or 0, whether value is the canonical "YYYY-MM-DDT00:00:00" form of it)."""
+    if not isinstance(value, str):
+        return 0, value is None
+    try:
+        d = date.fromisoformat(value[:10])
+    except ValueError:
+        return 0, False
+    return d.toordinal(), value == f"{d.isoformat()}T00:00:00"
+
+
+class LessonsHistoryColumns(Sequence):
+    """Read-only sequence of lessons-history rows backed by columns.
+
+    Iterating or indexing builds row dicts equal to the normalized rows it was made from;
+    select/count/by_subject/latest answer queries from the arrays. Values that don't fit
+    their typed column (unexpected types, non-canonical dates, extra keys) are kept per row
+    so every row round-trips exactly.
+    """
+
+    def __init__(self, rows: Sequence[dict[str, Any]] = (), symbols: SymbolTable | None = None):
+        self._symbols = symbols if symbols is not None else SymbolTable()
+        self._names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._dates = array("l")
+        self._lessons = array("h")
+        self._took = array("b")
+        self._subject_names = array("l")
+        self._group_names = array("l")
+        self._labels = array("l")  # subject_name, else group_name: what queries group and filter by
+        self._objects: dict[str, list[Any]] = {field: [] for field in _OBJECT_FIELDS}
+        self._raw: dict[int, dict[str, Any]] = {}
+        self._date_order: list[int] | None = None
+        self._date_keys: array | None = None
+        for row in rows:
+            self._append(row)
+
+    def _name_id(self, value: Any) -> int | None:
+        if value is None:
+            return _NO_NAME
+        if not isinstance(value, str):
+            return None
+        idx = self._name_ids.get(value)
+        if idx is None:
+            idx = self._name_ids[value] = len(self._names)
+            self._names.append(self._symbols.intern(value))
+        return idx
+
+    def _append(self, row: dict[str, Any]) -> None:
+        i = len(self._dates)
+        raw: dict[str, Any] = {k: v for k, v in row.items() if k not in ROW_FIELDS}
+
+        ordinal, canonical = _date_ordinal(row.get("lesson_date"))
+        self._dates.append(ordinal)
+        if not canonical:
+            raw["lesson_date"] = row.get("lesson_date")
+
+        lesson = row.get("lesson")
+        if lesson is None:
+            self._lessons.append(_NO_LESSON)
+        elif isinstance(lesson, int) and not isinstance(lesson, bool) and _NO_LESSON < lesson < 32768:
+            self._lessons.append(lesson)
+        else:
+            self._lessons.append(_NO_LESSON)
+            raw["lesson"] = lesson
+
+        took = row.get("took_place")
+        if isinstance(took, bool) or took is None:
+            self._took.append(_TOOK[took])
+        else:
+            self._took.append(-1)
+            raw["took_place"] = took
+
+        ids = {}
+        for field, column in (("subject_name", self._subject_names), ("group_name", self._group_names)):
+            idx = self._name_id(row.get(field))
+            if idx is None:
+                raw[field] = row.get(field)
+                idx = _NO_NAME
+            column.append(idx)
+            ids[field] = idx
+        self._labels.append(ids["subject_name"] if ids["subject_name"] != _NO_NAME else ids["group_name"])
+
+        for field in _OBJECT_FIELDS:
+            self._objects[field].append(row.get(field))
+        missing = [field for field in ROW_FIELDS if field not in row]
+        if missing:
+            raw["__missing__"] = missing
+        if raw:
+            self._raw[i] = raw
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.rows(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self._row(i) for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LessonsHistoryColumns | list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _name(self, idx: int) -> str | None:
+        return self._names[idx] if idx != _NO_NAME else None
+
+    def _row(self, i: int) -> dict[str, Any]:
+        ordinal = self._dates[i]
+        lesson = self._lessons[i]
+        objects = self._objects
+        row = {
+            "lesson_id": objects["lesson_id"][i],
+            "group_id": objects["group_id"][i],
+            "lesson_date": f"{date.fromordinal(ordinal).isoformat()}T00:00:00" if ordinal else None,
+            "lesson": lesson if lesson != _NO_LESSON else None,
+            "took_place": _TOOK_VALUES[self._took[i]],
+            "remark": objects["remark"][i],
+            "homework": objects["homework"][i],
+            "lessontype": objects["lessontype"][i],
+            "reporter_guid": objects["reporter_guid"][i],
+            "group_name": self._name(self._group_names[i]),
+            "subject_name": self._name(self._subject_names[i]),
+        }
+        raw = self._raw.get(i)
+        if raw:
+            for field in raw.get("__missing__", ()):
+                del row[field]
+            row.update({k: v for k, v in raw.items() if k != "__missing__"})
+        return row
+
+    def rows(self, indices: Sequence[int] | range | None = None, limit: int | None = None) -> list[dict[str, Any]]:
+        """Build the row dicts for indices (every row by default), at most limit of them."""
+        indices = range(len(self)) if indices is None else indices
+        if limit is not None:
+            indices = indices[:limit]
+        return [self._row(i) for i in indices]
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return self.rows()
+
+    def _by_date(self) -> tuple[list[int], array]:
+        if self._date_order is None:
+            dates = self._dates
+            self._date_order = sorted(range(len(dates)), key=dates.__getitem__)
+            self._date_keys = array("l", (dates[i] for i in self._date_order))
+        return self._date_order, self._date_keys
+
+    def select(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        subject: str | None = None,
+        took_place: bool | None = None,
+    ) -> list[int]:
+        """Indices of rows with start <= lesson date < end, in date order.
+
+        subject matches subject_name (group_name when a row has no subject). Rows without a
+        date sort first and are excluded by a start bound.
+        """
+        order, keys = self._by_date()
+        lo = bisect_left(keys, start.toordinal()) if start else 0
+        hi = bisect_left(keys, end.toordinal()) if end else len(keys)
+        selected = order[lo:hi]
+        if subject is not None:
+            sid = self._name_ids.get(subject)
+            if sid is None:
+                return []
+            labels = self._labels
+            selected = [i for i in selected if labels[i] == sid]
+        if took_place is not None:
+            flag = _TOOK[took_place]
+            took = self._took
+            selected = [i for i in selected if took[i] == flag]
+        return selected
+
+    def count(self, **filters: Any) -> int:
+        """Number of rows matching select() filters."""
+        if not filters:
+            return len(self)
+        return len(self.select(**filters))
+
+    def by_subject(self, **filters: Any) -> dict[str, dict[str, int]]:
+        """{subject: {"lessons", "took_place", "cancelled"}} over rows matching select() filters."""
+        labels, took = self._labels, self._took
+        if filters:
+            pairs = Counter((labels[i], took[i]) for i in self.select(**filters))
+        else:
+            pairs = Counter(zip(labels, took, strict=True))
+        out: dict[int, dict[str, int]] = {}
+        for (sid, flag), n in pairs.items():
+            agg = out.setdefault(sid, {"lessons": 0, "took_place": 0, "cancelled": 0})
+            agg["lessons"] += n
+            if flag == 1:
+                agg["took_place"] += n
+            elif flag == 0:
+                agg["cancelled"] += n
+        return {self._name(sid) or "": agg for sid, agg in sorted(out.items(), key=lambda kv: -kv[1]["lessons"])}
+
+    def latest(self, limit: int) -> list[dict[str, Any]]:
+        """The limit most recent rows, newest first (rows without a date last)."""
+        # Stable descending order: ties keep their original relative order, as sorted(..., reverse=True) does
+        dates = self._dates
+        newest = sorted(range(len(dates)), key=dates.__getitem__, reverse=True) if limit else []
+        return self.rows(newest, limit)
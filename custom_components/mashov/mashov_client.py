@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
 from datetime import date, timedelta
+import hashlib
+from http.cookies import SimpleCookie
+import json
 import logging
+import random
+import time
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlencode
 
 import aiohttp  # type: ignore[import]
+from yarl import URL
+
+from .metrics import RequestMetrics
+from .normalizers import normalize_rows
+from .rate_limiter import BUDGET_DATA, BUDGET_LOGIN, async_acquire
+from .symbols import SymbolTable
+from .tracing import span
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant  # type: ignore[import]  # pyright: ignore[reportMissingImports]
@@ -26,6 +39,31 @@ LOGIN_ENDPOINT = None
 ME_ENDPOINT = None
 ENDPOINTS: dict[str, str] = {}
 
+# Per-student data keys, in fetch order; each has a spec in normalizers.SPECS
+STUDENT_DATA_KEYS = ("homework", "behavior", "weekly_plan", "timetable", "lessons_history", "grades")
+
+# Change probe: a narrow homework/behavior window per student, the data most likely to move between ticks
+PROBE_KEYS = ("homework", "behavior")
+PROBE_DAYS_BACK = 1
+PROBE_DAYS_FORWARD = 7
+
+# Connection pool: keep idle connections long enough to carry a pre-warm into the refresh after it
+PREWARM_LEAD_SECONDS = 10  # scheduler pre-warms this long before a timed refresh
+KEEPALIVE_SECONDS = 60.0  # aiohttp default is 15s, shorter than a pre-warm lead plus jitter
+DNS_CACHE_SECONDS = 300
+
+# Resilience defaults (overridable per client instance, e.g. in tests)
+RETRY_BASE_DELAY = 1.0  # seconds; doubled per attempt
+RETRY_MAX_DELAY = 30.0
+LOGIN_MAX_RETRIES = 3
+FETCH_MAX_RETRIES = 2  # extra attempts per endpoint on transient errors
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before the circuit opens
+BREAKER_RESET_TIMEOUT = 300.0  # seconds before a half-open probe is allowed
+
+# Returned by _async_get_resilient on outage (5xx, timeouts, network errors, breaker open); the
+# endpoint's key is left out of the fetch result so the coordinator keeps its previous list
+UNAVAILABLE = object()
+
 
 class MashovError(Exception):
     pass
@@ -35,6 +73,76 @@ class MashovAuthError(MashovError):
     pass
 
 
+def _backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with jitter: half fixed, half random, so clients don't retry in lockstep."""
+    delay = min(cap, base * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    closed: requests flow; failures are counted.
+    open: requests are skipped (callers keep their previous data) until reset_timeout passes.
+    half_open: exactly one probe request is let through; other callers are short-circuited
+    until it succeeds (closes) or fails (re-opens). A probe that never reports back (e.g.
+    cancelled) is replaced by a new one after another reset_timeout.
+    """
+
+    def __init__(
+        self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started_at: float | None = None
+        self.last_error: str | None = None
+        self.open_count = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == "open" and self.opened_at is not None and now - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.probe_started_at = now
+            return True
+        if self.state == "half_open" and now - (self.probe_started_at or 0.0) >= self.reset_timeout:
+            self.probe_started_at = now
+            return True
+        if self.state in ("open", "half_open"):
+            self.short_circuited += 1
+            return False
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self, error: str | None = None) -> None:
+        self.failures += 1
+        self.last_error = error
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.open_count += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.probe_started_at = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "open_count": self.open_count,
+            "short_circuited": self.short_circuited,
+            "opened_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+            "last_error": self.last_error,
+        }
+
+
 def _slugify(text: str) -> str:
     out = []
     for ch in text.lower():
@@ -80,6 +188,29 @@ class MashovClient:
         # store all students
         self._students: list[dict[str, Any]] = []  # [{id, name, slug}]
         self._auth_data: dict[str, Any] = {}  # Store authentication response data
+        self._children: list[dict[str, Any]] = []
+
+        # Persisted session: on_session_change is called after every successful login
+        self.session_restored = False
+        self.on_session_change: Callable[[], None] | None = None
+
+        # Resilience: per-endpoint breakers
+        self.retry_base_delay = RETRY_BASE_DELAY
+        self.retry_max_delay = RETRY_MAX_DELAY
+        self.fetch_max_retries = FETCH_MAX_RETRIES
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._login_lock = asyncio.Lock()
+        # Re-logins done through _async_relogin, and the error of the last one (None when it succeeded)
+        self._login_generation = 0
+        self._login_error: MashovError | None = None
+
+        # Per-endpoint request counts, statuses, bytes and latency percentiles
+        self.metrics = RequestMetrics()
+        # Repeated names (subjects, groups, teachers, behavior types) share one str object per entry
+        self.symbols = SymbolTable()
+        # Pre-warm: when the last pre-warm succeeded (monotonic) and whether the running fetch used it
+        self._prewarmed_at: float | None = None
+        self._warm_fetch = False
 
     def _resolve_endpoints(self):
         global LOGIN_ENDPOINT, ME_ENDPOINT, ENDPOINTS
@@ -95,14 +226,93 @@ class MashovClient:
             "grades": self._api_base + "students/{student_id}/grades",
         }
 
+    def _breaker(self, key: str) -> CircuitBreaker:
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker()
+        return self._breakers[key]
+
+    def _retry_delay(self, attempt: int) -> float:
+        return _backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+
+    def resilience_diagnostics(self) -> dict[str, Any]:
+        """Breaker state per endpoint, for diagnostics."""
+        return {
+            "breakers": {key: br.as_dict() for key, br in sorted(self._breakers.items())},
+            "session_restored": self.session_restored,
+        }
+
+    def metrics_diagnostics(self) -> dict[str, Any]:
+        """Per-endpoint request metrics, for diagnostics and diagnostic sensors."""
+        return self.metrics.summary()
+
+    async def _async_relogin(self, stale_token: str | None, generation: int) -> None:
+        """Re-login once for a burst of parallel 401s.
+
+        Callers pass the token and login generation they saw before their request. Waiters
+        behind a re-login of that burst skip it: they see the fresh token, or get the same
+        error back when it failed, instead of sending the rejected credentials again.
+        """
+        async with self._login_lock:
+            if self._login_generation != generation:
+                if self._login_error is not None:
+                    raise self._login_error
+                return
+            if self._headers.get("X-Csrf-Token") != stale_token:
+                return
+            self._login_generation += 1
+            self._login_error = None
+            try:
+                await self.async_init(None)
+            except MashovError as e:
+                self._login_error = e
+                raise
+
     async def async_open_session(self) -> None:
         if self._session is None or self._session.closed:
             _trace("Opening new Mashov client session")
             self._session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=60, connect=30),
-                connector=aiohttp.TCPConnector(limit=10, limit_per_host=5),
+                connector=aiohttp.TCPConnector(
+                    limit=10,
+                    limit_per_host=5,
+                    keepalive_timeout=KEEPALIVE_SECONDS,
+                    ttl_dns_cache=DNS_CACHE_SECONDS,
+                ),
             )
 
+    async def async_prewarm(self) -> bool:
+        """Open a pooled connection and validate the session shortly before a planned refresh.
+
+        Resolves DNS and completes the TCP/TLS handshakes with one small authenticated GET
+        (holidays); a missing session logs in, a rejected one (401) re-logs in now instead of
+        during the refresh. Returns whether the pool is warm.
+        """
+        await self.async_open_session()
+        started = time.monotonic()
+        try:
+            if not self._students or "X-Csrf-Token" not in self._headers:
+                await self.async_init(None)
+            else:
+                token, generation = self._headers.get("X-Csrf-Token"), self._login_generation
+                await async_acquire(BUDGET_DATA)
+                started = time.monotonic()
+                async with self._session.get(ENDPOINTS["holidays"], headers=self._headers) as resp:
+                    self.metrics.record_ttfb("prewarm", time.monotonic() - started)
+                    status = resp.status
+                    body = await resp.read()
+                self.metrics.record("prewarm", time.monotonic() - started, status, len(body))
+                if status == 401:
+                    _LOGGER.debug("Pre-warm found an expired session; logging in ahead of the refresh")
+                    await self._async_relogin(token, generation)
+                elif status >= 400:
+                    _LOGGER.debug("Pre-warm got HTTP %s; the refresh will start cold", status)
+                    return False
+        except Exception as e:
+            _LOGGER.debug("Pre-warm failed after %.2fs: %s", time.monotonic() - started, e)
+            return False
+        self._prewarmed_at = time.monotonic()
+        return True
+
     async def async_close(self):
         if self._session and not self._session.closed:
             _LOGGER.debug("Closing Mashov client session")
@@ -132,6 +342,7 @@ class MashovClient:
         for url, hdrs in candidates:
             try:
                 _trace("Trying schools catalog endpoint: %s", url)
+                await async_acquire(BUDGET_DATA)
                 async with self._session.get(url, headers=hdrs or self._headers) as resp:
                     if resp.status >= 400:
                         _LOGGER.debug("Schools catalog endpoint failed with status %s: %s", resp.status, url)
@@ -170,6 +381,7 @@ class MashovClient:
         for url, hdrs in candidates:
             try:
                 _trace("Trying school search endpoint: %s", url)
+                await async_acquire(BUDGET_DATA)
                 async with self._session.get(url, headers=hdrs or self._headers) as resp:
                     if resp.status >= 400:
                         _LOGGER.debug("School search endpoint failed with status %s: %s", resp.status, url)
@@ -233,9 +445,11 @@ class MashovClient:
         _LOGGER.info("API Base URL: %s", self._api_base)
         await self.async_open_session()
 
-        # Add retry mechanism for login
-        max_retries = 3
-        retry_delay = 2
+        # Add retry mechanism for login (exponential backoff with jitter, guarded by a breaker)
+        max_retries = LOGIN_MAX_RETRIES
+        login_breaker = self._breaker("login")
+        if not login_breaker.allow():
+            raise MashovError("Login circuit open - Mashov recently failing, skipping login attempt")
 
         if self.school_id is None and self.school_name:
             _LOGGER.debug("Resolving school name '%s' to semel", self.school_name)
@@ -283,8 +497,13 @@ class MashovClient:
                 self.username,
             )
             _LOGGER.info("Login endpoint: %s", LOGIN_ENDPOINT)
+            started = None
             try:
+                await async_acquire(BUDGET_LOGIN)
+                started = time.monotonic()
                 async with self._session.post(LOGIN_ENDPOINT, json=payload, headers=headers) as resp:
+                    self.metrics.record("login", time.monotonic() - started, resp.status, resp.content_length or 0)
+                    started = None
                     _LOGGER.info("Login response status: %s", resp.status)
                     _LOGGER.info("Login response headers: %s", dict(resp.headers))
 
@@ -304,9 +523,11 @@ class MashovClient:
                         txt = await resp.text()
                         _LOGGER.error("Login failed HTTP %s: %s", resp.status, txt)
                         if attempt < max_retries - 1:
-                            _LOGGER.debug("Retrying login in %d seconds...", retry_delay)
+                            retry_delay = self._retry_delay(attempt)
+                            _LOGGER.debug("Retrying login in %.1f seconds...", retry_delay)
                             await asyncio.sleep(retry_delay)
                             continue
+                        login_breaker.record_failure(f"HTTP {resp.status}")
                         raise MashovError(f"Login failed HTTP {resp.status}: {txt}")
 
                     # Try to parse response
@@ -356,6 +577,7 @@ class MashovClient:
                         _LOGGER.info("Authentication successful - accessToken/credential received")
                         # Store the full response data for later use
                         self._auth_data = data
+                        login_breaker.record_success()
                         break  # Success, exit retry loop
                     _LOGGER.error("=== AUTHENTICATION FAILED ===")
                     _LOGGER.error(
@@ -365,24 +587,31 @@ class MashovClient:
                     )
                     _LOGGER.error("Full response data: %s", data)
                     if attempt < max_retries - 1:
-                        _LOGGER.info("Retrying login in %d seconds...", retry_delay)
+                        retry_delay = self._retry_delay(attempt)
+                        _LOGGER.info("Retrying login in %.1f seconds...", retry_delay)
                         await asyncio.sleep(retry_delay)
                         continue
                     raise MashovError("No authentication data received after multiple attempts")
 
             except TimeoutError:
                 _LOGGER.warning("Login timeout on attempt %d/%d", attempt + 1, max_retries)
+                if started is not None:
+                    self.metrics.record("login", time.monotonic() - started, None)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
+                    await asyncio.sleep(self._retry_delay(attempt))
                     continue
                 _LOGGER.error("Login timeout - Mashov server is not responding")
+                login_breaker.record_failure("timeout")
                 raise MashovError("Login timeout - Mashov server is not responding") from None
             except aiohttp.ClientError as e:
                 _LOGGER.warning("Network error on attempt %d/%d: %s", attempt + 1, max_retries, e)
+                if started is not None:
+                    self.metrics.record("login", time.monotonic() - started, None)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
+                    await asyncio.sleep(self._retry_delay(attempt))
                     continue
                 _LOGGER.error("Network error during login: %s", e)
+                login_breaker.record_failure(str(e))
                 raise MashovError(f"Network error during login: {e}") from e
 
         # Extract students from authentication response
@@ -396,6 +625,21 @@ class MashovClient:
             _LOGGER.error("No children found in authentication response")
             raise MashovError("No children found in authentication response")
 
+        students = self._parse_children(children)
+        self._students = students
+        _LOGGER.info("=== STUDENTS PROCESSING COMPLETE ===")
+        _LOGGER.info("Mashov: found %d student(s): %s", len(students), ", ".join([s["name"] for s in students]))
+
+        self._children = children
+        self.session_restored = False
+        if self.on_session_change:
+            self.on_session_change()
+
+        # Keep session open for future use - don't close it here
+        _LOGGER.info("=== MASHOV CLIENT INIT COMPLETE ===")
+
+    def _parse_children(self, children: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Build the student list from the login response's children."""
         students: list[dict[str, Any]] = []
         for child in children:
             # Extract child information
@@ -429,123 +673,129 @@ class MashovClient:
                     "groups": groups,
                 }
             )
+        return students
+
+    def session_state(self) -> dict[str, Any]:
+        """Authenticated session (cookies, CSRF token, children) to persist across restarts."""
+        cookies = []
+        if self._session and not self._session.closed:
+            cookies = [
+                {"name": m.key, "value": m.value, "domain": m["domain"], "path": m["path"]}
+                for m in self._session.cookie_jar
+            ]
+        return {
+            "api_base": self._api_base,
+            "school_id": self.school_id,
+            "year": self.year,
+            "username": self.username,
+            "csrf_token": self._headers.get("X-Csrf-Token"),
+            "cookies": cookies,
+            "children": self._children,
+        }
 
+    async def async_restore_session(self, state: dict[str, Any] | None) -> bool:
+        """Adopt a persisted session instead of logging in.
+
+        Nothing is sent here: the first data request validates it, and a 401 there falls
+        back to a real login, which raises MashovAuthError when the credentials are rejected.
+        Returns False when the state is missing or belongs to different credentials.
+        """
+        if not isinstance(state, dict) or not state.get("csrf_token") or not state.get("children"):
+            return False
+        if (state.get("api_base"), state.get("school_id"), state.get("year"), state.get("username")) != (
+            self._api_base,
+            self.school_id,
+            self.year,
+            self.username,
+        ):
+            _LOGGER.debug("Persisted Mashov session belongs to other credentials; ignoring it")
+            return False
+        students = self._parse_children(state["children"])
+        if not students:
+            return False
+        await self.async_open_session()
+        for c in state.get("cookies") or []:
+            cookie = SimpleCookie()
+            cookie[c["name"]] = c["value"]
+            cookie[c["name"]]["path"] = c.get("path") or "/"
+            domain = c.get("domain")
+            if domain:
+                cookie[c["name"]]["domain"] = domain
+            self._session.cookie_jar.update_cookies(cookie, URL(self._api_base))
+        self._headers = {"Accept": "application/json", "X-Csrf-Token": state["csrf_token"]}
+        self._children = state["children"]
         self._students = students
-        _LOGGER.info("=== STUDENTS PROCESSING COMPLETE ===")
-        _LOGGER.info("Mashov: found %d student(s): %s", len(students), ", ".join([s["name"] for s in students]))
+        self.session_restored = True
+        _LOGGER.info("Restored persisted Mashov session for %d student(s); skipping login", len(students))
+        return True
 
-        # Keep session open for future use - don't close it here
-        _LOGGER.info("=== MASHOV CLIENT INIT COMPLETE ===")
+    def _consume_prewarm(self) -> None:
+        # A pre-warm covers the one fetch it was made for, while its connection can still be idle in the pool
+        prewarmed, self._prewarmed_at = self._prewarmed_at, None
+        self._warm_fetch = prewarmed is not None and time.monotonic() - prewarmed < KEEPALIVE_SECONDS
 
-    async def async_fetch_all(self) -> dict[str, Any]:
-        _LOGGER.info("=== FETCHING ALL DATA ===")
+    async def _async_ensure_login(self) -> None:
         # Ensure session and authentication are available (lazy login)
         if not self._session or self._session.closed:
             await self.async_open_session()
         if not self._students or "X-Csrf-Token" not in self._headers:
             _LOGGER.debug("No students/csrf in memory – performing lazy login")
-            await self.async_init(None)
+            with span("login"):
+                await self.async_init(None)
 
         # Ensure we have CSRF token in headers (after lazy login should exist)
         if "X-Csrf-Token" not in self._headers:
             _LOGGER.warning("No CSRF token found in headers for data fetching")
 
+    async def _async_fetch_student(self, stu: dict[str, Any], keys: tuple[str, ...] | list[str]) -> dict[str, Any]:
+        """Fetch and normalize the given data keys for one student, endpoints in parallel."""
+        sid = stu["id"]
         today = date.today()
         from_dt = (today - timedelta(days=self.homework_days_back)).isoformat()
         to_dt = (today + timedelta(days=self.homework_days_forward)).isoformat()
-        today.isoformat()
-
-        _LOGGER.info("Fetching data for %d students from %s to %s", len(self._students), from_dt, to_dt)
 
-        async def fetch_for_student(stu):
-            sid = stu["id"]
-
-            urls = {
-                "homework": ENDPOINTS["homework"].format(student_id=sid, start=from_dt, end=to_dt, year=self.year),
-                "behavior": ENDPOINTS["behavior"].format(student_id=sid, start=from_dt, end=to_dt, year=self.year),
-                "weekly_plan": ENDPOINTS["weekly_plan"].format(student_id=sid),
-                "timetable": ENDPOINTS["timetable"].format(student_id=sid),
-                "lessons_history": ENDPOINTS["lessons_history"].format(student_id=sid),
-                "grades": ENDPOINTS["grades"].format(student_id=sid),
-            }
+        urls = {
+            "homework": ENDPOINTS["homework"].format(student_id=sid, start=from_dt, end=to_dt, year=self.year),
+            "behavior": ENDPOINTS["behavior"].format(student_id=sid, start=from_dt, end=to_dt, year=self.year),
+            "weekly_plan": ENDPOINTS["weekly_plan"].format(student_id=sid),
+            "timetable": ENDPOINTS["timetable"].format(student_id=sid),
+            "lessons_history": ENDPOINTS["lessons_history"].format(student_id=sid),
+            "grades": ENDPOINTS["grades"].format(student_id=sid),
+        }
 
-            async def fetch(url_key: str):
-                url = urls[url_key]
-                _LOGGER.debug("Fetching %s for student %s from: %s", url_key, sid, url)
-                try:
-                    async with self._session.get(url, headers=self._headers) as resp:
-                        _LOGGER.debug("%s response status for student %s: %s", url_key, sid, resp.status)
-                        if resp.status == 401:
-                            _LOGGER.warning("401 on %s for student %s, attempting re-login...", url_key, sid)
-                            await self.async_init(None)  # re-login
-                            return await fetch(url_key)
-                        if resp.status == 404:
-                            _LOGGER.warning("HTTP 404 for %s (student %s) - endpoint not available", url_key, sid)
-                            return []  # Return empty list for 404 errors
-                        if resp.status == 400:
-                            txt = await resp.text()
-                            _LOGGER.warning("HTTP 400 for %s (student %s): %s - skipping", url_key, sid, txt)
-                            return []  # Return empty list for 400 errors
-                        if resp.status >= 400:
-                            txt = await resp.text()
-                            _LOGGER.error("HTTP %s for %s (student %s): %s", resp.status, url_key, sid, txt)
-                            return []  # Return empty list for other errors instead of raising
-                        try:
-                            data = await resp.json()
-                            _LOGGER.debug(
-                                "%s returned %d items for student %s",
-                                url_key,
-                                len(data) if isinstance(data, list) else 1,
-                                sid,
-                            )
-                            return data
-                        except Exception as e:
-                            _LOGGER.debug("Failed to parse %s as JSON for student %s: %s", url_key, sid, e)
-                            return await resp.text()
-                except Exception as e:
-                    _LOGGER.warning("Exception fetching %s for student %s: %s", url_key, sid, e)
-                    return []  # Return empty list on exception
-
-            homework, behavior, weekly_plan, timetable, lessons_history, grades = await asyncio.gather(
-                fetch("homework"),
-                fetch("behavior"),
-                fetch("weekly_plan"),
-                fetch("timetable"),
-                fetch("lessons_history"),
-                fetch("grades"),
-            )
+        with span("fetch"):
+            raws = await asyncio.gather(*(self._async_get_resilient(key, urls[key], sid) for key in keys))
+        with span("normalize"):
+            # Unavailable endpoints are left out; the caller keeps its previous list for them
             return {
-                "homework": self._normalize_homework(homework),
-                "behavior": self._normalize_behavior(behavior),
-                "weekly_plan": self._normalize_weekly_plan(weekly_plan),
-                "timetable": self._normalize_timetable(timetable),
-                "lessons_history": self._normalize_lessons_history(lessons_history),
-                "grades": self._normalize_grades(grades),
+                key: self._normalize(key, raw) for key, raw in zip(keys, raws, strict=True) if raw is not UNAVAILABLE
             }
 
-        _LOGGER.debug("Fetching data for all students in parallel")
-        # Use asyncio.gather for parallel execution
-        results = await asyncio.gather(*(fetch_for_student(s) for s in self._students))
-
-        # Fetch holidays once (not per student)
+    async def _async_fetch_holidays(self) -> list[dict[str, Any]] | None:
+        """Fetched once per refresh (not per student); None when the endpoint is unavailable."""
         holidays_raw = []
-        try:
-            url = ENDPOINTS.get("holidays")
-            if url:
-                _LOGGER.debug("Fetching holidays from: %s", url)
-                async with self._session.get(url, headers=self._headers) as resp:
-                    if resp.status >= 400:
-                        _LOGGER.warning("Holidays endpoint returned %s", resp.status)
-                        holidays_raw = []
-                    else:
-                        holidays_raw = await resp.json(content_type=None)
-        except Exception as e:
-            _LOGGER.debug("Failed fetching holidays: %s", e)
-            holidays_raw = []
+        url = ENDPOINTS.get("holidays")
+        if url:
+            with span("holidays"):
+                holidays_raw = await self._async_get_resilient("holidays", url, "*")
+        if holidays_raw is UNAVAILABLE:
+            return None
+        with span("normalize"):
+            return self._normalize("holidays", holidays_raw)
+
+    async def async_fetch_all(self) -> dict[str, Any]:
+        _LOGGER.info("=== FETCHING ALL DATA ===")
+        self._consume_prewarm()
+        await self._async_ensure_login()
 
-        holidays = self._normalize_holidays(holidays_raw)
+        _LOGGER.info("Fetching data for %d students", len(self._students))
+        _LOGGER.debug("Fetching data for all students in parallel")
+        # Use asyncio.gather for parallel execution
+        results = await asyncio.gather(*(self._async_fetch_student(s, STUDENT_DATA_KEYS) for s in self._students))
+        holidays = await self._async_fetch_holidays()
         by_slug = {self._students[i]["slug"]: results[i] for i in range(len(self._students))}
 
+        # Endpoints left out (unavailable) are filled from the previous data by the coordinator
         result = {
             "students": [
                 {
@@ -558,149 +808,158 @@ class MashovClient:
                 for s in self._students
             ],
             "by_slug": by_slug,
-            "holidays": holidays,
         }
+        if holidays is not None:
+            result["holidays"] = holidays
 
         _LOGGER.debug("Data fetch completed for %d students", len(self._students))
         return result
 
-    # Normalizers
-    def _normalize_weekly_plan(self, raw):
-        items = []
-        try:
-            for plan in raw or []:
-                items.append(
-                    {
-                        "group_id": plan.get("groupid"),
-                        "lesson_date": plan.get("lessondate"),
-                        "lesson": plan.get("lesson"),
-                        "plan": plan.get("plan"),
-                    }
-                )
-        except Exception as e:
-            _LOGGER.debug("normalize weekly plan failed: %s", e)
-        return items
+    async def async_probe(self) -> str | None:
+        """Fetch a narrow homework/behavior window for every student and return its fingerprint.
 
-    def _normalize_timetable(self, raw):
-        """Keep timetable structure (timeTable/groupDetails) mostly intact for UI formatting."""
-        items = []
-        try:
-            if isinstance(raw, list):
-                for it in raw:
-                    # Ensure keys exist with sane defaults
-                    items.append(
-                        {
-                            "timeTable": (it or {}).get("timeTable") or {},
-                            "groupDetails": (it or {}).get("groupDetails") or {},
-                        }
-                    )
-            elif isinstance(raw, dict):
-                # Some deployments may wrap data
-                data_list = raw.get("items") or raw.get("data") or []
-                for it in data_list:
-                    items.append(
-                        {
-                            "timeTable": (it or {}).get("timeTable") or {},
-                            "groupDetails": (it or {}).get("groupDetails") or {},
-                        }
+        Two small requests per student instead of the full fan-out; a fingerprint equal to the
+        previous one means the full fetch can be skipped. Requests use "probe.<key>" metrics
+        and breakers so they never mix with the full-window payloads. None when a probe
+        endpoint is unavailable: nothing can be concluded about changes.
+        """
+        await self._async_ensure_login()
+        today = date.today()
+        start = (today - timedelta(days=PROBE_DAYS_BACK)).isoformat()
+        end = (today + timedelta(days=PROBE_DAYS_FORWARD)).isoformat()
+        targets = [(stu["id"], key) for stu in self._students for key in PROBE_KEYS]
+        with span("probe"):
+            raws = await asyncio.gather(
+                *(
+                    self._async_get_resilient(
+                        f"probe.{key}",
+                        ENDPOINTS[key].format(student_id=sid, start=start, end=end, year=self.year),
+                        sid,
                     )
-        except Exception as e:
-            _LOGGER.debug("normalize timetable failed: %s", e)
-        return items
-
-    def _normalize_homework(self, raw):
-        items = []
-        try:
-            for hw in raw or []:
-                items.append(
-                    {
-                        "lesson_id": hw.get("lessonId"),
-                        "lesson_date": hw.get("lessonDate"),
-                        "lesson": hw.get("lesson"),
-                        "homework": hw.get("homework"),
-                        "group_id": hw.get("groupId"),
-                        "remark": hw.get("remark"),
-                        "student_guid": hw.get("studentGuid"),
-                        "subject_name": hw.get("subjectName"),
-                    }
+                    for sid, key in targets
                 )
-        except Exception as e:
-            _LOGGER.debug("normalize homework failed: %s", e)
-        return items
+            )
+        if any(raw is UNAVAILABLE for raw in raws):
+            return None
+        digest = hashlib.sha256()
+        for (sid, key), raw in zip(targets, raws, strict=True):
+            digest.update(f"{sid}/{key}:".encode())
+            digest.update(json.dumps(raw, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    async def async_fetch_partial(self, slugs: list[str] | None, keys: list[str]) -> dict[str, Any]:
+        """Fetch only some data keys, for some students (all when slugs is None).
+
+        Returns {"by_slug": {slug: {key: items}}} plus "holidays" when requested; the caller
+        merges it into the previous full result.
+        """
+        self._consume_prewarm()
+        await self._async_ensure_login()
+        student_keys = [k for k in STUDENT_DATA_KEYS if k in keys]
+        students = [s for s in self._students if slugs is None or s["slug"] in slugs]
+        _LOGGER.debug("Partial fetch of %s for %d student(s)", keys, len(students))
+
+        result: dict[str, Any] = {"by_slug": {}}
+        if student_keys and students:
+            fetched = await asyncio.gather(*(self._async_fetch_student(s, student_keys) for s in students))
+            result["by_slug"] = {s["slug"]: data for s, data in zip(students, fetched, strict=True)}
+        if "holidays" in keys:
+            holidays = await self._async_fetch_holidays()
+            if holidays is not None:
+                result["holidays"] = holidays
+        return result
 
-    def _normalize_behavior(self, raw):
-        items = []
-        try:
-            for ev in raw or []:
-                items.append(
-                    {
-                        "student_guid": ev.get("studentGuid"),
-                        "event_code": ev.get("eventCode"),
-                        "justified": ev.get("justified"),
-                        "lesson_id": ev.get("lessonId"),
-                        "reporter_guid": ev.get("reporterGuid"),
-                        "timestamp": ev.get("timestamp"),
-                        "group_id": ev.get("groupId"),
-                        "lesson_type": ev.get("lessonType"),
-                        "lesson": ev.get("lesson"),
-                        "lesson_date": ev.get("lessonDate"),
-                        "lesson_reporter": ev.get("lessonReporter"),
-                        "achva_code": ev.get("achvaCode"),
-                        "achva_name": ev.get("achvaName"),
-                        "achva_aval": ev.get("achvaAval"),
-                        "justification_id": ev.get("justificationId"),
-                        "justification": ev.get("justification"),
-                        "reporter": ev.get("reporter"),
-                        "subject": ev.get("subject"),
-                    }
-                )
-        except Exception as e:
-            _LOGGER.debug("normalize behavior failed: %s", e)
-        return items
+    async def _async_get_resilient(self, url_key: str, url: str, sid: str) -> Any:
+        """GET an endpoint with retries, a bounded 401 re-login and a per-endpoint breaker.
+
+        On outage (5xx, timeouts, network errors, breaker open) UNAVAILABLE is returned instead
+        of an empty list, so a failing tick never replaces good data, even right after a restart.
+        A re-login whose credentials are rejected raises MashovAuthError.
+        """
+        breaker = self._breaker(url_key)
+        if not breaker.allow():
+            _LOGGER.debug("Circuit open for %s; skipping request for student %s", url_key, sid)
+            return UNAVAILABLE
+
+        relogged = False
+        attempt = 0
+        error = None
+        while True:
+            _LOGGER.debug("Fetching %s for student %s from: %s", url_key, sid, url)
+            token, generation = self._headers.get("X-Csrf-Token"), self._login_generation
+            started = None
+            try:
+                await async_acquire(BUDGET_DATA)
+                started = time.monotonic()
+                async with self._session.get(url, headers=self._headers) as resp:
+                    # Response headers are in: time to first byte, split by whether the refresh was pre-warmed
+                    self.metrics.record_ttfb("warm" if self._warm_fetch else "cold", time.monotonic() - started)
+                    status = resp.status
+                    body = await resp.read()
+                self.metrics.record(url_key, time.monotonic() - started, status, len(body))
+                started = None
+                _LOGGER.debug("%s response status for student %s: %s", url_key, sid, status)
+                if status == 401 and not relogged:
+                    _LOGGER.warning("401 on %s for student %s, attempting re-login...", url_key, sid)
+                    relogged = True
+                    await self._async_relogin(token, generation)
+                    continue
+                if status == 404:
+                    _LOGGER.warning("HTTP 404 for %s (student %s) - endpoint not available", url_key, sid)
+                    breaker.record_success()
+                    return []  # Endpoint not available; not an outage
+                txt = body.decode("utf-8", errors="replace")
+                if status == 400:
+                    _LOGGER.warning("HTTP 400 for %s (student %s): %s - skipping", url_key, sid, txt)
+                    breaker.record_success()
+                    return []
+                if status >= 400:
+                    _LOGGER.error("HTTP %s for %s (student %s): %s", status, url_key, sid, txt)
+                    error = f"HTTP {status}"
+                    if status == 401:
+                        # Still unauthorized after a fresh login; retrying won't help
+                        break
+                else:
+                    try:
+                        data = json.loads(txt)
+                        _LOGGER.debug(
+                            "%s returned %d items for student %s",
+                            url_key,
+                            len(data) if isinstance(data, list) else 1,
+                            sid,
+                        )
+                    except ValueError as e:
+                        _LOGGER.debug("Failed to parse %s as JSON for student %s: %s", url_key, sid, e)
+                        data = txt
+                    breaker.record_success()
+                    return data
+            except MashovAuthError:
+                # Credentials rejected: not an outage, the caller has to ask for new ones
+                raise
+            except MashovError as e:
+                # Re-login failed (login circuit open or Mashov down)
+                _LOGGER.warning("Re-login failed while fetching %s for student %s: %s", url_key, sid, e)
+                error = str(e)
+                break
+            except Exception as e:
+                _LOGGER.warning("Exception fetching %s for student %s: %s", url_key, sid, e)
+                error = str(e) or type(e).__name__
+                if started is not None:
+                    self.metrics.record(url_key, time.monotonic() - started, None)
 
-    def _normalize_holidays(self, raw):
-        items = []
-        try:
-            for h in raw or []:
-                items.append(
-                    {
-                        "id": h.get("id"),
-                        "name": h.get("hollyDayName") or h.get("holidayName") or h.get("name"),
-                        "start": h.get("startDate"),
-                        "end": h.get("endDate"),
-                    }
-                )
-        except Exception as e:
-            _LOGGER.debug("normalize holidays failed: %s", e)
-        return items
+            if attempt >= self.fetch_max_retries:
+                break
+            await asyncio.sleep(self._retry_delay(attempt))
+            attempt += 1
 
-    def _normalize_lessons_history(self, raw):
-        items = []
-        try:
-            for r in raw or []:
-                log = r.get("lessonLog") or {}
-                items.append(
-                    {
-                        "lesson_id": log.get("lessonID"),
-                        "group_id": log.get("groupId"),
-                        "lesson_date": log.get("lessonDate"),
-                        "lesson": log.get("lesson"),
-                        "took_place": log.get("tookPlace"),
-                        "remark": log.get("remark"),
-                        "homework": log.get("homeWork"),
-                        "lessontype": log.get("lessontype"),
-                        "reporter_guid": log.get("reporterGuid"),
-                        "group_name": r.get("groupName"),
-                        "subject_name": r.get("subjectName"),
-                    }
-                )
-        except Exception as e:
-            _LOGGER.debug("normalize lessons history failed: %s", e)
-        return items
+        breaker.record_failure(error)
+        _LOGGER.warning("%s unavailable for student %s (%s); keeping previous data", url_key, sid, error)
+        return UNAVAILABLE
 
-    def _normalize_grades(self, raw):
-        """Normalize grades data."""
-        if not raw or not isinstance(raw, list):
-            return []
-        # Grades come already normalized from the API
-        return raw
+    # Normalizers
+    def _normalize(self, key: str, raw) -> list[dict[str, Any]]:
+        """Normalize one endpoint payload by its spec; malformed rows are dropped and counted."""
+        items, dropped = normalize_rows(key, raw, self.symbols)
+        if dropped:
+            self.metrics.record_dropped(key, dropped)
+        return items
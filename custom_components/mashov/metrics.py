@@ -0,0 +1,110 @@
+"""Per-endpoint request metrics for the Mashov client."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+import math
+from typing import Any
+
+# Latency samples kept per endpoint for percentiles
+METRICS_WINDOW = 100
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class EndpointMetrics:
+    """Counters plus a rolling window of latencies for one endpoint."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.requests = 0
+        self.errors = 0  # network errors/timeouts (no HTTP status)
+        self.statuses: Counter[str] = Counter()
+        self.bytes = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, status: int | None, nbytes: int = 0) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.bytes += nbytes
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[str(status)] += 1
+
+    def summary(self) -> dict[str, Any]:
+        window = list(self.latencies)
+
+        def ms(v):
+            return round(v * 1000, 1) if v is not None else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "statuses": dict(sorted(self.statuses.items())),
+            "bytes": self.bytes,
+            "p50_ms": ms(percentile(window, 50)),
+            "p95_ms": ms(percentile(window, 95)),
+            "last_ms": ms(window[-1]) if window else None,
+        }
+
+
+class RequestMetrics:
+    """Registry of EndpointMetrics keyed by endpoint name."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._window = window
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        # Time to first byte (response headers) per connection state: "warm", "cold", "prewarm"
+        self.ttfb: dict[str, deque[float]] = {}
+        # Malformed rows dropped while normalizing, per endpoint (cumulative)
+        self.dropped_rows: dict[str, int] = {}
+
+    def record(self, endpoint: str, latency: float, status: int | None, nbytes: int = 0) -> None:
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointMetrics(self._window)
+        self.endpoints[endpoint].record(latency, status, nbytes)
+
+    def record_ttfb(self, kind: str, seconds: float) -> None:
+        self.ttfb.setdefault(kind, deque(maxlen=self._window)).append(seconds)
+
+    def record_dropped(self, endpoint: str, rows: int) -> None:
+        self.dropped_rows[endpoint] = self.dropped_rows.get(endpoint, 0) + rows
+
+    def ttfb_summary(self) -> dict[str, Any]:
+        def ms(v):
+            return round(v * 1000, 1) if v is not None else None
+
+        return {
+            kind: {
+                "count": len(samples),
+                "p50_ms": ms(percentile(list(samples), 50)),
+                "p95_ms": ms(percentile(list(samples), 95)),
+            }
+            for kind, samples in sorted(self.ttfb.items())
+        }
+
+    def totals(self) -> dict[str, Any]:
+        """Aggregate over all endpoints; percentiles pooled across their windows."""
+        window = [lat for ep in self.endpoints.values() for lat in ep.latencies]
+        p95 = percentile(window, 95)
+        return {
+            "requests": sum(ep.requests for ep in self.endpoints.values()),
+            "errors": sum(ep.errors for ep in self.endpoints.values()),
+            "bytes": sum(ep.bytes for ep in self.endpoints.values()),
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "totals": self.totals(),
+            "endpoints": {name: ep.summary() for name, ep in sorted(self.endpoints.items())},
+            "ttfb": self.ttfb_summary(),
+            "dropped_rows": dict(sorted(self.dropped_rows.items())),
+        }
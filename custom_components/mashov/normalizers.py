@@ -0,0 +1,131 @@
+"""Endpoint payloads -> normalized rows, through converters generated from field_specs.SPECS.
+
+Each data endpoint is described by a mapping of output field -> source (field_specs.SPECS).
+render_converters turns every spec into one flat function building a payload's rows in a
+single list comprehension; the output is checked in as converters.py, so nothing is compiled
+at runtime. Every endpoint shares the same container unwrapping and per-row error isolation:
+a row that isn't an object (or whose nested parent isn't one) is dropped and counted, and the
+rows after it are kept.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from .converters import CONVERTERS
+from .field_specs import SPECS
+from .symbols import INTERNED_FIELDS, SymbolTable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wrapper keys some deployments put around the row list
+CONTAINER_KEYS = ("items", "data")
+
+_HEADER = '''"""Row converters generated from field_specs.SPECS by normalizers.render_converters.
+
+Do not edit: change the spec and run `python scripts/gen_converters.py`.
+"""
+'''
+
+
+def _render_converter(name: str, spec: dict[str, Any] | None) -> list[str]:
+    """Source lines of the converter function for one spec."""
+    lines = [f"def _{name}(rows: list[Any], symbols: SymbolTable) -> list[dict[str, Any]]:"]
+    if spec is None:
+        lines += [
+            "    intern_fields = symbols.intern_fields",
+            "    return [intern_fields(row) for row in rows if isinstance(row, dict)]",
+        ]
+        return lines
+
+    # Nested parent path -> variable bound once per row, with its (variable, expression) binding
+    parents: dict[tuple[str, ...], str] = {(): "row"}
+    bindings: list[tuple[str, str]] = []
+
+    def parent(path: tuple[str, ...]) -> str:
+        if path not in parents:
+            outer = parent(path[:-1])
+            var = parents[path] = f"obj{len(parents)}"
+            bindings.append((var, f"{outer}.get({json.dumps(path[-1])}) or {{}}"))
+        return parents[path]
+
+    fields = []
+    for out, source in spec.items():
+        if callable(source):
+            expr = f"{source.__name__}(row, symbols)"
+        elif isinstance(source, tuple):
+            expr = f"{parent(source[:-1])}.get({json.dumps(source[-1])})"
+        elif isinstance(source, list):
+            expr = " or ".join(f"row.get({json.dumps(key)})" for key in source)
+        else:
+            expr = f"row.get({json.dumps(source)})"
+        if out in INTERNED_FIELDS:
+            expr = f"intern({expr})"
+        fields.append(f"            {json.dumps(out)}: {expr},")
+
+    if any(out in INTERNED_FIELDS for out in spec):
+        lines.append("    intern = symbols.intern")
+    lines += [
+        "    return [",
+        "        {",
+        *fields,
+        "        }",
+        "        for row in rows",
+        "        if isinstance(row, dict)",
+    ]
+    for var, expr in bindings:
+        lines += [f"        for {var} in [{expr}]", f"        if isinstance({var}, dict)"]
+    lines.append("    ]")
+    return lines
+
+
+def render_converters(specs: dict[str, dict[str, Any] | None] = SPECS) -> str:
+    """Source of converters.py: one converter per spec and the CONVERTERS table."""
+    sources = sorted(
+        {source.__name__ for spec in specs.values() for source in (spec or {}).values() if callable(source)}
+    )
+    lines = [
+        _HEADER,
+        "from __future__ import annotations",
+        "",
+        "from collections.abc import Callable",
+        "from typing import Any",
+        "",
+    ]
+    if sources:
+        lines.append(f"from .field_specs import {', '.join(sources)}")
+    lines += [
+        "from .symbols import SymbolTable",
+        "",
+        "Converter = Callable[[list[Any], SymbolTable], list[dict[str, Any]]]",
+    ]
+    for name, spec in specs.items():
+        lines += ["", "", *_render_converter(name, spec)]
+    lines += ["", "", "CONVERTERS: dict[str, Converter] = {"]
+    lines += [f"    {json.dumps(name)}: _{name}," for name in specs]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def unwrap_rows(raw: Any) -> list[Any]:
+    """The row list of a payload: a list as-is, or the first non-empty CONTAINER_KEYS list of an object."""
+    if isinstance(raw, list):
+        return raw
+    if isinstance(raw, dict):
+        for key in CONTAINER_KEYS:
+            rows = raw.get(key)
+            if isinstance(rows, list) and rows:
+                return rows
+    return []
+
+
+def normalize_rows(name: str, raw: Any, symbols: SymbolTable) -> tuple[list[dict[str, Any]], int]:
+    """(normalized rows, number of rows dropped) for one endpoint payload."""
+    rows = unwrap_rows(raw)
+    items = CONVERTERS[name](rows, symbols)
+    dropped = len(rows) - len(items)
+    if dropped:
+        _LOGGER.debug("normalize %s: dropped %d of %d malformed rows", name, dropped, len(rows))
+    return items, dropped
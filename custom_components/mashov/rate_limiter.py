@@ -0,0 +1,111 @@
+"""Process-wide token buckets capping request rates to Mashov across all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from .const import (
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_RATE_LIMIT_LOGINS_PER_MINUTE,
+    DEFAULT_RATE_LIMIT_REQUESTS_PER_SECOND,
+    RATE_LIMIT_LOGIN_BURST,
+)
+
+# Budgets: "login" (expensive, may trigger notification emails) and "data" (data and catalog GETs)
+BUDGET_LOGIN = "login"
+BUDGET_DATA = "data"
+
+
+class TokenBucket:
+    """Token bucket that lets the balance go negative to queue callers FIFO without a lock.
+
+    Each acquire reserves a token immediately and sleeps until the reservation is covered,
+    so concurrent callers are spaced at 1/rate seconds once the burst is used up.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Queueing metrics
+        self.acquired = 0
+        self.delayed = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def configure(self, rate: float, capacity: float) -> None:
+        self._refill()
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        self._refill()
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the queueing delay in seconds."""
+        delay = self.reserve()
+        self.acquired += 1
+        if delay > 0:
+            self.delayed += 1
+            self.total_wait += delay
+            self.max_wait = max(self.max_wait, delay)
+            self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.waiting -= 1
+        return delay
+
+    def as_dict(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "rate_per_second": round(self.rate, 4),
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "waiting": self.waiting,
+            "avg_wait": round(self.total_wait / self.delayed, 3) if self.delayed else 0.0,
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+_BUCKETS: dict[str, TokenBucket] = {
+    BUDGET_LOGIN: TokenBucket(DEFAULT_RATE_LIMIT_LOGINS_PER_MINUTE / 60, RATE_LIMIT_LOGIN_BURST),
+    BUDGET_DATA: TokenBucket(DEFAULT_RATE_LIMIT_REQUESTS_PER_SECOND, DEFAULT_RATE_LIMIT_BURST),
+}
+
+
+def configure_rate_limits(options: dict[str, Any] | None) -> None:
+    """Apply rate limits from YAML options; missing keys fall back to defaults."""
+    options = options or {}
+    logins_per_minute = options.get(CONF_RATE_LIMIT_LOGINS_PER_MINUTE) or DEFAULT_RATE_LIMIT_LOGINS_PER_MINUTE
+    requests_per_second = options.get(CONF_RATE_LIMIT_REQUESTS_PER_SECOND) or DEFAULT_RATE_LIMIT_REQUESTS_PER_SECOND
+    burst = options.get(CONF_RATE_LIMIT_BURST) or DEFAULT_RATE_LIMIT_BURST
+    _BUCKETS[BUDGET_LOGIN].configure(logins_per_minute / 60, RATE_LIMIT_LOGIN_BURST)
+    _BUCKETS[BUDGET_DATA].configure(requests_per_second, burst)
+
+
+async def async_acquire(budget: str) -> float:
+    """Wait for a token from the shared bucket of the given budget."""
+    return await _BUCKETS[budget].acquire()
+
+
+def rate_limit_diagnostics() -> dict[str, Any]:
+    return {budget: bucket.as_dict() for budget, bucket in _BUCKETS.items()}
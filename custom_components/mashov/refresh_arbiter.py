@@ -0,0 +1,102 @@
+"""Per-entry refresh arbiter: one in-flight fetch shared by every trigger, with a minimum spacing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class RefreshArbiter:
+    """Coalesce overlapping refreshes of one entry.
+
+    A scheduled tick, an interval poll, refresh_now and a dashboard "refresh all" can land within
+    seconds of each other. Requests arriving while a fetch runs await that fetch and get its
+    result (or its exception); requests within min_spacing seconds of the last successful fetch
+    get the latest data without fetching. Narrow (partial) fetches run one at a time and never
+    overlap a full fetch: one requested during a full fetch is answered by it.
+    """
+
+    def __init__(self, min_spacing: float = 0.0):
+        self.min_spacing = float(min_spacing)
+        self._inflight: asyncio.Task | None = None
+        self._partial: asyncio.Task | None = None
+        self._last_success: float | None = None  # monotonic
+        self.requests = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.spaced = 0
+        self.partial = 0
+
+    @property
+    def in_flight(self) -> asyncio.Task | None:
+        return self._inflight
+
+    def _recent(self) -> bool:
+        return self._last_success is not None and time.monotonic() - self._last_success < self.min_spacing
+
+    async def async_run(self, fetch: Callable[[], Awaitable[_T]], latest: _T | None = None) -> _T:
+        """Run fetch, join the running one, or return latest when the last fetch is too recent."""
+        self.requests += 1
+        if self._inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight)
+        if latest is not None and self._recent():
+            self.spaced += 1
+            return latest
+
+        self.fetches += 1
+        self._inflight = asyncio.get_running_loop().create_task(self._async_fetch(fetch))
+        # Shielded so a cancelled caller doesn't cancel the fetch other callers are waiting on
+        return await asyncio.shield(self._inflight)
+
+    async def _async_fetch(self, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        try:
+            if self._partial is not None:
+                # Start after the running partial fetch so its merge can't land on top of this result
+                await asyncio.wait([self._partial])
+            result = await fetch()
+        finally:
+            self._inflight = None
+        self._last_success = time.monotonic()
+        return result
+
+    async def async_run_partial(self, fetch: Callable[[], Awaitable[_T]]) -> _T | None:
+        """Run a partial fetch after any running one; None when a full fetch in flight answered it."""
+        while True:
+            if self._inflight is not None:
+                await asyncio.shield(self._inflight)
+                return None
+            if self._partial is None:
+                break
+            await asyncio.wait([self._partial])
+        self._partial = asyncio.get_running_loop().create_task(self._async_fetch_partial(fetch))
+        return await asyncio.shield(self._partial)
+
+    def record_partial(self, coalesced: bool) -> None:
+        """Count a partial refresh request: fetched on its own, or coalesced into a running full fetch."""
+        self.requests += 1
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.partial += 1
+
+    async def _async_fetch_partial(self, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        try:
+            return await fetch()
+        finally:
+            self._partial = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "min_spacing_seconds": self.min_spacing,
+            "requests": self.requests,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "spaced": self.spaced,
+            "partial": self.partial,
+            "in_flight": self._inflight is not None,
+        }
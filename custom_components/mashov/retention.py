@@ -0,0 +1,111 @@
+"""Rolling retention for history data keys: a hot window in memory, older records in a cold archive.
+
+Mashov returns the whole school year of lessons history, behavior and grades on every fetch.
+With a retention policy only records from the last N days stay in coordinator data (and so in
+the startup cache, sensor attributes and diagnostics); older ones are written to a per-entry
+archive store and read back only for queries that reach before the hot window.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+import hashlib
+import json
+from typing import Any
+
+# History data key -> item date field
+RETENTION_DATE_FIELDS = {"lessons_history": "lesson_date", "behavior": "lesson_date", "grades": "eventDate"}
+# History data key -> fields (first non-empty wins) sensor summaries group records by
+RETENTION_GROUP_FIELDS = {
+    "lessons_history": ("subject_name", "group_name"),
+    "behavior": ("achva_name",),
+    "grades": ("subjectName",),
+}
+
+
+def retention_policy(value: Any) -> dict[str, int]:
+    """{data_key: hot days} from the option value.
+
+    One number applies to every history key; a mapping sets days per key. Keys at 0 (or
+    missing from a mapping) keep everything hot.
+    """
+    try:
+        if isinstance(value, dict):
+            days = {k: int(v) for k, v in value.items() if k in RETENTION_DATE_FIELDS}
+        else:
+            days = dict.fromkeys(RETENTION_DATE_FIELDS, int(value or 0))
+    except (TypeError, ValueError):
+        return {}
+    return {k: v for k, v in days.items() if v > 0}
+
+
+def hot_cutoffs(policy: dict[str, int], today: date) -> dict[str, date]:
+    """{data_key: first hot day}."""
+    return {key: today - timedelta(days=days) for key, days in policy.items()}
+
+
+def item_date(item: Any, field: str) -> date | None:
+    value = item.get(field) if isinstance(item, dict) else None
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def split_hot_cold(items: Iterable[Any], field: str, cutoff: date) -> tuple[list[Any], list[Any]]:
+    """(items on or after cutoff, items before it), order kept; undated items stay hot."""
+    hot, cold = [], []
+    for item in items:
+        day = item_date(item, field)
+        (cold if day is not None and day < cutoff else hot).append(item)
+    return hot, cold
+
+
+def in_range(items: Iterable[Any], field: str, start: date | None, end: date | None) -> list[Any]:
+    """Items dated start <= day < end (open bounds when None); undated items only without bounds."""
+    if start is None and end is None:
+        return list(items)
+    out = []
+    for item in items:
+        day = item_date(item, field)
+        if day is not None and (start is None or day >= start) and (end is None or day < end):
+            out.append(item)
+    return out
+
+
+def segment_digest(items: list[Any]) -> str:
+    """Content digest of an archive segment; the archive is rewritten only when one changes."""
+    payload = json.dumps(items, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def segment_totals(data_key: str, items: list[Any]) -> dict[str, Any]:
+    """Running totals of an archive segment, so summaries over the whole history skip the archive.
+
+    groups: distinct RETENTION_GROUP_FIELDS names (None for records without one); dates: number
+    of distinct days; grades also keep the sum and count of numeric grades.
+    """
+    fields = RETENTION_GROUP_FIELDS[data_key]
+    date_field = RETENTION_DATE_FIELDS[data_key]
+    groups: dict[Any, None] = {}
+    days = set()
+    grade_sum = 0
+    grade_count = 0
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        groups[next((item[f] for f in fields if item.get(f)), None)] = None
+        day = item_date(item, date_field)
+        if day is not None:
+            days.add(day)
+        grade = item.get("grade")
+        if isinstance(grade, (int, float)):
+            grade_sum += grade
+            grade_count += 1
+    totals: dict[str, Any] = {"groups": list(groups), "dates": len(days)}
+    if data_key == "grades":
+        totals.update(grade_sum=grade_sum, grade_count=grade_count)
+    return totals
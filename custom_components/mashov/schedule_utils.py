@@ -0,0 +1,138 @@
+"""Adaptive refresh planning from the timetable and holidays.
+
+Polls often during and just after school hours on school days, once on the evening before
+a school day, and not at all at night, on weekends or on holidays.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import hashlib
+from typing import Any
+
+from .timetable_utils import holiday_dates, mashov_day_for_date
+
+SCHOOL_DAY_START = time(7, 30)
+LESSON_MINUTES = 50  # lesson + break; Mashov timetables carry lesson numbers, not clock times
+SCHOOL_HOURS_INTERVAL = 60  # minutes between refreshes while lessons run
+AFTER_SCHOOL_HOURS = 3  # teachers post homework and grades after the last lesson
+AFTER_SCHOOL_INTERVAL = 30
+EVENING_END = time(21, 0)
+EVENING_INTERVAL = 120
+OFF_DAY_TIME = time(19, 0)  # single refresh on a day off when the next day is a school day
+STAGGER_SECONDS = 30  # minimum spacing between entries of one Home Assistant instance
+# Used until a timetable has been fetched: Sunday-Thursday 7 lessons, Friday 5 (Mashov day numbers)
+DEFAULT_LESSONS_PER_DAY = {1: 7, 2: 7, 3: 7, 4: 7, 5: 7, 6: 5}
+
+
+def lessons_per_day(timetables: list[list[dict[str, Any]]]) -> dict[int, int]:
+    """Return {Mashov weekday: last lesson number} across all students' timetables."""
+    out: dict[int, int] = {}
+    for timetable in timetables:
+        for it in timetable or []:
+            tt = (it or {}).get("timeTable") or {}
+            try:
+                day, lesson = int(tt.get("day")), int(tt.get("lesson"))
+            except (TypeError, ValueError):
+                continue
+            out[day] = max(out.get(day, 0), lesson)
+    return out or dict(DEFAULT_LESSONS_PER_DAY)
+
+
+def _day_fire_times(d: date, lessons: int, tz) -> list[tuple[datetime, str]]:
+    start = datetime.combine(d, SCHOOL_DAY_START, tzinfo=tz)
+    end = start + timedelta(minutes=lessons * LESSON_MINUTES)
+    after = end + timedelta(hours=AFTER_SCHOOL_HOURS)
+    evening = datetime.combine(d, EVENING_END, tzinfo=tz)
+
+    times = []
+    t = start + timedelta(minutes=SCHOOL_HOURS_INTERVAL)
+    while t < end:
+        times.append((t, "school_hours"))
+        t += timedelta(minutes=SCHOOL_HOURS_INTERVAL)
+    t = end
+    while t <= after:
+        times.append((t, "after_school"))
+        t += timedelta(minutes=AFTER_SCHOOL_INTERVAL)
+    t = after + timedelta(minutes=EVENING_INTERVAL)
+    while t <= evening:
+        times.append((t, "evening"))
+        t += timedelta(minutes=EVENING_INTERVAL)
+    return times
+
+
+def adaptive_plan(
+    timetables: list[list[dict[str, Any]]],
+    holidays: list[dict[str, Any]],
+    now: datetime,
+    days: int = 2,
+) -> list[dict[str, Any]]:
+    """Return upcoming refreshes after now over the next days: [{"at": datetime, "reason": str}].
+
+    A school day is a weekday with lessons in the timetable that isn't a holiday.
+    """
+    per_day = lessons_per_day(timetables)
+    today = now.date()
+    # One extra day so an off-day's evening refresh can see whether tomorrow is a school day
+    off = holiday_dates(holidays, today, today + timedelta(days=days + 1))
+
+    def school_lessons(d: date) -> int:
+        return 0 if d in off else per_day.get(mashov_day_for_date(d), 0)
+
+    plan: list[dict[str, Any]] = []
+    for offset in range(days):
+        d = today + timedelta(days=offset)
+        lessons = school_lessons(d)
+        if lessons:
+            plan.extend({"at": t, "reason": reason} for t, reason in _day_fire_times(d, lessons, now.tzinfo))
+        elif school_lessons(d + timedelta(days=1)):
+            plan.append({"at": datetime.combine(d, OFF_DAY_TIME, tzinfo=now.tzinfo), "reason": "before_school_day"})
+    return [p for p in plan if p["at"] > now]
+
+
+def next_adaptive_fire(
+    timetables: list[list[dict[str, Any]]], holidays: list[dict[str, Any]], now: datetime, max_days: int = 30
+) -> datetime | None:
+    """Return the next adaptive refresh time, looking ahead past long holidays up to max_days."""
+    days = 2
+    while True:
+        plan = adaptive_plan(timetables, holidays, now, days)
+        if plan:
+            return plan[0]["at"]
+        if days >= max_days:
+            return None
+        days = min(days * 2, max_days)
+
+
+def jitter_seconds(entry_id: str, window_seconds: int) -> int:
+    """Deterministic offset in [0, window) from a hash of the entry id, stable across restarts.
+
+    Spreads installs that keep the default schedule time across the window instead of all
+    hitting Mashov in the same second.
+    """
+    if window_seconds <= 0:
+        return 0
+    digest = hashlib.sha256(entry_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % window_seconds
+
+
+def stagger_offsets(windows: dict[str, int], min_gap: int = STAGGER_SECONDS) -> dict[str, int]:
+    """Jittered offsets for every entry in this instance, at least min_gap seconds apart.
+
+    windows: {entry_id: jitter window in seconds}. Entries keep their hash order; an entry
+    that lands too close to the previous one is pushed back.
+    """
+    jitter = {eid: jitter_seconds(eid, w) for eid, w in windows.items()}
+    out: dict[str, int] = {}
+    prev: int | None = None
+    for eid in sorted(jitter, key=lambda e: (jitter[e], e)):
+        offset = jitter[eid] if prev is None else max(jitter[eid], prev + min_gap)
+        out[eid] = offset
+        prev = offset
+    return out
+
+
+def shift_time(hh: int, mm: int, offset_seconds: int) -> tuple[int, int, int]:
+    """Return (hour, minute, second) of hh:mm plus an offset, wrapping at midnight."""
+    total = (hh * 3600 + mm * 60 + offset_seconds) % 86400
+    return total // 3600, total % 3600 // 60, total % 60
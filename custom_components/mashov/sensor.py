@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,19 +29,27 @@ from .const import (
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
     DOMAIN,
+    SENSOR_KEY_API_BYTES,
+    SENSOR_KEY_API_LATENCY,
+    SENSOR_KEY_API_REQUESTS,
     SENSOR_KEY_BEHAVIOR,
+    SENSOR_KEY_GRADE_STATS,
     SENSOR_KEY_GRADES,
     SENSOR_KEY_HOMEWORK,
     SENSOR_KEY_LESSONS_HISTORY,
     SENSOR_KEY_TIMETABLE,
+    SENSOR_KEY_TOMORROW_BAG,
     SENSOR_KEY_WEEKLY_PLAN,
 )
+from .history_columns import LessonsHistoryColumns
 from .holidays_utils import (
     HOLIDAY_DEFAULT_NAME,
     HOLIDAY_ICON,
     create_holidays_device_info,
     parse_iso_date_to_formatted,
 )
+from .timetable_utils import holiday_dates
+from .tracing import span
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -51,31 +62,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     _LOGGER.debug("Found %d students for sensor setup", len(students))
 
     entities = []
+    known: set[str] = set()
     for stu in students:
-        slug = stu["slug"]
-        sid = stu["id"]
-        name = stu["name"]
-        _LOGGER.debug("Creating sensors for student: %s (id=%s, slug=%s)", name, sid, slug)
-
-        entities.extend(
-            [
-                MashovListSensor(coord, sid, slug, name, SENSOR_KEY_HOMEWORK, "Homework", "homework"),
-                MashovListSensor(coord, sid, slug, name, SENSOR_KEY_BEHAVIOR, "Behavior", "behavior"),
-                MashovListSensor(coord, sid, slug, name, SENSOR_KEY_WEEKLY_PLAN, "Weekly Plan", "weekly_plan"),
-                MashovListSensor(coord, sid, slug, name, SENSOR_KEY_TIMETABLE, "Timetable", "timetable"),
-                MashovListSensor(
-                    coord, sid, slug, name, SENSOR_KEY_LESSONS_HISTORY, "Lessons History", "lessons_history"
-                ),
-                MashovListSensor(coord, sid, slug, name, SENSOR_KEY_GRADES, "Grades", "grades"),
-            ]
-        )
+        known.add(stu["slug"])
+        entities.extend(_student_sensors(coord, stu))
 
     # Global holidays sensor (per entry; ensure unique_id per entry)
     entities.append(MashovHolidaysSensor(coord, entry.entry_id))
 
+    # API metrics diagnostic sensors (disabled by default)
+    client = data["client"]
+    entities.extend(MashovApiMetricSensor(coord, client, entry.entry_id, key) for key in API_METRIC_SENSORS)
+
     _LOGGER.info("Adding %d Mashov sensor entities", len(entities))
     async_add_entities(entities)
 
+    @callback
+    def _add_new_students() -> None:
+        # Students first seen after setup (deferred startup without cache, or a new child on the account)
+        new = [s for s in (coord.data or {}).get("students", []) if s["slug"] not in known]
+        if not new:
+            return
+        added = []
+        for stu in new:
+            known.add(stu["slug"])
+            added.extend(_student_sensors(coord, stu))
+        _LOGGER.info("Adding %d Mashov sensor entities for %d new student(s)", len(added), len(new))
+        async_add_entities(added)
+
+    entry.async_on_unload(coord.async_add_listener(_add_new_students))
+
+
+def _student_sensors(coord, stu: dict[str, Any]) -> list[SensorEntity]:
+    slug = stu["slug"]
+    sid = stu["id"]
+    name = stu["name"]
+    _LOGGER.debug("Creating sensors for student: %s (id=%s, slug=%s)", name, sid, slug)
+    return [
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_HOMEWORK, "Homework", "homework"),
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_BEHAVIOR, "Behavior", "behavior"),
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_WEEKLY_PLAN, "Weekly Plan", "weekly_plan"),
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_TIMETABLE, "Timetable", "timetable"),
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_LESSONS_HISTORY, "Lessons History", "lessons_history"),
+        MashovListSensor(coord, sid, slug, name, SENSOR_KEY_GRADES, "Grades", "grades"),
+        MashovTomorrowBagSensor(coord, sid, slug, name),
+        MashovGradeStatsSensor(coord, sid, slug, name),
+    ]
+
+
+def _groups_count(groups: dict[Any, Any], archived: dict[str, Any], unknown: str) -> int:
+    """Distinct groups of the records in memory plus the archived ones (None = the unknown label)."""
+    return len(set(groups).union(unknown if g is None else g for g in archived.get("groups", ())))
+
 
 class MashovListSensor(CoordinatorEntity, SensorEntity):
     _attr_icon = "mdi:school"
@@ -83,7 +121,7 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self, coordinator, student_id: int, student_slug: str, student_name: str, key: str, name: str, data_key: str
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, (student_slug, frozenset({data_key})))
         self._student_id = student_id
         self._student_slug = student_slug
         self._student_name = student_name
@@ -97,10 +135,15 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
     def native_value(self):
         group = (self.coordinator.data or {}).get("by_slug", {}).get(self._student_slug, {})
         items = group.get(self._data_key) or []
-        return len(items)
+        # Records moved to the archive by the retention window still count
+        return len(items) + self.coordinator.archived_count(self._student_slug, self._data_key)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
+        with span(f"attributes.{self._data_key}"):
+            return self._build_attributes()
+
+    def _build_attributes(self) -> dict[str, Any]:
         data = self.coordinator.data or {}
         student_meta = next((s for s in data.get("students", []) if s["slug"] == self._student_slug), {})
         group = data.get("by_slug", {}).get(self._student_slug, {})
@@ -118,7 +161,8 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
         # Full data is always available via coordinator.data for automations
         items_for_attributes = self._limit_items_for_storage(items, max_items)
 
-        total_count = len(items)
+        archived_count = self.coordinator.archived_count(self._student_slug, self._data_key)
+        total_count = len(items) + archived_count
         stored_count = len(items_for_attributes)
 
         return {
@@ -129,6 +173,7 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             "last_update": datetime.now().isoformat(timespec="seconds"),
             "total_items": total_count,  # Total number of items available
             "stored_items": stored_count,  # Number of items in attributes
+            **({"archived_items": archived_count} if archived_count else {}),  # Older than the retention window
             "items": items_for_attributes,  # Limited items (most recent)
             "formatted_summary": formatted_data["summary"],
             "formatted_by_date": formatted_data["by_date"],
@@ -144,7 +189,9 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             "schedule_day": schedule_info.get("day"),
             "schedule_interval_minutes": schedule_info.get("interval_minutes"),
             "schedule_friendly": schedule_info.get("friendly"),
+            "schedule_effective_time": schedule_info.get("effective_time"),
             "next_scheduled_refresh": schedule_info.get("next"),
+            **({"schedule_plan": schedule_info["plan"]} if schedule_info.get("plan") is not None else {}),
         }
 
     @property
@@ -283,8 +330,12 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             return ""
 
         try:
-            # Sort by date descending (most recent first)
-            sorted_items = sorted(items, key=get_sort_key, reverse=True)
+            if isinstance(items, LessonsHistoryColumns):
+                # Newest rows straight from the date column; only these are built as dicts
+                sorted_items = items.latest(max_items)
+            else:
+                # Sort by date descending (most recent first)
+                sorted_items = sorted(items, key=get_sort_key, reverse=True)
         except Exception as e:
             _LOGGER.debug("Failed to sort items for limiting: %s", e)
             sorted_items = items
@@ -346,22 +397,27 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             return [self._clean_item_for_storage(item) for item in sorted_items[:safe_count]]
 
     def _format_data_for_display(self, items: list) -> dict[str, Any]:
-        """Format data for better readability and text-to-speech"""
-        if not items:
+        """Format data for better readability and text-to-speech.
+
+        Summaries of history keys count archived records too (from the archive's running totals);
+        by_date/by_subject list the records in memory only.
+        """
+        archived = self.coordinator.archived_totals(self._student_slug, self._data_key)
+        if not items and not archived:
             return {"summary": "אין נתונים זמינים", "by_date": {}, "by_subject": {}}
 
         if self._data_key == "homework":
             return self._format_homework_data(items)
         if self._data_key == "behavior":
-            return self._format_behavior_data(items)
+            return self._format_behavior_data(items, archived)
         if self._data_key == "weekly_plan":
             return self._format_weekly_plan_data(items)
         if self._data_key == "timetable":
             return self._format_timetable_data(items)
         if self._data_key == "lessons_history":
-            return self._format_lessons_history(items)
+            return self._format_lessons_history(items, archived)
         if self._data_key == "grades":
-            return self._format_grades_data(items)
+            return self._format_grades_data(items, archived)
         return {"summary": f"יש {len(items)} פריטים", "by_date": {}, "by_subject": {}}
 
     def _compute_schedule_info(self) -> dict[str, Any]:
@@ -381,7 +437,7 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
                 merged.update({k: v for k, v in yaml_opts.items() if v is not None})
             # Basic sanitization for attributes display
             schedule_type = merged.get(CONF_SCHEDULE_TYPE, DEFAULT_SCHEDULE_TYPE)
-            if schedule_type not in ("daily", "weekly", "interval"):
+            if schedule_type not in ("daily", "weekly", "interval", "adaptive"):
                 schedule_type = DEFAULT_SCHEDULE_TYPE
             schedule_time = str(merged.get(CONF_SCHEDULE_TIME, DEFAULT_SCHEDULE_TIME))
             try:
@@ -415,16 +471,20 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
 
             friendly = None
             next_time_iso = None
+            schedule_plan = None
+            effective_time = None
             now = datetime.now()
+            offset = timedelta(seconds=getattr(self.coordinator, "schedule_offset_seconds", 0) or 0)
 
             if schedule_type == "daily":
                 try:
                     hh, mm = (int(x) for x in str(schedule_time).split(":"))
                 except Exception:
                     hh, mm = (int(x) for x in DEFAULT_SCHEDULE_TIME.split(":"))
-                next_dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+                next_dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0) + offset
                 if next_dt <= now:
                     next_dt = next_dt + timedelta(days=1)
+                effective_time = next_dt.strftime("%H:%M:%S")
                 friendly = f"יומי בשעה {hh:02d}:{mm:02d}"
                 next_time_iso = next_dt.isoformat(timespec="seconds")
             elif schedule_type == "weekly":
@@ -438,15 +498,22 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
                 for target_wd in schedule_days:
                     target_wd = int(target_wd)
                     days_ahead = (target_wd - now.weekday()) % 7
-                    dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0) + timedelta(days=days_ahead)
+                    dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0) + timedelta(days=days_ahead) + offset
                     if dt <= now:
                         dt = dt + timedelta(days=7)
                     candidates.append(dt)
                 next_dt = min(candidates) if candidates else now
+                effective_time = next_dt.strftime("%H:%M:%S")
                 day_names = ["יום שני", "יום שלישי", "יום רביעי", "יום חמישי", "יום שישי", "יום שבת", "יום ראשון"]
                 friendly_days = ", ".join(day_names[int(d)] for d in schedule_days)
                 friendly = f"שבועי – {friendly_days} {hh:02d}:{mm:02d}"
                 next_time_iso = next_dt.isoformat(timespec="seconds")
+            elif schedule_type == "adaptive":
+                plan = self.coordinator.adaptive_plan()
+                next_dt = plan[0]["at"] if plan else self.coordinator.next_adaptive_fire()
+                friendly = "אדפטיבי – לפי שעות הלימודים, ללא לילות, סופי שבוע וחגים"
+                next_time_iso = next_dt.isoformat(timespec="seconds") if next_dt else None
+                schedule_plan = [{"at": p["at"].isoformat(timespec="minutes"), "reason": p["reason"]} for p in plan]
             elif schedule_type == "interval":
                 interval_min = int(schedule_interval)
                 next_dt = now + timedelta(minutes=interval_min)
@@ -462,6 +529,8 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
                 "interval_minutes": schedule_interval,
                 "friendly": friendly,
                 "next": next_time_iso,
+                "plan": schedule_plan,
+                "effective_time": effective_time,
             }
         except Exception as e:
             _LOGGER.debug("Failed computing schedule info: %s", e)
@@ -524,7 +593,7 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
 
         return {"summary": summary, "by_date": by_date, "by_subject": by_subject}
 
-    def _format_behavior_data(self, items: list) -> dict[str, Any]:
+    def _format_behavior_data(self, items: list, archived: dict[str, Any] | None = None) -> dict[str, Any]:
         """Format behavior data for display"""
         from datetime import datetime
 
@@ -565,9 +634,10 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             by_type[behavior_type].append(entry)
 
         # Create summary
-        total_events = len(items)
-        types_count = len(by_type)
-        dates_count = len(by_date)
+        archived = archived or {}
+        total_events = len(items) + archived.get("count", 0)
+        types_count = _groups_count(by_type, archived, "סוג לא ידוע")
+        dates_count = len(by_date) + archived.get("dates", 0)
 
         summary = f"יש {total_events} אירועי התנהגות ב-{types_count} סוגים על פני {dates_count} תאריכים"
 
@@ -727,7 +797,7 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
         return self._format_weekly_plan_data(items)
         # Keep summary as-is or optionally tweak text; leaving as-is for consistency
 
-    def _format_lessons_history(self, items: list) -> dict[str, Any]:
+    def _format_lessons_history(self, items: list, archived: dict[str, Any] | None = None) -> dict[str, Any]:
         from datetime import datetime
 
         by_date = {}
@@ -756,14 +826,14 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             by_date.setdefault(date_key, []).append(text)
             by_subject.setdefault(subj, []).append(text)
 
-        summary = f"יש {len(items)} שיעורים היסטוריים"
+        summary = f"יש {len(items) + (archived or {}).get('count', 0)} שיעורים היסטוריים"
         return {
             "summary": summary,
             "by_date": by_date,
             "by_subject": by_subject,
         }
 
-    def _format_grades_data(self, items: list) -> dict[str, Any]:
+    def _format_grades_data(self, items: list, archived: dict[str, Any] | None = None) -> dict[str, Any]:
         """Format grades data for display"""
         from datetime import datetime
 
@@ -814,15 +884,17 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
             by_subject[subject].append(entry)
 
         # Create summary
-        total_grades = len(items)
-        subjects_count = len(by_subject)
-        dates_count = len(by_date)
+        archived = archived or {}
+        total_grades = len(items) + archived.get("count", 0)
+        subjects_count = _groups_count(by_subject, archived, "מקצוע לא ידוע")
+        dates_count = len(by_date) + archived.get("dates", 0)
 
-        # Calculate average if there are numeric grades
+        # Calculate average if there are numeric grades, archived ones included
         numeric_grades = [item.get("grade") for item in items if isinstance(item.get("grade"), (int, float))]
+        grade_count = len(numeric_grades) + archived.get("grade_count", 0)
         avg_text = ""
-        if numeric_grades:
-            avg = sum(numeric_grades) / len(numeric_grades)
+        if grade_count:
+            avg = (sum(numeric_grades) + archived.get("grade_sum", 0)) / grade_count
             avg_text = f", ממוצע: {avg:.1f}"
 
         summary = f"יש {total_grades} ציונים ב-{subjects_count} מקצועות על פני {dates_count} תאריכים{avg_text}"
@@ -834,15 +906,178 @@ class MashovListSensor(CoordinatorEntity, SensorEntity):
         }
 
 
+class MashovTomorrowBagSensor(CoordinatorEntity, SensorEntity):
+    """Next school day's subjects, teachers and plan, computed from the materialized timetable."""
+
+    _attr_icon = "mdi:bag-personal"
+    _attr_device_class = SensorDeviceClass.DATE
+
+    def __init__(self, coordinator, student_id: str, student_slug: str, student_name: str):
+        super().__init__(coordinator, (student_slug, frozenset({"timetable", "weekly_plan", "holidays"})))
+        self._student_id = student_id
+        self._student_slug = student_slug
+        self._student_name = student_name
+        self._attr_name = f"Mashov {student_name} Tomorrow Bag"
+        self._attr_unique_id = f"mashov_{student_id}_{SENSOR_KEY_TOMORROW_BAG}"
+        # ((data generation, today), computed bag)
+        self._bag_key: tuple | None = None
+        self._bag: dict[str, Any] = {}
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        @callback
+        def _midnight(now=None):
+            # "Tomorrow" moves at midnight even when no refresh happens
+            self.async_write_ha_state()
+
+        self.async_on_remove(async_track_time_change(self.hass, _midnight, hour=0, minute=0, second=5))
+
+    def _get_bag(self) -> dict[str, Any]:
+        today = dt_util.now().date()
+        key = (self.coordinator.data_generation, today)
+        if self._bag_key != key:
+            with span("attributes.tomorrow_bag"):
+                self._bag = self._compute_bag(today)
+            self._bag_key = key
+        return self._bag
+
+    def _compute_bag(self, today: date) -> dict[str, Any]:
+        tomorrow = today + timedelta(days=1)
+        lessons = self.coordinator.get_lessons(self._student_slug, tomorrow)
+        holidays = holiday_dates(
+            (self.coordinator.data or {}).get("holidays") or [], tomorrow, tomorrow + timedelta(days=1)
+        )
+
+        next_date = lessons[0]["date"] if lessons else None
+        day_lessons = [
+            {
+                "lesson": le.get("lesson"),
+                "subject": le.get("subject"),
+                "teacher": le.get("teacher"),
+                "plan": le.get("plan"),
+                "group_id": le.get("group_id"),
+            }
+            for le in lessons
+            if le["date"] == next_date
+        ]
+        subjects = list(dict.fromkeys(le["subject"] for le in day_lessons if le.get("subject")))
+        teachers = list(dict.fromkeys(le["teacher"] for le in day_lessons if le.get("teacher")))
+
+        if day_lessons:
+            parts = []
+            seen = set()
+            for le in day_lessons:
+                if le["subject"] in seen:
+                    continue
+                seen.add(le["subject"])
+                text = f"שיעור {le['lesson']}: {le['subject']}"
+                if le.get("plan"):
+                    text += f". תוכנית: {le['plan']}"
+                parts.append(text)
+            summary = ", ".join(parts)
+        else:
+            summary = "אין נתוני מערכת שעות"
+
+        return {
+            "date": next_date,
+            "is_tomorrow": next_date == tomorrow.isoformat(),
+            "tomorrow_holiday": holidays.get(tomorrow),
+            "subjects": subjects,
+            "teachers": teachers,
+            "lessons": day_lessons,
+            "formatted_summary": summary,
+        }
+
+    @property
+    def native_value(self):
+        next_date = self._get_bag().get("date")
+        return date.fromisoformat(next_date) if next_date else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "student_name": self._student_name,
+            "student_id": self._student_id,
+            **self._get_bag(),
+        }
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"{self._student_id}")},
+            "name": f"Mashov – {self._student_name}",
+            "manufacturer": DEVICE_MANUFACTURER,
+            "model": DEVICE_MODEL,
+        }
+
+
+class MashovGradeStatsSensor(CoordinatorEntity, SensorEntity):
+    """Weighted grade average per student from incrementally maintained aggregates."""
+
+    _attr_icon = "mdi:chart-line"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator, student_id: str, student_slug: str, student_name: str):
+        super().__init__(coordinator, (student_slug, frozenset({"grades"})))
+        self._student_id = student_id
+        self._student_slug = student_slug
+        self._student_name = student_name
+        self._attr_name = f"Mashov {student_name} Grade Average"
+        self._attr_unique_id = f"mashov_{student_id}_{SENSOR_KEY_GRADE_STATS}"
+        # (data generation, stats) so state and attributes share one lookup per update
+        self._stats_key: int | None = None
+        self._stats: dict[str, Any] = {}
+
+    def _get_stats(self) -> dict[str, Any]:
+        key = self.coordinator.data_generation
+        if self._stats_key != key:
+            self._stats = self.coordinator.get_grade_stats(self._student_slug) or {}
+            self._stats_key = key
+        return self._stats
+
+    @property
+    def native_value(self):
+        return self._get_stats().get("weighted_mean")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._get_stats()
+        return {
+            "student_name": self._student_name,
+            "student_id": self._student_id,
+            "count": stats.get("count", 0),
+            "mean": stats.get("mean"),
+            "trend": stats.get("trend"),
+            "last": stats.get("last"),
+            "subjects": stats.get("subjects", {}),
+        }
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"{self._student_id}")},
+            "name": f"Mashov – {self._student_name}",
+            "manufacturer": DEVICE_MANUFACTURER,
+            "model": DEVICE_MODEL,
+        }
+
+
 class MashovHolidaysSensor(CoordinatorEntity, SensorEntity):
     _attr_icon = HOLIDAY_ICON
 
     def __init__(self, coordinator, entry_id: str):
-        super().__init__(coordinator)
+        super().__init__(coordinator, (None, frozenset({"holidays"})))
         self._entry_id = entry_id
         self._attr_name = "Mashov Holidays"
         self._attr_unique_id = f"mashov_{entry_id}_holidays"
 
+    @property
+    def available(self) -> bool:
+        # Unavailable rather than 0 until the first refresh after a boot without cache
+        return super().available and self.coordinator.data is not None
+
     @property
     def native_value(self):
         # number of holidays in the dataset
@@ -880,3 +1115,78 @@ class MashovHolidaysSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         return create_holidays_device_info(DOMAIN, self._entry_id, DEVICE_MANUFACTURER, DEVICE_MODEL)
+
+
+# key -> (name, totals field, unit, device class, state class, icon, per-endpoint attribute fields)
+API_METRIC_SENSORS = {
+    SENSOR_KEY_API_LATENCY: (
+        "API Latency p95",
+        "p95_ms",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-outline",
+        ("p50_ms", "p95_ms", "last_ms"),
+    ),
+    SENSOR_KEY_API_REQUESTS: (
+        "API Requests",
+        "requests",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:swap-vertical",
+        ("requests", "errors", "statuses"),
+    ),
+    SENSOR_KEY_API_BYTES: (
+        "API Bytes",
+        "bytes",
+        UnitOfInformation.BYTES,
+        SensorDeviceClass.DATA_SIZE,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:download-network",
+        ("bytes",),
+    ),
+}
+
+
+class MashovApiMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic view of the client's per-endpoint request metrics; refreshed with the coordinator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, client, entry_id: str, key: str):
+        super().__init__(coordinator)
+        self._client = client
+        self._entry_id = entry_id
+        name, field, unit, device_class, state_class, icon, attr_fields = API_METRIC_SENSORS[key]
+        self._field = field
+        self._attr_fields = attr_fields
+        self._attr_name = f"Mashov {name}"
+        self._attr_unique_id = f"mashov_{entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_icon = icon
+
+    @property
+    def native_value(self):
+        return self._client.metrics.totals()[self._field]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        endpoints = self._client.metrics.summary()["endpoints"]
+        return {
+            "endpoints": {
+                name: {field: summary[field] for field in self._attr_fields} for name, summary in endpoints.items()
+            },
+        }
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"api_{self._entry_id}")},
+            "name": "Mashov – API",
+            "manufacturer": DEVICE_MANUFACTURER,
+            "model": DEVICE_MODEL,
+        }
@@ -0,0 +1,159 @@
+"""Per-entry string interning for names repeated across items, and the cache encoding built on it.
+
+A school year of lessons history, behavior and grades repeats the same few dozen subject,
+group, teacher and event names thousands of times; json.loads gives every occurrence its own
+str object. Interning while normalizing keeps one object per distinct name, and the cache
+stores each name once in a symbol list with records referring to it by index.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+# Item fields holding repeated names (normalized snake_case keys plus the camelCase keys of
+# payloads kept close to raw: grades, timetable groupDetails/groupTeachers)
+INTERNED_FIELDS = frozenset(
+    {
+        "subject",
+        "subject_name",
+        "group_name",
+        "reporter",
+        "lesson_reporter",
+        "achva_name",
+        "subjectName",
+        "groupName",
+        "teacherName",
+        "gradeType",
+    }
+)
+MAX_SYMBOLS = 10_000  # names past this are left un-interned; a school entry has a few hundred
+# A list of rows is cached as {"$refs": [fields], "$rows": rows}: the listed fields of every row hold a
+# symbol index (a plain int) or None. A field is listed only when no row has another non-string value
+# in it, so a numeric gradeType is kept as itself and never read back as an index.
+SYMBOL_FIELDS = "$refs"
+SYMBOL_ROWS = "$rows"
+# Key of the {"$s": index} object of caches saved before field-level references; still read
+SYMBOL_REF = "$s"
+
+
+class SymbolTable:
+    """Canonical str object and stable index per distinct name, owned by one entry's client."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Any) -> Any:
+        """Return the table's copy of value; non-strings are returned unchanged."""
+        if not isinstance(value, str):
+            return value
+        idx = self._ids.get(value)
+        if idx is not None:
+            return self._strings[idx]
+        if len(self._strings) >= MAX_SYMBOLS:
+            return value
+        self._ids[value] = len(self._strings)
+        self._strings.append(value)
+        return value
+
+    def intern_fields(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Intern INTERNED_FIELDS of one item in place and return it."""
+        for key in INTERNED_FIELDS.intersection(item):
+            item[key] = self.intern(item[key])
+        return item
+
+    def ref(self, value: str) -> int:
+        """Index of value, adding it if needed (cache encoding; not capped)."""
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return idx
+
+    def strings(self) -> list[str]:
+        return list(self._strings)
+
+
+def _ref_fields(rows: list[dict[str, Any]]) -> list[str]:
+    """Interned fields holding a name in some row and only names or None in every row."""
+    names: set[str] = set()
+    other: set[str] = set()
+    for row in rows:
+        for key in INTERNED_FIELDS.intersection(row):
+            value = row[key]
+            if isinstance(value, str):
+                names.add(key)
+            elif value is not None:
+                other.add(key)
+    return sorted(names - other)
+
+
+def _encode(obj: Any, table: SymbolTable) -> Any:
+    if isinstance(obj, dict):
+        return {k: _encode(v, table) for k, v in obj.items()}
+    if isinstance(obj, Sequence) and not isinstance(obj, str | bytes):
+        # Lists, and read-only views such as columnar lessons history (saved as rows)
+        rows = [_encode(v, table) for v in obj]
+        if rows and all(isinstance(row, dict) for row in rows) and (fields := _ref_fields(rows)):
+            for row in rows:
+                for key in fields:
+                    if isinstance(row.get(key), str):
+                        row[key] = table.ref(row[key])
+            return {SYMBOL_FIELDS: fields, SYMBOL_ROWS: rows}
+        return rows
+    return obj
+
+
+def _decode(obj: Any, names: list[str], table: SymbolTable) -> Any:
+    if isinstance(obj, dict):
+        fields = obj.get(SYMBOL_FIELDS)
+        if len(obj) == 2 and isinstance(fields, list) and isinstance(obj.get(SYMBOL_ROWS), list):
+            rows = _decode(obj[SYMBOL_ROWS], names, table)
+            for row in rows:
+                for key in fields:
+                    if key in row:
+                        row[key] = _name(row[key], names)
+            return rows
+        return {
+            k: _decode_name(v, names, table) if k in INTERNED_FIELDS else _decode(v, names, table)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_decode(v, names, table) for v in obj]
+    return obj
+
+
+def _name(idx: Any, names: list[str]) -> Any:
+    """names[idx] for a valid symbol index; anything else (None) unchanged."""
+    if isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx < len(names):
+        return names[idx]
+    return idx
+
+
+def _decode_name(value: Any, names: list[str], table: SymbolTable) -> Any:
+    """A name field outside a row list: a literal, or an older cache's {"$s": index}."""
+    if isinstance(value, dict) and len(value) == 1 and SYMBOL_REF in value:
+        return _name(value[SYMBOL_REF], names)
+    return table.intern(value) if isinstance(value, str) else _decode(value, names, table)
+
+
+def encode_cache(data: dict[str, Any]) -> tuple[list[str], dict[str, Any]]:
+    """Return (symbols, data with the names of row lists replaced by symbol indexes).
+
+    The symbol list is built from this data alone, so it holds only names still in use.
+    """
+    table = SymbolTable()
+    encoded = _encode(data, table)
+    return table.strings(), encoded
+
+
+def decode_cache(symbols: list[str], data: dict[str, Any], table: SymbolTable | None = None) -> dict[str, Any]:
+    """Inverse of encode_cache (older {"$s": index} caches too); names are interned into table."""
+    if table is None:
+        table = SymbolTable()
+    names = [table.intern(s) for s in symbols]
+    return _decode(data, names, table)
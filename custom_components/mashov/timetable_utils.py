@@ -0,0 +1,122 @@
+"""Utilities for expanding the weekly Mashov timetable into dated lessons."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+from .holidays_utils import parse_iso_date_to_date
+
+SUBJECT_UNKNOWN = "מקצוע לא ידוע"
+
+
+def mashov_day_for_date(d: date) -> int:
+    """Return the Mashov weekday for a date (Sunday=1 ... Saturday=7)."""
+    return (d.weekday() + 1) % 7 + 1
+
+
+def holiday_dates(holidays: list[dict[str, Any]], start: date, end: date) -> dict[date, str]:
+    """Return {date: holiday name} for every holiday day within [start, end).
+
+    Holiday end dates are inclusive, matching the holidays calendar.
+    """
+    out: dict[date, str] = {}
+    for h in holidays or []:
+        h_start = parse_iso_date_to_date(h.get("start") or "")
+        if not h_start:
+            continue
+        h_end = parse_iso_date_to_date(h.get("end") or "") or h_start
+        d = max(h_start, start)
+        last = min(h_end, end - timedelta(days=1))
+        while d <= last:
+            out.setdefault(d, h.get("name") or "")
+            d += timedelta(days=1)
+    return out
+
+
+def _as_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _teacher_names(item: dict[str, Any], group_details: dict[str, Any]) -> list[str]:
+    teachers = group_details.get("groupTeachers") or item.get("groupTeachers") or []
+    if not isinstance(teachers, list):
+        return []
+    return [t.get("teacherName") for t in teachers if isinstance(t, dict) and t.get("teacherName")]
+
+
+def _plans_index(weekly_plan: list[dict[str, Any]]) -> tuple[dict[tuple, str], dict[tuple, str]]:
+    """Index weekly plan text by (date, lesson, group) and by (date, group) as a fallback."""
+    exact: dict[tuple, str] = {}
+    by_group: dict[tuple, str] = {}
+    for p in weekly_plan or []:
+        text = (p.get("plan") or "").strip()
+        d = parse_iso_date_to_date(p.get("lesson_date") or "")
+        if not text or not d:
+            continue
+        group_id = p.get("group_id")
+        exact.setdefault((d, _as_int(p.get("lesson")), group_id), text)
+        by_group.setdefault((d, group_id), text)
+    return exact, by_group
+
+
+def materialize_lessons(
+    timetable: list[dict[str, Any]],
+    weekly_plan: list[dict[str, Any]],
+    holidays: list[dict[str, Any]],
+    start: date,
+    days: int,
+) -> list[dict[str, Any]]:
+    """Expand weekly timetable templates into dated lesson instances.
+
+    Produces one instance per timetable slot for every date in [start, start + days),
+    skipping holiday dates, with the matching weekly-plan text joined in.
+    Result is sorted by (date, lesson).
+    """
+    if not timetable or days <= 0:
+        return []
+    end = start + timedelta(days=days)
+
+    # Group templates by Mashov weekday once, so each date is a dict lookup
+    slots_by_day: dict[int, list[dict[str, Any]]] = {}
+    for it in timetable:
+        tt = (it or {}).get("timeTable") or {}
+        gd = (it or {}).get("groupDetails") or {}
+        day = _as_int(tt.get("day"))
+        if day is None:
+            continue
+        teachers = _teacher_names(it, gd)
+        room = tt.get("roomNum")
+        slots_by_day.setdefault(day, []).append(
+            {
+                "lesson": _as_int(tt.get("lesson")),
+                "group_id": tt.get("groupId"),
+                "subject": gd.get("subjectName") or gd.get("groupName") or SUBJECT_UNKNOWN,
+                "group_name": gd.get("groupName"),
+                "teacher": teachers[0] if teachers else None,
+                "teachers": teachers,
+                "room": room.strip() if isinstance(room, str) else room,
+            }
+        )
+    for slots in slots_by_day.values():
+        slots.sort(key=lambda s: s["lesson"] if s["lesson"] is not None else 0)
+
+    skip = holiday_dates(holidays, start, end)
+    plans_exact, plans_by_group = _plans_index(weekly_plan)
+
+    lessons: list[dict[str, Any]] = []
+    d = start
+    while d < end:
+        if d not in skip:
+            day = mashov_day_for_date(d)
+            date_iso = d.isoformat()
+            for slot in slots_by_day.get(day, ()):
+                plan = plans_exact.get((d, slot["lesson"], slot["group_id"])) or plans_by_group.get(
+                    (d, slot["group_id"])
+                )
+                lessons.append({"date": date_iso, "day": day, **slot, "plan": plan})
+        d += timedelta(days=1)
+    return lessons
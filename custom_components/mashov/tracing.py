@@ -0,0 +1,109 @@
+"""Lightweight phase timing for the refresh pipeline."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+import time
+from typing import Any
+
+# Refresh traces kept per entry
+TRACE_BUFFER_SIZE = 20
+
+# Trace of the refresh running in the current task; child tasks (asyncio.gather) inherit it
+_CURRENT_TRACE: ContextVar[RefreshTrace | None] = ContextVar("mashov_refresh_trace", default=None)
+
+
+class RefreshTrace:
+    """Timing of one refresh; repeated spans of the same name are aggregated."""
+
+    def __init__(self, trace_id: int):
+        self.trace_id = trace_id
+        self.started = datetime.now(UTC).isoformat(timespec="seconds")
+        self.status = "running"
+        self.duration_ms: float | None = None
+        self._t0 = time.monotonic()
+        # name -> {count, total_ms, max_ms, start_ms}
+        self.spans: dict[str, dict[str, Any]] = {}
+
+    def add(self, name: str, started: float, seconds: float) -> None:
+        ms = seconds * 1000
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = {
+                "count": 1,
+                "total_ms": ms,
+                "max_ms": ms,
+                "start_ms": (started - self._t0) * 1000,
+            }
+            return
+        span["count"] += 1
+        span["total_ms"] += ms
+        span["max_ms"] = max(span["max_ms"], ms)
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.duration_ms = (time.monotonic() - self._t0) * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.trace_id,
+            "started": self.started,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "spans": {
+                name: {k: round(v, 1) if isinstance(v, float) else v for k, v in span.items()}
+                for name, span in self.spans.items()
+            },
+        }
+
+
+@contextmanager
+def span(name: str, trace: RefreshTrace | None = None) -> Iterator[None]:
+    """Time a block into the given trace, or the current task's trace; no-op when neither exists."""
+    trace = trace or _CURRENT_TRACE.get()
+    if trace is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.monotonic() - started)
+
+
+class TraceRecorder:
+    """Ring buffer of the last N refresh traces for one entry."""
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE):
+        self._traces: deque[RefreshTrace] = deque(maxlen=size)
+        self._next_id = 1
+
+    def start(self) -> RefreshTrace:
+        """Start a trace and make it current for this task.
+
+        It stays current after the refresh returns, so entity updates and the cache save
+        that follow in the same task are recorded as post-refresh spans.
+        """
+        trace = RefreshTrace(self._next_id)
+        self._next_id += 1
+        self._traces.append(trace)
+        _CURRENT_TRACE.set(trace)
+        return trace
+
+    def resume(self) -> None:
+        """Make the last trace current for this task, when the refresh itself ran in another task."""
+        if self._traces:
+            _CURRENT_TRACE.set(self._traces[-1])
+
+    @property
+    def last(self) -> RefreshTrace | None:
+        return self._traces[-1] if self._traces else None
+
+    def as_list(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Most recent first."""
+        traces = list(reversed(self._traces))
+        return [t.as_dict() for t in (traces[:limit] if limit else traces)]
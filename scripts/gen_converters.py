@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Regenerate custom_components/mashov/converters.py from field_specs.SPECS
+Usage: python scripts/gen_converters.py
+"""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from custom_components.mashov.normalizers import render_converters  # noqa: E402
+
+
+def main():
+    path = ROOT / "custom_components" / "mashov" / "converters.py"
+    path.write_text(render_converters(), encoding="utf-8")
+    print(f"Wrote {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
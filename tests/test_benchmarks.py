@@ -0,0 +1,42 @@
+"""Test the benchmark data generator and runner."""
+
+from benchmarks.generator import generate_dataset
+from benchmarks.memory import run_memory_report
+from benchmarks.run import compare, run_benchmarks
+
+
+def test_generator_is_deterministic():
+    """Test the same seed yields identical payloads and a different seed doesn't."""
+    assert generate_dataset(students=1, seed=7) == generate_dataset(students=1, seed=7)
+    assert generate_dataset(students=1, seed=7) != generate_dataset(students=1, seed=8)
+
+
+def test_generator_produces_a_school_year():
+    """Test payload volumes resemble a full school year."""
+    student = generate_dataset(students=1)["students"][0]
+    assert len(student["lessons_history"]) > 1000
+    assert len(student["grades"]) >= 150
+    assert len(student["behavior"]) >= 100
+
+
+async def test_run_benchmarks_results_document():
+    """Test one quick run covers fetch, normalizers, formatters and attributes."""
+    doc = await run_benchmarks(students=1, repeat=1)
+
+    results = doc["results"]
+    assert "fetch_all" in results
+    assert {"normalize.lessons_history", "format.weekly_plan", "limit_items.grades", "attributes.homework"} <= set(
+        results
+    )
+    assert doc["dataset"]["lessons_history"] > 1000
+    assert compare(doc, doc)["fetch_all"] == 1.0
+
+
+async def test_memory_report_shows_interning_savings():
+    """Test interning shrinks both retained memory and the cache on a school year of data."""
+    report = await run_memory_report(students=1)
+
+    assert 0 < report["symbols"] < 100
+    assert report["memory_bytes"]["saved"] > 0
+    assert report["cache_bytes"]["saved"] > 0
+    assert report["lessons_history_bytes"]["saved"] > 0
@@ -7,7 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from .const import TEST_STUDENT
+from .const import TEST_BEHAVIOR, TEST_HOMEWORK, TEST_STUDENT
 
 
 async def test_holidays_calendar_setup(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
@@ -414,3 +414,69 @@ async def test_holidays_calendar_invalid_dates(hass: HomeAssistant, mock_config_
 
     assert state is not None
     assert state.attributes.get("message") == "Valid Holiday"
+
+
+async def test_student_calendar_events(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test per-student calendar answers range queries for homework and behavior."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [
+                    {
+                        "id": "student-123",
+                        "name": "Test Student",
+                        "slug": "student-123",
+                        "year": "2024",
+                        "school_id": "123456",
+                    }
+                ],
+                "by_slug": {
+                    "student-123": {
+                        "homework": TEST_HOMEWORK,
+                        "behavior": TEST_BEHAVIOR,
+                        "weekly_plan": [],
+                        "timetable": [],
+                        "lessons_history": [],
+                    }
+                },
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    calendar_entity_id = "calendar.mashov_test_student_calendar"
+    assert hass.states.get(calendar_entity_id) is not None
+
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": calendar_entity_id,
+            "start_date_time": "2024-01-01T00:00:00",
+            "end_date_time": "2024-02-01T00:00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    summaries = [ev["summary"] for ev in response[calendar_entity_id]["events"]]
+    assert summaries == ["ש.ב: Mathematics", "Excellent participation - Mathematics"]
+
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": calendar_entity_id,
+            "start_date_time": "2024-01-16T00:00:00",
+            "end_date_time": "2024-02-01T00:00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response[calendar_entity_id]["events"] == []
@@ -0,0 +1,53 @@
+"""Test Mashov change tracking."""
+
+from custom_components.mashov.change_tracker import ChangeTracker, item_key
+
+from .const import TEST_BEHAVIOR
+
+GRADE_1 = {"gradingEventId": 1, "subjectName": "Mathematics", "grade": 90}
+GRADE_2 = {"gradingEventId": 2, "subjectName": "History", "grade": 80}
+HOMEWORK = {"lesson_id": "lesson-1", "group_id": "group-1", "homework": "Page 10"}
+
+
+def test_item_key_is_stable_per_data_key():
+    """Test identity ignores edited content."""
+    assert item_key("grades", GRADE_1) == item_key("grades", {**GRADE_1, "grade": 95})
+    assert item_key("homework", HOMEWORK) == item_key("homework", {**HOMEWORK, "homework": "Page 12"})
+    assert item_key("behavior", TEST_BEHAVIOR[0]) == "2024-01-15T00:00:00|1|Excellent participation"
+
+
+def test_first_snapshot_is_baseline():
+    """Test the first snapshot is reported as baseline, not as new items."""
+    tracker = ChangeTracker()
+    changes = tracker.process({"kid": {"grades": [GRADE_1], "homework": [HOMEWORK]}})
+    assert [kind for _slug, _key, kind, _item in changes] == ["baseline", "baseline"]
+
+
+def test_reports_new_and_changed_items():
+    """Test new and edited items are reported once."""
+    tracker = ChangeTracker()
+    tracker.process({"kid": {"grades": [GRADE_1], "homework": [HOMEWORK]}})
+
+    edited = {**HOMEWORK, "homework": "Page 12"}
+    changes = tracker.process({"kid": {"grades": [GRADE_1, GRADE_2], "homework": [edited]}})
+
+    assert changes == [("kid", "homework", "changed", edited), ("kid", "grades", "new", GRADE_2)]
+    assert tracker.process({"kid": {"grades": [GRADE_1, GRADE_2], "homework": [edited]}}) == []
+
+
+def test_state_round_trip_prevents_replay():
+    """Test restored state does not replay already seen items."""
+    tracker = ChangeTracker()
+    tracker.process({"kid": {"grades": [GRADE_1]}})
+
+    restored = ChangeTracker(tracker.as_dict())
+    assert restored.process({"kid": {"grades": [GRADE_1, GRADE_2]}}) == [("kid", "grades", "new", GRADE_2)]
+
+
+def test_empty_fetch_keeps_state():
+    """Test an empty list (failed fetch) does not reset the seen items."""
+    tracker = ChangeTracker()
+    tracker.process({"kid": {"grades": [GRADE_1]}})
+    tracker.process({"kid": {"grades": []}})
+
+    assert tracker.process({"kid": {"grades": [GRADE_1]}}) == []
@@ -5,8 +5,10 @@ from unittest.mock import AsyncMock, patch
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mashov.const import DOMAIN
+from custom_components.mashov.mashov_client import MashovAuthError
 
 from .const import TEST_PASSWORD, TEST_SCHOOL_ID, TEST_STUDENT, TEST_USERNAME
 
@@ -163,3 +165,37 @@ async def test_options_flow(hass: HomeAssistant, mock_config_entry):
     )
 
     assert result2["type"] == FlowResultType.CREATE_ENTRY
+
+
+async def test_reauth_flow_updates_password(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test the reauth flow checks the new password, stores it and reloads the entry."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("custom_components.mashov.config_flow.MashovClient") as mock_client,
+        patch("custom_components.mashov.async_setup_entry", return_value=True) as setup_entry,
+    ):
+        client = mock_client.return_value
+        client.async_init = AsyncMock(side_effect=[MashovAuthError("Invalid credentials"), None])
+        client.async_close = AsyncMock(return_value=None)
+
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_REAUTH, "entry_id": mock_config_entry.entry_id},
+            data=mock_config_entry.data,
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "reauth_confirm"
+
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], {"password": "wrong"})
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {"base": "auth"}
+
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], {"password": "new_password"})
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert mock_config_entry.data["password"] == "new_password"
+    assert mock_client.call_args.kwargs["username"] == TEST_USERNAME
+    assert setup_entry.called
@@ -0,0 +1,76 @@
+"""Test Mashov diagnostics."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mashov.const import CONF_DIAGNOSTICS_FULL_DATA, DIAGNOSTICS_SIZE_SAMPLE_ROWS
+from custom_components.mashov.diagnostics import _estimate_json_size, async_get_config_entry_diagnostics
+
+from .const import TEST_HOMEWORK
+
+
+async def _setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    entry.add_to_hass(hass)
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.resilience_diagnostics.return_value = {}
+        client.metrics_diagnostics.return_value = {}
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123", "year": "2024"}],
+                "by_slug": {"student-123": {"homework": TEST_HOMEWORK * 5, "behavior": []}},
+                "holidays": [],
+            }
+        )
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_diagnostics_summary_by_default(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test diagnostics return counts, sizes and samples instead of the full dataset."""
+    await _setup(hass, mock_config_entry)
+
+    result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert "coordinator_data" not in result
+    homework = result["data_summary"]["by_slug"]["student-123"]["homework"]
+    assert homework["count"] == len(TEST_HOMEWORK) * 5
+    assert homework["bytes"] > 0
+    assert len(homework["sample"]) == 3
+    assert result["data_summary"]["students"] == [{"slug": "student-123", "year": "2024"}]
+    assert result["entry"]["data"]["password"] == "**REDACTED**"
+    assert result["refresh_traces"][0]["status"] == "ok"
+    assert result["refresh_arbiter"]["fetches"] == 1
+
+
+async def test_diagnostics_full_data_option(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test the full dataset is included only when the option is enabled."""
+    mock_config_entry = MockConfigEntry(
+        domain=mock_config_entry.domain,
+        data=mock_config_entry.data,
+        options={CONF_DIAGNOSTICS_FULL_DATA: True},
+        unique_id=mock_config_entry.unique_id,
+    )
+    await _setup(hass, mock_config_entry)
+
+    result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert result["coordinator_data"]["by_slug"]["student-123"]["homework"] == TEST_HOMEWORK * 5
+
+
+def test_size_is_estimated_from_sampled_rows():
+    """Test list sizes are extrapolated from a few rows instead of serializing the whole list."""
+    items = [{"lesson_id": n, "homework": "קרא פרק " * (n % 7), "subject_name": "Mathematics"} for n in range(2000)]
+    actual = len(json.dumps(items, ensure_ascii=False).encode("utf-8"))
+
+    with patch("custom_components.mashov.diagnostics.json.dumps", wraps=json.dumps) as dumps:
+        estimate = _estimate_json_size(items)
+
+    assert len(dumps.call_args.args[0]) == DIAGNOSTICS_SIZE_SAMPLE_ROWS
+    assert abs(estimate - actual) < actual * 0.1
+    assert _estimate_json_size([]) == 2
@@ -0,0 +1,94 @@
+"""Test Mashov grade analytics."""
+
+from custom_components.mashov.grade_analytics import GradeAnalytics, grade_value
+
+
+def test_grade_value():
+    """Test numeric grades are parsed and textual ones ignored."""
+    assert grade_value({"grade": 90}) == 90.0
+    assert grade_value({"grade": " 85 "}) == 85.0
+    assert grade_value({"grade": "טוב מאוד"}) is None
+    assert grade_value({}) is None
+
+
+def test_running_aggregates_per_subject():
+    """Test count, mean, weighted mean and trend per subject."""
+    analytics = GradeAnalytics()
+    analytics.add({"gradingEventId": 1, "subjectName": "Mathematics", "grade": 80, "gradeType": "בוחן"})
+    analytics.add({"gradingEventId": 2, "subjectName": "Mathematics", "grade": 100, "gradeType": "מבחן"})
+    analytics.add({"gradingEventId": 3, "subjectName": "History", "grade": 70})
+    assert not analytics.add({"gradingEventId": 4, "subjectName": "History", "grade": "פטור"})
+
+    summary = analytics.summary()
+    math = summary["subjects"]["Mathematics"]
+    assert summary["count"] == 3
+    assert math["count"] == 2
+    assert math["mean"] == 90.0
+    # quiz weighs 1, test weighs 2
+    assert math["weighted_mean"] == 93.33
+    assert math["trend"] == 20.0
+    assert summary["subjects"]["History"]["trend"] is None
+
+
+def test_state_round_trip():
+    """Test aggregates survive serialization and keep accumulating."""
+    analytics = GradeAnalytics()
+    analytics.add({"gradingEventId": 1, "subjectName": "Mathematics", "grade": 80})
+
+    restored = GradeAnalytics(analytics.as_dict())
+    restored.add({"gradingEventId": 2, "subjectName": "Mathematics", "grade": 90})
+
+    assert restored.summary()["subjects"]["Mathematics"]["mean"] == 85.0
+    assert restored.summary()["last"] == 90.0
+
+
+def test_changed_and_removed_grades():
+    """Test a corrected grade replaces its old value and a removed one leaves the aggregates."""
+    analytics = GradeAnalytics()
+    analytics.add({"gradingEventId": 1, "subjectName": "Mathematics", "grade": 60})
+    analytics.add({"gradingEventId": 2, "subjectName": "History", "grade": 90})
+
+    analytics.add({"gradingEventId": 1, "subjectName": "Mathematics", "grade": 80})
+    summary = analytics.summary()
+    assert summary["count"] == 2
+    assert summary["mean"] == 85.0
+    assert summary["subjects"]["Mathematics"] == {
+        "count": 1,
+        "mean": 80.0,
+        "weighted_mean": 80.0,
+        "trend": None,
+        "last": 80.0,
+    }
+
+    analytics.retain({"1"})
+    summary = analytics.summary()
+    assert summary["count"] == 1
+    assert summary["mean"] == 80.0
+    assert "History" not in summary["subjects"]
+
+
+def test_trend_follows_event_dates():
+    """Test the trend and last grade follow eventDate, not the order grades were seen in."""
+    analytics = GradeAnalytics()
+    for event_id, day, grade in ((1, "2025-03-01", 95), (2, "2025-01-01", 75), (3, "2025-02-01", 85)):
+        analytics.add({"gradingEventId": event_id, "subjectName": "Mathematics", "grade": grade, "eventDate": day})
+
+    math = analytics.summary()["subjects"]["Mathematics"]
+    assert math["trend"] == 10.0
+    assert math["last"] == 95.0
+
+
+def test_summary_is_cached_until_grades_change():
+    """Test repeated reads reuse one summary and a folded-in grade rebuilds it."""
+    analytics = GradeAnalytics()
+    analytics.add({"gradingEventId": 1, "subjectName": "Mathematics", "grade": 80, "eventDate": "2025-01-01"})
+    first = analytics.summary()
+    assert analytics.summary() is first
+
+    analytics.add({"gradingEventId": 2, "subjectName": "Mathematics", "grade": 90, "eventDate": "2025-02-01"})
+    second = analytics.summary()
+    assert second is not first
+    assert second["last"] == 90.0
+
+    analytics.retain({"1"})
+    assert analytics.summary()["last"] == 80.0
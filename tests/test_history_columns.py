@@ -0,0 +1,70 @@
+"""Test the columnar lessons-history store."""
+
+from datetime import date
+
+from custom_components.mashov.history_columns import LessonsHistoryColumns
+
+
+def _row(day: int, lesson: int, subject: str | None, took: bool | None = True, **extra):
+    return {
+        "lesson_id": f"l-{day}-{lesson}",
+        "group_id": "g1",
+        "lesson_date": f"2025-01-{day:02d}T00:00:00",
+        "lesson": lesson,
+        "took_place": took,
+        "remark": None,
+        "homework": None,
+        "lessontype": 0,
+        "reporter_guid": "t1",
+        "group_name": "Group A",
+        "subject_name": subject,
+        **extra,
+    }
+
+
+ROWS = [
+    _row(7, 2, "Mathematics"),
+    _row(5, 1, "English", took=False),
+    _row(6, 1, "Mathematics", took=False),
+    _row(7, 1, None),
+]
+
+
+def test_rows_round_trip():
+    """Test iteration, indexing and slicing give back rows equal to the input, odd values included."""
+    odd = [
+        {**_row(8, 1, "Mathematics"), "lesson_date": "2025-01-08", "lesson": "1", "extra": [1]},
+        {"lesson_id": "partial", "took_place": 1, "subject_name": 5},
+    ]
+    columns = LessonsHistoryColumns(ROWS + odd)
+
+    assert list(columns) == ROWS + odd
+    assert columns == ROWS + odd
+    assert columns[-1] == odd[-1]
+    assert columns[1:3] == ROWS[1:3]
+    assert len(columns) == 6
+
+
+def test_select_count_and_by_subject():
+    """Test date ranges (end exclusive), subject and took-place filters, counts and per-subject totals."""
+    columns = LessonsHistoryColumns(ROWS)
+
+    assert columns.select(start=date(2025, 1, 6)) == [2, 0, 3]
+    assert columns.count(start=date(2025, 1, 6), end=date(2025, 1, 7)) == 1
+    assert columns.count(subject="Mathematics") == 2
+    assert columns.count(subject="Group A") == 1  # row without a subject falls back to its group
+    assert columns.count(subject="History") == 0
+    assert columns.rows(columns.select(took_place=False)) == [ROWS[1], ROWS[2]]
+    assert columns.by_subject() == {
+        "Mathematics": {"lessons": 2, "took_place": 1, "cancelled": 1},
+        "English": {"lessons": 1, "took_place": 0, "cancelled": 1},
+        "Group A": {"lessons": 1, "took_place": 1, "cancelled": 0},
+    }
+    assert columns.by_subject(end=date(2025, 1, 6)) == {"English": {"lessons": 1, "took_place": 0, "cancelled": 1}}
+
+
+def test_latest_matches_sorting_rows():
+    """Test latest() returns the newest rows as sorting the dicts by date would."""
+    columns = LessonsHistoryColumns(ROWS)
+    expected = sorted(ROWS, key=lambda r: r["lesson_date"], reverse=True)[:3]
+    assert columns.latest(3) == expected
@@ -1,14 +1,29 @@
 """Test Mashov integration initialization."""
 
+import asyncio
+import builtins
+from datetime import date, timedelta
+import threading
+import time
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events, async_fire_time_changed
 
-from custom_components.mashov.const import DOMAIN
+from benchmarks.stub_server import MashovStubServer
+from custom_components.mashov import rate_limiter
+from custom_components.mashov.const import CONF_API_BASE, DOMAIN, EVENT_NEW_GRADE
+from custom_components.mashov.history_columns import LessonsHistoryColumns
+from custom_components.mashov.mashov_client import STUDENT_DATA_KEYS, MashovAuthError, MashovError
+from custom_components.mashov.symbols import SymbolTable
 
-from .const import TEST_STUDENT
+from .const import TEST_STUDENT, TEST_TIMETABLE, TEST_WEEKLY_PLAN
 
 
 async def test_setup_entry(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
@@ -53,24 +68,72 @@ async def test_setup_entry(hass: HomeAssistant, mock_config_entry: MockConfigEnt
     assert mock_config_entry.state == ConfigEntryState.LOADED
 
 
-async def test_setup_entry_auth_failed(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
-    """Test setup fails when authentication fails."""
+async def test_first_boot_auth_failure_starts_reauth(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test rejected credentials on a boot without cache load the entry and start reauth instead of failing setup."""
     mock_config_entry.add_to_hass(hass)
 
     with patch("custom_components.mashov.MashovClient") as mock_client:
         client = mock_client.return_value
-        client.async_init = AsyncMock(side_effect=Exception("Authentication failed"))
+        client.async_restore_session = AsyncMock(return_value=False)
+        client.async_init = AsyncMock(side_effect=MashovAuthError("Invalid credentials"))
         client.async_close = AsyncMock(return_value=None)
-        client.async_open_session = AsyncMock(return_value=None)
-        client.async_close_session = AsyncMock(return_value=None)
-        client.async_authenticate = AsyncMock(return_value=False)
-        client.async_fetch_all = AsyncMock(side_effect=Exception("Authentication failed"))
 
-        assert not await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state == ConfigEntryState.LOADED
+        assert hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]["refresh"] == "auth_failed"
+        flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+        assert hass.states.get("sensor.mashov_holidays").state == STATE_UNAVAILABLE
+        assert hass.states.get("calendar.mashov_holidays_calendar").state == STATE_UNAVAILABLE
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_first_boot_does_not_wait_for_mashov(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test a boot without cache loads at once with unavailable entities and retries a failed first fetch."""
+    mock_config_entry.add_to_hass(hass)
+    students = [{"id": "student-123", "name": "Test Student", "slug": "student-123"}]
+    responses = [
+        MashovError("Mashov is down"),
+        {"students": students, "by_slug": {"student-123": {"homework": [{"subject": "Math"}]}}, "holidays": []},
+    ]
+
+    async def slow_fetch(*args, **kwargs):
+        await asyncio.sleep(0.3)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=True)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(side_effect=slow_fetch)
+
+        started = time.monotonic()
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        assert time.monotonic() - started < 0.3
+        assert mock_config_entry.state == ConfigEntryState.LOADED
+        startup = hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]
+        assert startup["refresh"] == "pending"
+        assert hass.states.get("sensor.mashov_holidays").state == STATE_UNAVAILABLE
+
         await hass.async_block_till_done()
+        assert startup["refresh"] == "failed"
+        assert startup["next_retry_seconds"] == 30
+        assert hass.states.get("sensor.mashov_holidays").state == STATE_UNAVAILABLE
+        assert hass.states.get("sensor.mashov_test_student_homework") is None
 
-    # When async_init fails, Home Assistant retries the setup
-    assert mock_config_entry.state in [ConfigEntryState.SETUP_ERROR, ConfigEntryState.SETUP_RETRY]
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert startup["refresh"] == "ok"
+        assert hass.states.get("sensor.mashov_holidays").state == "0"
+        assert hass.states.get("sensor.mashov_test_student_homework").state == "1"
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
 
 
 async def test_unload_entry(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
@@ -168,3 +231,887 @@ async def test_refresh_service(hass: HomeAssistant, mock_config_entry: MockConfi
 
         # Verify coordinator refresh was called (async_fetch_all is called during refresh)
         assert client.async_fetch_all.call_count >= 1
+
+
+async def test_get_lessons_service(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test get_lessons service returns materialized lessons and caches them."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [
+                    {
+                        "id": "student-123",
+                        "name": "Test Student",
+                        "slug": "student-123",
+                        "year": "2024",
+                        "school_id": "123456",
+                    }
+                ],
+                "by_slug": {
+                    "student-123": {
+                        "homework": [],
+                        "behavior": [],
+                        "weekly_plan": TEST_WEEKLY_PLAN,
+                        "timetable": TEST_TIMETABLE,
+                        "lessons_history": [],
+                    }
+                },
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "get_lessons",
+            {"student": "Test Student", "start": "2024-01-14", "days": 7},
+            blocking=True,
+            return_response=True,
+        )
+
+    lessons = response["students"]["student-123"]
+    assert [le["date"] for le in lessons] == ["2024-01-14"]
+    assert lessons[0]["subject"] == "Mathematics"
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+    first = coordinator.get_lessons("student-123", date(2024, 1, 14), 7)
+    assert coordinator.get_lessons("student-123", date(2024, 1, 14), 7) is first
+
+
+async def test_change_events_fired_on_refresh(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test a refresh that brings a new grade fires mashov_new_grade with only the delta."""
+    mock_config_entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_NEW_GRADE)
+
+    def _data(grades):
+        return {
+            "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+            "by_slug": {"student-123": {"homework": [], "behavior": [], "grades": grades}},
+            "holidays": [],
+        }
+
+    grade_1 = {"gradingEventId": 1, "subjectName": "Mathematics", "grade": 90}
+    grade_2 = {"gradingEventId": 2, "subjectName": "History", "grade": 80}
+
+    # Second refresh right after setup; don't let the minimum spacing reuse the first result
+    hass.config_entries.async_update_entry(mock_config_entry, options={"min_refresh_spacing_seconds": 0})
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(return_value=_data([grade_1]))
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert events == []
+
+        client.async_fetch_all.return_value = _data([grade_1, grade_2])
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["student_slug"] == "student-123"
+    assert events[0].data["item"] == grade_2
+
+
+async def test_get_refresh_trace_service(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test get_refresh_trace returns phase spans of the startup refresh."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+                "by_slug": {"student-123": {"homework": [], "behavior": []}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "get_refresh_trace",
+            {"entry_id": mock_config_entry.entry_id},
+            blocking=True,
+            return_response=True,
+        )
+
+    traces = response["entries"][mock_config_entry.entry_id]
+    assert len(traces) == 1
+    assert traces[0]["status"] == "ok"
+    assert {"fetch_all", "change_events", "cache_save", "attributes.homework"} <= set(traces[0]["spans"])
+
+
+async def test_setup_entry_restores_persisted_session(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test setup reuses a persisted session instead of logging in."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=True)
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(return_value={"students": [], "by_slug": {}, "holidays": []})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state == ConfigEntryState.LOADED
+    client.async_restore_session.assert_awaited_once()
+    client.async_init.assert_not_awaited()
+    client.async_fetch_all.assert_awaited()
+
+
+def _seed_cache(hass_storage, entry: MockConfigEntry, data: dict) -> None:
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.cache"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.cache",
+        "data": {"last_refresh_ts": time.time() - 24 * 3600, "data": data},
+    }
+
+
+async def test_deferred_startup_does_not_wait_for_mashov(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage
+):
+    """Test deferred startup returns before login/refresh and adds student entities once data arrives."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"schedule_type": "interval"})
+    _seed_cache(
+        hass_storage,
+        mock_config_entry,
+        {
+            "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+            "by_slug": {"student-123": {"homework": []}},
+            "holidays": [],
+        },
+    )
+
+    async def slow_login(_hass):
+        await asyncio.sleep(0.3)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=False)
+        client.async_init = AsyncMock(side_effect=slow_login)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_probe = AsyncMock(return_value="fp-1")
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [
+                    {"id": "student-123", "name": "Test Student", "slug": "student-123"},
+                    {"id": "student-456", "name": "Second Student", "slug": "student-456"},
+                ],
+                "by_slug": {"student-123": {"homework": [{"subject": "Math"}]}, "student-456": {"homework": []}},
+                "holidays": [],
+            }
+        )
+
+        started = time.monotonic()
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        setup_seconds = time.monotonic() - started
+
+        startup = hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]
+        assert startup["mode"] == "deferred"
+        assert startup["refresh"] == "pending"
+        assert setup_seconds < 0.3
+        assert hass.states.get("sensor.mashov_test_student_homework").state == "0"
+        assert hass.states.get("sensor.mashov_second_student_homework") is None
+
+        await hass.async_block_till_done()
+
+        assert startup["refresh"] == "ok"
+        assert startup["setup_seconds"] < startup["refresh_seconds"]
+        assert hass.states.get("sensor.mashov_test_student_homework").state == "1"
+        assert hass.states.get("sensor.mashov_second_student_homework") is not None
+        assert hass.states.get("calendar.mashov_second_student_calendar") is not None
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_deferred_startup_failure_is_retried(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage
+):
+    """Test a failed background startup refresh keeps the cache and is retried with backoff."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"schedule_type": "interval"})
+    students = [{"id": "student-123", "name": "Test Student", "slug": "student-123"}]
+    _seed_cache(hass_storage, mock_config_entry, {"students": students, "by_slug": {"student-123": {"homework": []}}})
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=True)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_probe = AsyncMock(return_value="fp-1")
+        client.async_fetch_all = AsyncMock(
+            side_effect=[
+                MashovError("Mashov is down"),
+                MashovError("Mashov is down"),
+                {"students": students, "by_slug": {"student-123": {"homework": [{"subject": "Math"}]}}},
+            ]
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        startup = hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]
+
+        assert mock_config_entry.state == ConfigEntryState.LOADED
+        assert startup["refresh"] == "failed"
+        assert startup["next_retry_seconds"] == 30
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        assert coordinator.data["by_slug"]["student-123"]["homework"] == []
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 2
+        assert startup["next_retry_seconds"] == 60
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=92))
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 3
+        assert startup["refresh"] == "ok"
+        assert startup["retries"] == 2
+        assert hass.states.get("sensor.mashov_test_student_homework").state == "1"
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_deferred_startup_auth_failure_starts_reauth(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage
+):
+    """Test rejected credentials during a background startup refresh start the reauth flow instead of retrying."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"schedule_type": "interval"})
+    students = [{"id": "student-123", "name": "Test Student", "slug": "student-123"}]
+    _seed_cache(hass_storage, mock_config_entry, {"students": students, "by_slug": {"student-123": {"homework": []}}})
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=False)
+        client.async_init = AsyncMock(side_effect=MashovAuthError("Invalid credentials"))
+        client.async_close = AsyncMock(return_value=None)
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        startup = hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]
+
+        assert startup["refresh"] == "auth_failed"
+        assert "next_retry_seconds" not in startup
+        flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_setup_does_no_blocking_file_io(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test setup never opens files on the event loop thread (version comes from the cached manifest)."""
+    mock_config_entry.add_to_hass(hass)
+    loop_thread = threading.get_ident()
+    real_open = builtins.open
+    opened_on_loop = []
+
+    def tracking_open(file, *args, **kwargs):
+        if threading.get_ident() == loop_thread:
+            opened_on_loop.append(str(file))
+        return real_open(file, *args, **kwargs)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client, patch("builtins.open", tracking_open):
+        client = mock_client.return_value
+        client.async_restore_session = AsyncMock(return_value=False)
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(return_value={"students": [], "by_slug": {}, "holidays": []})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state == ConfigEntryState.LOADED
+    assert opened_on_loop == []
+
+
+async def test_entries_are_staggered(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test two entries with the same schedule time fire at different, spaced-out effective times."""
+    second_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**mock_config_entry.data, "username": "other_user"},
+        unique_id="654321",
+        title="Other School (654321)",
+    )
+    mock_config_entry.add_to_hass(hass)
+    second_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(return_value={"students": [], "by_slug": {}, "holidays": []})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    offsets = [
+        hass.data[DOMAIN][e.entry_id]["coordinator"].schedule_offset_seconds for e in (mock_config_entry, second_entry)
+    ]
+    assert all(0 <= o < 10 * 60 + 30 for o in offsets)
+    assert abs(offsets[0] - offsets[1]) >= 30
+
+
+async def test_refresh_now_partial(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test refresh_now with student/data_keys fetches only those keys and notifies only affected listeners."""
+    mock_config_entry.add_to_hass(hass)
+    timetable = list(TEST_TIMETABLE)
+    homework = [{"homework_id": "1", "subject": "Mathematics", "homework": "Page 10"}]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"homework": [], "behavior": [], "timetable": timetable}},
+                "holidays": [],
+            }
+        )
+        client.async_fetch_partial = AsyncMock(return_value={"by_slug": {"test_student": {"homework": homework}}})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append("homework"), ("test_student", frozenset({"homework"})))
+        coordinator.async_add_listener(lambda: notified.append("behavior"), ("test_student", frozenset({"behavior"})))
+        coordinator.async_add_listener(lambda: notified.append("other"), ("other_student", frozenset({"homework"})))
+
+        await hass.services.async_call(
+            DOMAIN,
+            "refresh_now",
+            {"student": "Test Student", "data_keys": ["homework"]},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    client.async_fetch_partial.assert_awaited_once_with(["test_student"], ["homework"])
+    assert client.async_fetch_all.call_count == 1
+    group = coordinator.data["by_slug"]["test_student"]
+    assert group["homework"] == homework
+    assert group["timetable"] is timetable
+    assert notified == ["homework"]
+    assert hass.states.get("sensor.mashov_test_student_homework").state == "1"
+    assert coordinator.refresh_arbiter.as_dict()["partial"] == 1
+
+
+async def test_refresh_now_student_skips_holidays(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test a student-only refresh_now refetches that student's keys but not the shared holidays."""
+    mock_config_entry.add_to_hass(hass)
+    holidays = [{"id": 1, "name": "Pesach", "start": "2025-04-12", "end": "2025-04-20"}]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"homework": []}},
+                "holidays": holidays,
+            }
+        )
+        client.async_fetch_partial = AsyncMock(return_value={"by_slug": {"test_student": {"homework": []}}})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+        await hass.services.async_call(DOMAIN, "refresh_now", {"student": "Test Student"}, blocking=True)
+        await hass.services.async_call(
+            DOMAIN, "refresh_now", {"student": "Test Student", "data_keys": ["holidays"]}, blocking=True
+        )
+
+    client.async_fetch_partial.assert_awaited_once_with(["test_student"], list(STUDENT_DATA_KEYS))
+    assert coordinator.data["holidays"] is holidays
+
+
+async def test_overlapping_triggers_coalesce(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test a refresh_now landing on a running refresh, and one right after it, don't fetch again."""
+    mock_config_entry.add_to_hass(hass)
+    release = asyncio.Event()
+    data = {
+        "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+        "by_slug": {"student-123": {"homework": [], "behavior": []}},
+        "holidays": [],
+    }
+
+    async def _fetch_all():
+        await release.wait()
+        return data
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(side_effect=_fetch_all)
+
+        release.set()
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        assert client.async_fetch_all.call_count == 1
+
+        # Past the minimum spacing: a scheduled tick starts a fetch and refresh_now joins it
+        coordinator.refresh_arbiter.min_spacing = 0
+        release.clear()
+        scheduled = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        service = hass.async_create_task(
+            hass.services.async_call(DOMAIN, "refresh_now", {"entry_id": mock_config_entry.entry_id}, blocking=True)
+        )
+        while coordinator.refresh_arbiter.requests < 3:
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(scheduled, service)
+        assert client.async_fetch_all.call_count == 2
+
+        # Within the spacing the latest data is reused without contacting Mashov
+        coordinator.refresh_arbiter.min_spacing = 60
+        await coordinator.async_refresh()
+        assert client.async_fetch_all.call_count == 2
+
+    stats = coordinator.refresh_arbiter.as_dict()
+    assert (stats["fetches"], stats["coalesced"], stats["spaced"]) == (2, 1, 1)
+
+
+async def test_interval_poll_skips_full_fetch_when_probe_unchanged(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+):
+    """Test interval polls run the full fetch only when the change probe moves; refresh_now always fetches."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={"schedule_type": "interval", "schedule_interval": 10, "min_refresh_spacing_seconds": 0},
+    )
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+                "by_slug": {"student-123": {"homework": [], "behavior": []}},
+                "holidays": [],
+            }
+        )
+        client.async_probe = AsyncMock(return_value="fp-1")
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        assert client.async_fetch_all.call_count == 1
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=11))
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 1
+
+        client.async_probe.return_value = "fp-2"
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=22))
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 2
+
+        await coordinator.async_refresh()
+        assert client.async_fetch_all.call_count == 3
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+    assert coordinator.probe_diagnostics()["probes"] == 2
+    assert coordinator.probe_diagnostics()["unchanged"] == 1
+
+
+async def test_daily_refresh_is_prewarmed(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test the scheduler pre-warms the client a few seconds before the daily refresh."""
+    refresh_at = (dt_util.now() + timedelta(hours=2)).replace(second=0, microsecond=0)
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            "schedule_time": refresh_at.strftime("%H:%M"),
+            "schedule_jitter_minutes": 0,
+            "min_refresh_spacing_seconds": 0,
+        },
+    )
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_prewarm = AsyncMock(return_value=True)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+                "by_slug": {"student-123": {"homework": [], "behavior": []}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 1
+
+        async_fire_time_changed(hass, refresh_at - timedelta(seconds=10))
+        await hass.async_block_till_done()
+        assert client.async_prewarm.await_count == 1
+        assert client.async_fetch_all.call_count == 1
+
+        async_fire_time_changed(hass, refresh_at)
+        await hass.async_block_till_done()
+        assert client.async_fetch_all.call_count == 2
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_cache_stores_names_once(hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage):
+    """Test the saved cache keeps repeated names in a symbol list and loads back to the same data."""
+    mock_config_entry.add_to_hass(hass)
+    behavior = [{"lesson": n, "subject": "Mathematics", "reporter": "Teacher A"} for n in range(3)]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.symbols = SymbolTable()
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"homework": [], "behavior": behavior}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    cached = hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.cache"]["data"]
+    assert sorted(cached["symbols"]) == ["Mathematics", "Teacher A"]
+    behavior = cached["data"]["by_slug"]["test_student"]["behavior"]
+    assert behavior["$refs"] == ["reporter", "subject"]
+    assert [item["subject"] for item in behavior["$rows"]] == [cached["symbols"].index("Mathematics")] * 3
+    assert coordinator.decode_cached_data(cached) == coordinator.data
+    legacy = {"data": coordinator.data}
+    assert coordinator.decode_cached_data(legacy) is coordinator.data
+
+
+async def test_columnar_lessons_history(hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage):
+    """Test lessons history is stored as columns, queried by the service and cached as rows."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"lessons_history_columnar": True})
+    history = [
+        {"lesson_date": f"2025-01-0{day}T00:00:00", "lesson": 1, "took_place": day != 6, "subject_name": subject}
+        for day, subject in ((5, "Mathematics"), (6, "Mathematics"), (7, "English"))
+    ]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.symbols = SymbolTable()
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"lessons_history": history}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "query_lessons_history",
+            {"subject": "Mathematics", "end": "2025-01-07", "limit": 1},
+            blocking=True,
+            return_response=True,
+        )
+
+    stored = coordinator.data["by_slug"]["test_student"]["lessons_history"]
+    assert isinstance(stored, LessonsHistoryColumns)
+    assert coordinator.lessons_history("test_student") is stored
+    result = response["students"]["test_student"]
+    assert result["count"] == 2
+    assert result["by_subject"] == {"Mathematics": {"lessons": 2, "took_place": 1, "cancelled": 1}}
+    assert [row["lesson_date"] for row in result["lessons"]] == ["2025-01-06T00:00:00"]
+    cached = hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.cache"]["data"]
+    assert len(cached["data"]["by_slug"]["test_student"]["lessons_history"]["$rows"]) == 3
+
+
+async def test_history_retention_archives_old_records(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage
+):
+    """Test records older than the retention window move to the archive and stay queryable."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={"history_retention_days": 30, "min_refresh_spacing_seconds": 0}
+    )
+    today = dt_util.now().date()
+    history = [
+        {"lesson_date": f"{today - timedelta(days=days)}T00:00:00", "lesson": 1, "subject_name": "Mathematics"}
+        for days in (200, 100, 5)
+    ]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.symbols = SymbolTable()
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            side_effect=lambda: {
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"lessons_history": [dict(it) for it in history]}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+        assert coordinator.data["by_slug"]["test_student"]["lessons_history"] == [history[2]]
+        assert coordinator.archived_count("test_student", "lessons_history") == 2
+        archive = hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.archive"]["data"]
+        assert len(archive["segments"]["test_student"]["lessons_history"]) == 2
+        state = hass.states.get("sensor.mashov_test_student_lessons_history")
+        assert state.state == "3"
+        assert state.attributes["archived_items"] == 2
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "get_history",
+            {"data_key": "lessons_history", "start": str(today - timedelta(days=150))},
+            blocking=True,
+            return_response=True,
+        )
+        result = response["students"]["test_student"]
+        assert result["count"] == 2
+        assert [it["lesson_date"] for it in result["items"]] == [history[2]["lesson_date"], history[1]["lesson_date"]]
+
+        # Same records on the next fetch: the archive isn't written again
+        with patch.object(coordinator._archive_store, "async_save", AsyncMock()) as save:
+            await coordinator.async_refresh()
+        assert not save.called
+        assert coordinator.archived_count("test_student", "lessons_history") == 2
+
+        # The calendar reads archived lessons for ranges before the hot window
+        events = await hass.services.async_call(
+            "calendar",
+            "get_events",
+            {
+                "entity_id": "calendar.mashov_test_student_calendar",
+                "start_date_time": str(today - timedelta(days=250)),
+                "end_date_time": str(today),
+            },
+            blocking=True,
+            return_response=True,
+        )
+        starts = [ev["start"] for ev in events["calendar.mashov_test_student_calendar"]["events"]]
+        assert starts == [str(today - timedelta(days=days)) for days in (200, 100, 5)]
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_outage_after_restart_keeps_cached_data(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage
+):
+    """Test endpoints left out by an outage keep the cached data instead of being emptied."""
+    mock_config_entry.add_to_hass(hass)
+    grades = [{"gradingEventId": 1, "subjectName": "Mathematics", "grade": 90}]
+    holidays = [{"id": 1, "name": "Pesach", "start": "2025-04-12", "end": "2025-04-20"}]
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.cache"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}.cache",
+        "data": {
+            "last_refresh_ts": time.time(),
+            "data": {
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"grades": grades, "homework": []}},
+                "holidays": holidays,
+            },
+        },
+    }
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.symbols = SymbolTable()
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        # The grades and holidays endpoints are unavailable, so the client leaves them out
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "test_student"}],
+                "by_slug": {"test_student": {"homework": [{"lesson_id": 1}]}},
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        await coordinator.async_refresh()
+        await coordinator.async_save_cache()
+
+        group = coordinator.data["by_slug"]["test_student"]
+        assert group["grades"] == grades
+        assert group["homework"] == [{"lesson_id": 1}]
+        assert coordinator.data["holidays"] == holidays
+        cached = hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.cache"]["data"]
+        assert coordinator.decode_cached_data(cached)["by_slug"]["test_student"]["grades"] == grades
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+@pytest.fixture
+async def mashov_stub(hass: HomeAssistant, aiohttp_server, socket_enabled, monkeypatch, mock_config_entry):
+    """Point the config entry at a stub Mashov server and yield its state."""
+    for budget in (rate_limiter.BUDGET_LOGIN, rate_limiter.BUDGET_DATA):
+        monkeypatch.setitem(rate_limiter._BUCKETS, budget, rate_limiter.TokenBucket(1000, 1000))
+    state = MashovStubServer()
+    server = await aiohttp_server(state.make_app())
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={CONF_API_BASE: str(server.make_url("/api/"))})
+    yield state
+
+
+async def test_rejected_relogin_starts_reauth(hass: HomeAssistant, mock_config_entry: MockConfigEntry, mashov_stub):
+    """Test a 401 whose re-login is rejected fails the refresh with an auth error instead of serving old data."""
+    state = mashov_stub
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+    assert coordinator.last_update_success
+    assert state.logins == 1
+
+    state.expire_session = True
+    state.reject_logins = True
+    coordinator.refresh_arbiter.min_spacing = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert isinstance(coordinator.last_exception, ConfigEntryAuthFailed)
+    assert state.logins == 2
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_rejected_restored_session_and_password_start_reauth(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, mashov_stub, hass_storage
+):
+    """Test a restored session Mashov rejects, followed by a rejected login, asks for new credentials."""
+    state = mashov_stub
+    state.reject_logins = True
+    api_base = mock_config_entry.options[CONF_API_BASE]
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={**mock_config_entry.options, "schedule_type": "interval"}
+    )
+    students = [{"id": "stub-student-1", "name": "Stub Student", "slug": "stub_student"}]
+    _seed_cache(hass_storage, mock_config_entry, {"students": students, "by_slug": {"stub_student": {"homework": []}}})
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}.session"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}.session",
+        "data": {
+            "api_base": api_base,
+            "school_id": 123456,
+            "year": 2024,
+            "username": "test_user",
+            "csrf_token": "revoked-token",
+            "cookies": [],
+            "children": state.children,
+        },
+    }
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    startup = hass.data[DOMAIN][mock_config_entry.entry_id]["startup"]
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    assert hass.data[DOMAIN][mock_config_entry.entry_id]["client"].session_restored
+    assert startup["refresh"] == "auth_failed"
+    assert "next_retry_seconds" not in startup
+    assert state.logins == 1
+    assert coordinator.data["by_slug"]["stub_student"]["homework"] == []
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_adaptive_schedule_replans_when_idle_and_after_manual_refresh(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+):
+    """Test adaptive mode keeps planning through a long holiday and after refresh_now."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"schedule_type": "adaptive"})
+    today = dt_util.now().date()
+    students = [{"id": "student-123", "name": "Test Student", "slug": "student-123"}]
+    holidays = [
+        {"id": 1, "name": "Strike", "start": today.isoformat(), "end": (today + timedelta(days=60)).isoformat()}
+    ]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.symbols = SymbolTable()
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_prewarm = AsyncMock(return_value=True)
+        client.async_fetch_all = AsyncMock(
+            return_value={"students": students, "by_slug": {"student-123": {}}, "holidays": holidays}
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        assert coordinator.next_adaptive_fire() is None
+        coordinator.update_interval = None  # only the adaptive timers may refresh
+        coordinator.refresh_arbiter.min_spacing = 0
+
+        planned: dict[str, Any] = {"next": None}
+        with patch.object(coordinator, "next_adaptive_fire", side_effect=lambda: planned["next"]):
+            # Nothing ahead: planned again a day later instead of never
+            first = dt_util.utcnow() + timedelta(hours=36)
+            planned["next"] = first
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=24, seconds=1))
+            await hass.async_block_till_done()
+            fetches = client.async_fetch_all.await_count
+            planned["next"] = None
+            async_fire_time_changed(hass, first + timedelta(minutes=1))
+            await hass.async_block_till_done()
+            assert client.async_fetch_all.await_count == fetches + 1
+
+            # A manual refresh plans again with its data
+            second = dt_util.utcnow() + timedelta(days=3)
+            planned["next"] = second
+            await hass.services.async_call(
+                DOMAIN, "refresh_now", {"entry_id": mock_config_entry.entry_id}, blocking=True
+            )
+            await hass.async_block_till_done()
+            assert client.async_fetch_all.await_count == fetches + 2
+            planned["next"] = None
+            async_fire_time_changed(hass, second + timedelta(minutes=1))
+            await hass.async_block_till_done()
+            assert client.async_fetch_all.await_count == fetches + 3
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
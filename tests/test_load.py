@@ -0,0 +1,33 @@
+"""Test the end-to-end load harness against the stub Mashov server."""
+
+from benchmarks.load import run_load
+
+
+async def test_run_load_with_faults(socket_enabled):
+    """Test many clients complete every refresh despite injected errors and session expiry."""
+    report = await run_load(
+        entries=4,
+        students=2,
+        rounds=2,
+        latency=0.0,
+        latency_jitter=0.0,
+        error_rate=0.05,
+        session_ttl=0.05,
+        payload_scale=0.1,
+    )
+
+    assert report["refreshes"] == 8
+    assert report["failed_refreshes"] == 0
+    assert report["requests"] >= 8 * (2 * 6 + 1)
+    assert report["logins"] >= 4
+    assert report["refresh_latency_ms"]["p95"] is not None
+    assert set(report["endpoint_latency_ms"]) >= {"login", "homework", "holidays"}
+
+
+async def test_run_load_prewarm_reports_ttfb(socket_enabled):
+    """Test pre-warmed rounds report time to first byte for warm refreshes."""
+    report = await run_load(entries=2, students=1, rounds=2, latency=0.0, latency_jitter=0.0, prewarm=True)
+
+    assert report["meta"]["prewarm"] is True
+    assert report["ttfb_ms"]["warm"]["p50"] is not None
+    assert "cold" not in report["ttfb_ms"]
@@ -0,0 +1,277 @@
+"""Test Mashov client resilience against a fault-injecting stub server."""
+
+import pytest
+
+from benchmarks.stub_server import MashovStubServer
+from custom_components.mashov import rate_limiter
+from custom_components.mashov.mashov_client import CircuitBreaker, MashovAuthError, MashovClient, _backoff_delay
+
+TEST_GRADES = [{"gradingEventId": 1, "grade": 90, "subjectName": "Mathematics"}]
+
+
+@pytest.fixture
+async def stub(aiohttp_server, socket_enabled, monkeypatch):
+    """Start a stub Mashov server and yield (server state, client)."""
+    # Keep the shared rate limits out of the way of fault-injection timing
+    for budget in (rate_limiter.BUDGET_LOGIN, rate_limiter.BUDGET_DATA):
+        monkeypatch.setitem(rate_limiter._BUCKETS, budget, rate_limiter.TokenBucket(1000, 1000))
+    state = MashovStubServer(payloads={"grades": TEST_GRADES})
+    server = await aiohttp_server(state.make_app())
+    client = MashovClient(
+        school_id="123456",
+        year=2024,
+        username="test_user",
+        password="test_password",
+        api_base=str(server.make_url("/api/")),
+    )
+    client.retry_base_delay = 0.001
+    client.retry_max_delay = 0.01
+    await client.async_init(None)
+    yield state, client
+    await client.async_close()
+
+
+def _grades(data):
+    return data["by_slug"][data["students"][0]["slug"]]["grades"]
+
+
+def test_backoff_delay_grows_and_is_capped():
+    """Test backoff delay is jittered within [d/2, d] and capped."""
+    for attempt in range(6):
+        delay = _backoff_delay(attempt, base=1.0, cap=8.0)
+        full = min(8.0, 2**attempt)
+        assert full / 2 <= delay <= full
+
+
+def test_circuit_breaker_transitions(freezer):
+    """Test breaker opens after threshold, half-opens after timeout and closes on success."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("HTTP 503")
+    assert breaker.allow()
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    freezer.tick(61)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == "open"
+
+    freezer.tick(61)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.as_dict()["open_count"] == 2
+
+
+def test_half_open_breaker_lets_one_probe_through(freezer):
+    """Test only one caller probes a half-open endpoint; the rest are short-circuited until it resolves."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("HTTP 503")
+    freezer.tick(61)
+
+    assert [breaker.allow() for _ in range(3)] == [True, False, False]
+    assert breaker.state == "half_open"
+    assert breaker.short_circuited == 2
+
+    # A probe that never reports back is replaced after another reset timeout
+    freezer.tick(61)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+async def test_transient_errors_are_retried(stub):
+    """Test a few 503s are retried with backoff and the data still arrives."""
+    state, client = stub
+    state.fail_next["grades"] = 2
+
+    data = await client.async_fetch_all()
+
+    assert _grades(data) == TEST_GRADES
+    assert state.requests["grades"] == 3
+    assert client.resilience_diagnostics()["breakers"]["grades"]["state"] == "closed"
+    metrics = client.metrics_diagnostics()["endpoints"]["grades"]
+    assert metrics["statuses"] == {"200": 1, "503": 2}
+    assert metrics["bytes"] > 0
+    assert metrics["p95_ms"] is not None
+
+
+async def test_outage_leaves_key_out_and_opens_circuit(stub):
+    """Test an unavailable endpoint is left out of the result and stops being hit once open."""
+    state, client = stub
+    assert _grades(await client.async_fetch_all()) == TEST_GRADES
+
+    state.down.add("grades")
+    for _ in range(3):
+        data = await client.async_fetch_all()
+        group = data["by_slug"][data["students"][0]["slug"]]
+        assert "grades" not in group
+        assert "homework" in group
+    assert client.resilience_diagnostics()["breakers"]["grades"]["state"] == "open"
+
+    calls = state.requests["grades"]
+    await client.async_fetch_all()
+    assert state.requests["grades"] == calls
+    assert client.resilience_diagnostics()["breakers"]["grades"]["short_circuited"] == 1
+
+
+async def test_expired_session_relogs_once(stub):
+    """Test parallel 401s after session expiry trigger a single re-login."""
+    state, client = stub
+    assert state.logins == 1
+    state.expire_session = True
+
+    data = await client.async_fetch_all()
+
+    assert _grades(data) == TEST_GRADES
+    assert state.logins == 2
+
+
+async def test_rejected_relogin_raises_auth_error(stub):
+    """Test a re-login with rejected credentials raises once for the whole burst of 401s."""
+    state, client = stub
+    state.expire_session = True
+    state.reject_logins = True
+
+    with pytest.raises(MashovAuthError):
+        await client.async_fetch_all()
+
+    # Waiters behind the failed re-login get its error instead of sending the credentials again
+    assert state.logins == 2
+    assert {br["state"] for br in client.resilience_diagnostics()["breakers"].values()} == {"closed"}
+
+    # The next refresh tries the credentials again, once
+    with pytest.raises(MashovAuthError):
+        await client.async_fetch_all()
+    assert state.logins == 3
+
+
+def _client_like(client):
+    """A fresh client with the same credentials, as after a Home Assistant restart."""
+    new = MashovClient(
+        school_id="123456",
+        year=2024,
+        username="test_user",
+        password="test_password",
+        api_base=client._api_base,
+    )
+    new.retry_base_delay = 0.001
+    return new
+
+
+async def test_restored_session_skips_login(stub):
+    """Test a persisted session is reused without logging in again."""
+    state, client = stub
+    saved = client.session_state()
+    restarted = _client_like(client)
+
+    assert await restarted.async_restore_session(saved)
+    data = await restarted.async_fetch_all()
+    await restarted.async_close()
+
+    assert _grades(data) == TEST_GRADES
+    assert state.logins == 1
+    assert restarted.resilience_diagnostics()["session_restored"]
+
+
+async def test_restored_session_logs_in_on_401(stub):
+    """Test an expired persisted session falls back to one real login and is saved again."""
+    state, client = stub
+    saved = client.session_state()
+    state.expire_session = True
+    restarted = _client_like(client)
+    saves = []
+    restarted.on_session_change = lambda: saves.append(restarted.session_state())
+
+    assert await restarted.async_restore_session(saved)
+    data = await restarted.async_fetch_all()
+    await restarted.async_close()
+
+    assert _grades(data) == TEST_GRADES
+    assert state.logins == 2
+    assert len(saves) == 1
+    assert saves[0]["csrf_token"] != saved["csrf_token"]
+
+
+async def test_restore_session_rejects_other_credentials(stub):
+    """Test a persisted session is ignored when the credentials changed."""
+    _, client = stub
+    saved = {**client.session_state(), "username": "someone_else"}
+    restarted = _client_like(client)
+
+    assert not await restarted.async_restore_session(saved)
+    assert not await restarted.async_restore_session(None)
+    assert not restarted.session_restored
+
+
+async def test_search_schools(stub):
+    """Test school search resolves against the stub schools endpoint."""
+    _, client = stub
+
+    schools = await client.async_search_schools("לבדיקה")
+
+    assert schools == [{"semel": 123456, "name": "בית ספר לבדיקה", "city": None}]
+
+
+async def test_partial_fetch_hits_only_requested_endpoints(stub):
+    """Test a partial fetch requests only the given data keys for the given students."""
+    state, client = stub
+    slug = client._students[0]["slug"]
+
+    partial = await client.async_fetch_partial([slug], ["grades", "holidays"])
+
+    assert partial["by_slug"] == {slug: {"grades": TEST_GRADES}}
+    assert partial["holidays"] == []
+    assert state.requests["grades"] == 1
+    assert state.requests["holidays"] == 1
+    assert state.requests["homework"] == state.requests["timetable"] == 0
+
+
+async def test_probe_fingerprint_tracks_homework(stub):
+    """Test the change probe requests only homework/behavior and its fingerprint follows their content."""
+    state, client = stub
+
+    first = await client.async_probe()
+    assert await client.async_probe() == first
+    assert state.requests["homework"] == state.requests["behavior"] == 2
+    assert state.requests["grades"] == state.requests["lessons_history"] == 0
+
+    state.payloads["homework"] = [{"lessonId": 1, "homework": "Page 10"}]
+    state._bodies.clear()
+    assert await client.async_probe() != first
+    assert "probe.homework" in client.metrics_diagnostics()["endpoints"]
+
+
+async def test_prewarm_relogs_expired_session_ahead_of_refresh(stub):
+    """Test a pre-warm re-logs in on 401 so the following refresh runs warm without logging in."""
+    state, client = stub
+    state.expire_session = True
+
+    assert await client.async_prewarm() is True
+    assert state.logins == 2
+
+    data = await client.async_fetch_all()
+
+    assert _grades(data) == TEST_GRADES
+    assert state.logins == 2
+    ttfb = client.metrics_diagnostics()["ttfb"]
+    assert ttfb["prewarm"]["count"] == 1
+    assert ttfb["warm"]["count"] == 7
+    assert "cold" not in ttfb
+
+
+async def test_repeated_names_share_one_object(stub):
+    """Test names repeated across items and refreshes are interned into the entry's symbol table."""
+    state, client = stub
+    state.payloads["behavior"] = [
+        {"lessonId": n, "subject": "Mathematics", "reporter": "Teacher A", "achvaName": "Late"} for n in range(3)
+    ]
+
+    behavior = (await client.async_fetch_all())["by_slug"][client._students[0]["slug"]]["behavior"]
+    again = (await client.async_fetch_all())["by_slug"][client._students[0]["slug"]]["behavior"]
+
+    assert behavior[0]["subject"] is behavior[2]["subject"] is again[1]["subject"]
+    assert behavior[0]["reporter"] is again[0]["reporter"]
+    assert _grades(await client.async_fetch_all())[0]["subjectName"] is client.symbols.intern("Mathematics")
@@ -0,0 +1,39 @@
+"""Test Mashov request metrics."""
+
+from custom_components.mashov.metrics import EndpointMetrics, RequestMetrics, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_endpoint_metrics_rolling_window():
+    """Test counters are cumulative while latencies roll over the window."""
+    metrics = EndpointMetrics(window=3)
+    for latency in (1.0, 1.0, 1.0, 0.2, 0.2, 0.2):
+        metrics.record(latency, 200, 10)
+    metrics.record(0.1, None)
+
+    summary = metrics.summary()
+    assert summary["requests"] == 7
+    assert summary["errors"] == 1
+    assert summary["statuses"] == {"200": 6}
+    assert summary["bytes"] == 60
+    assert summary["p95_ms"] == 200.0
+    assert summary["last_ms"] == 100.0
+
+
+def test_request_metrics_totals():
+    """Test totals aggregate every endpoint."""
+    metrics = RequestMetrics()
+    metrics.record("homework", 0.1, 200, 100)
+    metrics.record("grades", 0.3, 503, 20)
+
+    summary = metrics.summary()
+    assert summary["totals"] == {"requests": 2, "errors": 0, "bytes": 120, "p95_ms": 300.0}
+    assert summary["endpoints"]["grades"]["statuses"] == {"503": 1}
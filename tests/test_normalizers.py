@@ -0,0 +1,120 @@
+"""Test the spec-driven endpoint normalizers."""
+
+import json
+from pathlib import Path
+
+from benchmarks.generator import generate_dataset
+from benchmarks.legacy_normalizers import LegacyNormalizers
+from custom_components.mashov import converters
+from custom_components.mashov.mashov_client import MashovClient
+from custom_components.mashov.normalizers import SPECS, normalize_rows, render_converters
+from custom_components.mashov.symbols import SymbolTable
+
+HOMEWORK = {"lessonId": 1, "lessonDate": "2025-01-05T00:00:00", "homework": "Page 10", "subjectName": "Mathematics"}
+
+
+def test_converters_match_specs():
+    """Test the checked-in converters are what the current specs render to."""
+    assert render_converters() == Path(converters.__file__).read_text(encoding="utf-8")
+
+
+def test_specs_match_legacy_normalizers():
+    """Test every endpoint produces the rows the hand-written normalizers did."""
+    dataset = json.loads(json.dumps(generate_dataset(students=1, seed=7)))
+    legacy = LegacyNormalizers(SymbolTable())
+    symbols = SymbolTable()
+    for key in SPECS:
+        raw = dataset["holidays"] if key == "holidays" else dataset["students"][0][key]
+        expected = getattr(legacy, f"_normalize_{key}")(json.loads(json.dumps(raw)))
+        items, dropped = normalize_rows(key, raw, symbols)
+        assert items == expected, key
+        assert dropped == 0
+
+
+def test_specs_build_endpoint_rows():
+    """Test each kind of spec source: plain, nested, first-of and callable; grades kept as-is."""
+    symbols = SymbolTable()
+    items, dropped = normalize_rows("homework", [{**HOMEWORK, "groupId": 7, "extra": 1}], symbols)
+    assert dropped == 0
+    assert items == [
+        {
+            "lesson_id": 1,
+            "lesson_date": "2025-01-05T00:00:00",
+            "lesson": None,
+            "homework": "Page 10",
+            "group_id": 7,
+            "remark": None,
+            "student_guid": None,
+            "subject_name": "Mathematics",
+        }
+    ]
+
+    history = [
+        {"lessonLog": {"lessonID": 5, "tookPlace": True, "homeWork": "Ex 3"}, "groupName": "Math 1"},
+        {"lessonLog": None, "subjectName": "History"},
+    ]
+    items, _ = normalize_rows("lessons_history", history, symbols)
+    assert list(items[0]) == [
+        "lesson_id",
+        "group_id",
+        "lesson_date",
+        "lesson",
+        "took_place",
+        "remark",
+        "homework",
+        "lessontype",
+        "reporter_guid",
+        "group_name",
+        "subject_name",
+    ]
+    assert (items[0]["lesson_id"], items[0]["took_place"], items[0]["homework"]) == (5, True, "Ex 3")
+    assert (items[0]["group_name"], items[0]["subject_name"]) == ("Math 1", None)
+    assert items[1] == dict.fromkeys(items[0]) | {"subject_name": "History"}
+
+    holidays = [
+        {"id": 1, "hollyDayName": "Pesach", "holidayName": "x", "startDate": "a", "endDate": "b"},
+        {"id": 2, "hollyDayName": "", "name": "Sukkot"},
+        {"id": 3, "holidayName": ""},
+    ]
+    items, _ = normalize_rows("holidays", holidays, symbols)
+    assert [it["name"] for it in items] == ["Pesach", "Sukkot", None]
+    assert items[0] == {"id": 1, "name": "Pesach", "start": "a", "end": "b"}
+
+    teacher = {"teacherName": "Dana"}
+    timetable = [{"timeTable": {"day": 1}, "groupDetails": {"subjectName": "Math", "groupTeachers": [teacher]}}, {}]
+    items, _ = normalize_rows("timetable", timetable, symbols)
+    assert items == [
+        {"timeTable": {"day": 1}, "groupDetails": {"subjectName": "Math", "groupTeachers": [teacher]}},
+        {"timeTable": {}, "groupDetails": {}},
+    ]
+
+    grades = [{"grade": 90, "subjectName": "Math"}]
+    assert normalize_rows("grades", grades, symbols) == (grades, 0)
+
+
+def test_malformed_rows_are_dropped_and_counted():
+    """Test a bad row is dropped on its own and the rows after it are kept."""
+    client = MashovClient(school_id="123456", year=2025, username="u", password="p")
+    raw = [HOMEWORK, None, "oops", {**HOMEWORK, "lessonId": 2}]
+    items = client._normalize("homework", raw)
+    assert [it["lesson_id"] for it in items] == [1, 2]
+
+    history = [{"lessonLog": {"lessonID": 1}}, {"lessonLog": ["bad"]}, {"groupName": "Math 1"}]
+    assert [it["lesson_id"] for it in client._normalize("lessons_history", history)] == [1, None]
+    assert client.metrics_diagnostics()["dropped_rows"] == {"homework": 2, "lessons_history": 1}
+
+
+def test_container_unwrapping_and_interning():
+    """Test wrapped payloads unwrap the same way for every endpoint and names are shared."""
+    symbols = SymbolTable()
+    for raw in ([HOMEWORK], {"items": [HOMEWORK]}, {"data": [HOMEWORK]}):
+        items, _ = normalize_rows("homework", raw, symbols)
+        assert items[0]["subject_name"] == "Mathematics"
+        assert items[0]["subject_name"] is symbols.intern("Mathematics")
+    assert normalize_rows("grades", {"data": [{"grade": 90}]}, symbols) == ([{"grade": 90}], 0)
+    assert normalize_rows("timetable", "error", symbols) == ([], 0)
+
+    # Unhashable names aren't interned but keep their row
+    items, dropped = normalize_rows("homework", [{**HOMEWORK, "subjectName": ["Mathematics"]}], symbols)
+    assert items[0]["subject_name"] == ["Mathematics"]
+    assert dropped == 0
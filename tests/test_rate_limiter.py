@@ -0,0 +1,62 @@
+"""Test the shared Mashov rate limiter."""
+
+from custom_components.mashov.const import (
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_LOGINS_PER_MINUTE,
+    CONF_RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+from custom_components.mashov.rate_limiter import (
+    BUDGET_DATA,
+    BUDGET_LOGIN,
+    TokenBucket,
+    configure_rate_limits,
+    rate_limit_diagnostics,
+)
+
+
+def test_reserve_spaces_callers_after_burst(freezer):
+    """Test the burst is served immediately and later callers queue at 1/rate."""
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    freezer.tick(1.0)
+    assert bucket.reserve() == 0.5
+
+
+def test_refill_is_capped_at_capacity(freezer):
+    """Test idle time never accumulates more than capacity tokens."""
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.reserve()
+    freezer.tick(60)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+async def test_acquire_records_queue_metrics():
+    """Test acquire waits when empty and records queueing delay."""
+    bucket = TokenBucket(rate=200, capacity=1)
+    waits = [await bucket.acquire() for _ in range(3)]
+
+    assert waits[0] == 0.0
+    stats = bucket.as_dict()
+    assert stats["acquired"] == 3
+    assert stats["delayed"] >= 1
+    assert stats["max_wait"] <= 0.01
+
+
+def test_configure_rate_limits_from_yaml():
+    """Test YAML options configure the shared budgets and missing keys restore defaults."""
+    configure_rate_limits(
+        {
+            CONF_RATE_LIMIT_LOGINS_PER_MINUTE: 3,
+            CONF_RATE_LIMIT_REQUESTS_PER_SECOND: 2,
+            CONF_RATE_LIMIT_BURST: 4,
+        }
+    )
+    try:
+        stats = rate_limit_diagnostics()
+        assert stats[BUDGET_LOGIN]["rate_per_second"] == 0.05
+        assert stats[BUDGET_DATA]["rate_per_second"] == 2
+        assert stats[BUDGET_DATA]["capacity"] == 4
+    finally:
+        configure_rate_limits(None)
+    assert rate_limit_diagnostics()[BUDGET_DATA]["rate_per_second"] == 10
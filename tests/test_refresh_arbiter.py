@@ -0,0 +1,144 @@
+"""Test the per-entry refresh arbiter."""
+
+import asyncio
+
+import pytest
+
+from custom_components.mashov.refresh_arbiter import RefreshArbiter
+
+
+async def test_overlapping_requests_share_one_fetch():
+    """Test requests arriving while a fetch runs get that fetch's result."""
+    arbiter = RefreshArbiter()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"n": calls}
+
+    waiters = [asyncio.create_task(arbiter.async_run(fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert results[0] is results[1] is results[2]
+    assert arbiter.as_dict() == {
+        "min_spacing_seconds": 0.0,
+        "requests": 3,
+        "fetches": 1,
+        "coalesced": 2,
+        "spaced": 0,
+        "partial": 0,
+        "in_flight": False,
+    }
+
+
+async def test_waiters_share_the_failure():
+    """Test every waiter of a failed fetch sees its exception, and a failure doesn't start the spacing."""
+    arbiter = RefreshArbiter(min_spacing=60)
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("down")
+
+    waiters = [asyncio.create_task(arbiter.async_run(fail, latest={})) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def ok():
+        return {"ok": True}
+
+    assert await arbiter.async_run(ok, latest={}) == {"ok": True}
+    assert arbiter.fetches == 2
+
+
+async def test_min_spacing_reuses_latest(freezer):
+    """Test requests within min_spacing of a successful fetch return the latest data without fetching."""
+    arbiter = RefreshArbiter(min_spacing=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await arbiter.async_run(fetch, latest=None) == 1
+    freezer.tick(30)
+    assert await arbiter.async_run(fetch, latest=1) == 1
+    freezer.tick(31)
+    assert await arbiter.async_run(fetch, latest=1) == 2
+    assert (arbiter.fetches, arbiter.spaced) == (2, 1)
+
+
+async def test_cancelled_waiter_does_not_cancel_fetch():
+    """Test a cancelled caller leaves the shared fetch running for the others."""
+    arbiter = RefreshArbiter()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "data"
+
+    first = asyncio.create_task(arbiter.async_run(fetch))
+    second = asyncio.create_task(arbiter.async_run(fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+    assert await second == "data"
+
+
+async def test_partial_fetches_never_overlap_a_full_fetch():
+    """Test a partial fetch during a full one is answered by it, and a full fetch waits for a running partial."""
+    arbiter = RefreshArbiter()
+    events = []
+    release = asyncio.Event()
+
+    async def full():
+        events.append("full")
+        await release.wait()
+        return "full"
+
+    async def partial():
+        events.append("partial start")
+        await release.wait()
+        events.append("partial end")
+        return "partial"
+
+    running = asyncio.create_task(arbiter.async_run(full))
+    await asyncio.sleep(0)
+    joined = asyncio.create_task(arbiter.async_run_partial(partial))
+    await asyncio.sleep(0)
+    release.set()
+    assert await running == "full"
+    assert await joined is None
+    assert events == ["full"]
+
+    release.clear()
+    events.clear()
+    first = asyncio.create_task(arbiter.async_run_partial(partial))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(arbiter.async_run(full))
+    await asyncio.sleep(0)
+    release.set()
+    assert await first == "partial"
+    assert await waiting == "full"
+    assert events == ["partial start", "partial end", "full"]
+
+
+def test_record_partial():
+    """Test partial refresh requests are counted as partial fetches or coalesced into a full fetch."""
+    arbiter = RefreshArbiter()
+
+    arbiter.record_partial(coalesced=False)
+    arbiter.record_partial(coalesced=True)
+
+    assert (arbiter.requests, arbiter.partial, arbiter.coalesced, arbiter.fetches) == (2, 1, 1, 0)
@@ -0,0 +1,64 @@
+"""Test the history retention window helpers."""
+
+from datetime import date
+
+from custom_components.mashov.retention import (
+    hot_cutoffs,
+    in_range,
+    retention_policy,
+    segment_digest,
+    segment_totals,
+    split_hot_cold,
+)
+
+ITEMS = [
+    {"lesson_date": "2025-01-05T00:00:00", "lesson": 1},
+    {"lesson_date": None, "lesson": 2},
+    {"lesson_date": "2025-03-01T00:00:00", "lesson": 3},
+    {"lesson_date": "2024-12-31T00:00:00", "lesson": 4},
+]
+
+
+def test_retention_policy():
+    """Test one number applies to every history key and a mapping sets days per key."""
+    assert retention_policy(0) == {}
+    assert retention_policy(None) == {}
+    assert retention_policy(30) == {"lessons_history": 30, "behavior": 30, "grades": 30}
+    assert retention_policy({"grades": 90, "behavior": 0, "homework": 5}) == {"grades": 90}
+    assert retention_policy("bad") == {}
+    assert hot_cutoffs({"grades": 10}, date(2025, 3, 11)) == {"grades": date(2025, 3, 1)}
+
+
+def test_split_hot_cold_and_range():
+    """Test the split keeps order and undated items hot, and range bounds are [start, end)."""
+    hot, cold = split_hot_cold(ITEMS, "lesson_date", date(2025, 1, 5))
+    assert [it["lesson"] for it in hot] == [1, 2, 3]
+    assert [it["lesson"] for it in cold] == [4]
+
+    assert [it["lesson"] for it in in_range(ITEMS, "lesson_date", date(2025, 1, 1), date(2025, 3, 1))] == [1]
+    assert [it["lesson"] for it in in_range(ITEMS, "lesson_date", None, date(2025, 1, 5))] == [4]
+    assert in_range(ITEMS, "lesson_date", None, None) == ITEMS
+
+
+def test_segment_digest_ignores_key_order():
+    """Test the digest changes with content but not with dict key order."""
+    assert segment_digest([{"a": 1, "b": 2}]) == segment_digest([{"b": 2, "a": 1}])
+    assert segment_digest([{"a": 1}]) != segment_digest([{"a": 2}])
+
+
+def test_segment_totals():
+    """Test archived segments keep distinct groups, distinct days and numeric grade totals."""
+    grades = [
+        {"eventDate": "2025-01-05T00:00:00", "subjectName": "Mathematics", "grade": 80},
+        {"eventDate": "2025-01-05T00:00:00", "subjectName": "History", "grade": "עובר"},
+        {"eventDate": "2025-01-07T00:00:00", "subjectName": "Mathematics", "grade": 90},
+        {"eventDate": None, "grade": 70},
+    ]
+    assert segment_totals("grades", grades) == {
+        "groups": ["Mathematics", "History", None],
+        "dates": 2,
+        "grade_sum": 240,
+        "grade_count": 3,
+    }
+    history = [{"lesson_date": "2025-01-05T00:00:00", "subject_name": None, "group_name": "Choir"}]
+    assert segment_totals("lessons_history", history) == {"groups": ["Choir"], "dates": 1}
@@ -0,0 +1,127 @@
+"""Test adaptive refresh planning."""
+
+from datetime import UTC, date, datetime, time, timedelta
+
+from custom_components.mashov.schedule_utils import (
+    DEFAULT_LESSONS_PER_DAY,
+    STAGGER_SECONDS,
+    adaptive_plan,
+    jitter_seconds,
+    lessons_per_day,
+    next_adaptive_fire,
+    shift_time,
+    stagger_offsets,
+)
+
+from .const import TEST_HOLIDAYS
+
+
+def _timetable(days, lessons):
+    return [{"timeTable": {"day": d, "lesson": n}, "groupDetails": {}} for d in days for n in range(1, lessons + 1)]
+
+
+def test_lessons_per_day_uses_timetable_or_default():
+    """Test the last lesson per weekday comes from the timetables, with a default before any fetch."""
+    assert lessons_per_day([_timetable([1, 2], 6), _timetable([2], 8)]) == {1: 6, 2: 8}
+    assert lessons_per_day([]) == DEFAULT_LESSONS_PER_DAY
+
+
+def test_school_day_polls_during_and_after_school_only():
+    """Test a school day is polled hourly in school, every 30 minutes after, rarely in the evening, never at night."""
+    # 2024-01-14 is a Sunday (Mashov day 1); six lessons end at 12:30
+    now = datetime(2024, 1, 14, 6, 0, tzinfo=UTC)
+    plan = adaptive_plan([_timetable([1], 6)], [], now)
+
+    times = [p["at"].strftime("%H:%M") for p in plan]
+    assert times == [
+        "08:30",
+        "09:30",
+        "10:30",
+        "11:30",
+        "12:30",
+        "13:00",
+        "13:30",
+        "14:00",
+        "14:30",
+        "15:00",
+        "15:30",
+        "17:30",
+        "19:30",
+    ]
+    assert {p["reason"] for p in plan} == {"school_hours", "after_school", "evening"}
+    assert all(time(7, 30) < p["at"].time() <= time(21, 0) for p in plan)
+    # Monday has no lessons in this timetable and Tuesday neither: nothing else planned
+    assert all(p["at"].date() == now.date() for p in plan)
+
+
+def test_weekends_and_holidays_are_skipped():
+    """Test no refresh on Shabbat or holidays except the evening before a school day."""
+    timetables = [_timetable([1, 2, 3, 4, 5], 7)]
+    # Saturday 2024-01-20; TEST_HOLIDAYS covers Saturday and Sunday 2024-01-21
+    now = datetime(2024, 1, 20, 8, 0, tzinfo=UTC)
+
+    plan = adaptive_plan(timetables, TEST_HOLIDAYS, now)
+
+    assert plan == [{"at": datetime(2024, 1, 21, 19, 0, tzinfo=UTC), "reason": "before_school_day"}]
+    assert next_adaptive_fire(timetables, TEST_HOLIDAYS, now) == plan[0]["at"]
+
+
+def test_plan_only_contains_future_times():
+    """Test refreshes already passed today are not planned."""
+    now = datetime(2024, 1, 14, 14, 10, tzinfo=UTC)
+    plan = adaptive_plan([_timetable([1], 6)], [], now)
+
+    assert plan[0]["at"] == datetime(2024, 1, 14, 14, 30, tzinfo=UTC)
+    assert next_adaptive_fire([_timetable([1], 6)], [], datetime(2024, 1, 14, 22, 0, tzinfo=UTC)) == datetime(
+        2024, 1, 20, 19, 0, tzinfo=UTC
+    )
+
+
+def test_next_fire_looks_past_long_holidays():
+    """Test a holiday ending anywhere within max_days is looked past, and a longer one gives None."""
+    timetables = [_timetable([1, 2, 3, 4, 5], 7)]
+    now = datetime(2025, 3, 25, 8, 0, tzinfo=UTC)
+    for end in (date(2025, 4, 10), date(2025, 4, 12), date(2025, 4, 15), date(2025, 4, 20)):
+        holidays = [{"start": "2025-03-25T00:00:00", "end": f"{end.isoformat()}T00:00:00", "name": "Pesach"}]
+        # The evening before the first Sunday-Thursday after the holiday
+        first_school_day = end + timedelta(days=1)
+        while first_school_day.weekday() in (4, 5):
+            first_school_day += timedelta(days=1)
+        expected = datetime.combine(first_school_day - timedelta(days=1), time(19, 0), tzinfo=UTC)
+        assert next_adaptive_fire(timetables, holidays, now) == expected, end
+
+    holidays = [{"start": "2025-03-25T00:00:00", "end": "2025-05-30T00:00:00", "name": "Strike"}]
+    assert next_adaptive_fire(timetables, holidays, now) is None
+
+
+def test_jitter_is_deterministic_and_spread_over_the_window():
+    """Test the per-entry offset is stable and installs spread evenly across the window."""
+    window = 600
+    assert jitter_seconds("entry-a", window) == jitter_seconds("entry-a", window)
+    assert jitter_seconds("entry-a", 0) == 0
+
+    offsets = [jitter_seconds(f"entry-{i}", window) for i in range(1000)]
+    assert all(0 <= o < window for o in offsets)
+    buckets = [0] * 10  # one per minute
+    for o in offsets:
+        buckets[o // 60] += 1
+    assert min(buckets) > 50
+    assert max(buckets) < 150
+
+
+def test_stagger_offsets_space_entries_apart():
+    """Test entries of one instance are at least STAGGER_SECONDS apart even when their jitter collides."""
+    ids = [f"entry-{i}" for i in range(5)]
+    offsets = stagger_offsets(dict.fromkeys(ids, 60))
+
+    ordered = sorted(offsets.values())
+    assert all(b - a >= STAGGER_SECONDS for a, b in zip(ordered, ordered[1:], strict=False))
+    assert offsets == stagger_offsets(dict.fromkeys(reversed(ids), 60))
+    assert stagger_offsets({"only": 0}) == {"only": 0}
+
+
+def test_shift_time_wraps_at_midnight():
+    """Test shifting a schedule time by the jitter offset."""
+    assert shift_time(14, 0, 0) == (14, 0, 0)
+    assert shift_time(14, 0, 437) == (14, 7, 17)
+    assert shift_time(23, 55, 600) == (0, 5, 0)
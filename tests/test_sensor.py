@@ -1,10 +1,16 @@
 """Test Mashov sensors."""
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.mashov.const import DOMAIN
+
 from .const import (
     TEST_BEHAVIOR,
     TEST_HOLIDAYS,
@@ -240,3 +246,255 @@ async def test_holidays_sensor(hass: HomeAssistant, mock_config_entry: MockConfi
     assert state is not None
     assert state.state == str(len(TEST_HOLIDAYS))
     assert state.attributes.get("items") == TEST_HOLIDAYS
+
+
+async def test_tomorrow_bag_sensor(hass: HomeAssistant, mock_config_entry: MockConfigEntry, freezer):
+    """Test tomorrow's bag sensor computes the next school day's lessons."""
+    # Saturday; next school day is Sunday (Mashov day 1)
+    freezer.move_to("2024-01-13 12:00:00")
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [
+                    {
+                        "id": "student-123",
+                        "name": "Test Student",
+                        "slug": "student-123",
+                        "year": "2024",
+                        "school_id": "123456",
+                    }
+                ],
+                "by_slug": {
+                    "student-123": {
+                        "homework": [],
+                        "behavior": [],
+                        "weekly_plan": [],
+                        "timetable": TEST_TIMETABLE,
+                        "lessons_history": [],
+                    }
+                },
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.mashov_test_student_tomorrow_bag")
+
+    assert state is not None
+    assert state.state == "2024-01-14"
+    assert state.attributes.get("is_tomorrow") is True
+    assert state.attributes.get("subjects") == ["Mathematics"]
+    assert state.attributes.get("teachers") == ["Test Teacher"]
+    assert state.attributes.get("lessons")[0]["lesson"] == 1
+
+
+async def test_grade_stats_sensor(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test grade average sensor is seeded from the first snapshot."""
+    mock_config_entry.add_to_hass(hass)
+
+    grades = [
+        {"gradingEventId": 1, "subjectName": "Mathematics", "grade": 90},
+        {"gradingEventId": 2, "subjectName": "History", "grade": 70},
+    ]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [
+                    {
+                        "id": "student-123",
+                        "name": "Test Student",
+                        "slug": "student-123",
+                        "year": "2024",
+                        "school_id": "123456",
+                    }
+                ],
+                "by_slug": {
+                    "student-123": {
+                        "homework": [],
+                        "behavior": [],
+                        "weekly_plan": [],
+                        "timetable": [],
+                        "lessons_history": [],
+                        "grades": grades,
+                    }
+                },
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.mashov_test_student_grade_average")
+
+    assert state is not None
+    assert float(state.state) == 80.0
+    assert state.attributes.get("state_class") == "measurement"
+    assert state.attributes.get("count") == 2
+    assert state.attributes.get("subjects")["Mathematics"]["mean"] == 90.0
+
+    # State and attributes are built from one stats lookup per update
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+    sensor = hass.data["entity_components"]["sensor"].get_entity("sensor.mashov_test_student_grade_average")
+    with patch.object(coordinator, "get_grade_stats", wraps=coordinator.get_grade_stats) as get_stats:
+        coordinator.async_set_updated_data(dict(coordinator.data))
+        await hass.async_block_till_done()
+        sensor.async_write_ha_state()
+    assert get_stats.call_count == 1
+    assert float(hass.states.get("sensor.mashov_test_student_grade_average").state) == 80.0
+
+
+async def test_grade_stats_follow_corrections(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test a corrected grade replaces its old value and a removed grade leaves the average."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"min_refresh_spacing_seconds": 0})
+
+    def snapshot(grades):
+        return {
+            "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+            "by_slug": {"student-123": {"grades": grades}},
+            "holidays": [],
+        }
+
+    first = [
+        {"gradingEventId": 1, "subjectName": "Mathematics", "grade": 60},
+        {"gradingEventId": 2, "subjectName": "History", "grade": 70},
+    ]
+    corrected = [{"gradingEventId": 1, "subjectName": "Mathematics", "grade": 90}]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(side_effect=[snapshot(first), snapshot(corrected)])
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert float(hass.states.get("sensor.mashov_test_student_grade_average").state) == 65.0
+
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        state = hass.states.get("sensor.mashov_test_student_grade_average")
+        assert float(state.state) == 90.0
+        assert state.attributes.get("count") == 1
+        assert list(state.attributes.get("subjects")) == ["Mathematics"]
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_grades_summary_counts_archived_grades(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test the grades summary and average include grades moved to the archive by retention."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(mock_config_entry, options={"history_retention_days": 30})
+    today = dt_util.now().date()
+    grades = [
+        {
+            "gradingEventId": 1,
+            "eventDate": f"{today - timedelta(days=100)}T00:00:00",
+            "subjectName": "History",
+            "grade": 60,
+        },
+        {
+            "gradingEventId": 2,
+            "eventDate": f"{today - timedelta(days=90)}T00:00:00",
+            "subjectName": "Mathematics",
+            "grade": 70,
+        },
+        {
+            "gradingEventId": 3,
+            "eventDate": f"{today - timedelta(days=5)}T00:00:00",
+            "subjectName": "Mathematics",
+            "grade": 95,
+        },
+    ]
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+                "by_slug": {"student-123": {"grades": grades}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        state = hass.states.get("sensor.mashov_test_student_grades")
+        assert state.state == "3"
+        assert state.attributes["archived_items"] == 2
+        assert state.attributes["formatted_summary"] == "יש 3 ציונים ב-2 מקצועות על פני 3 תאריכים, ממוצע: 75.0"
+        assert len(state.attributes["items"]) == 1
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_api_metric_sensors_disabled_by_default(hass: HomeAssistant, mock_config_entry: MockConfigEntry):
+    """Test API metric sensors are registered as disabled diagnostic entities."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(return_value={"students": [], "by_slug": {}, "holidays": []})
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    for key in ("api_latency", "api_requests", "api_bytes"):
+        entity_id = registry.async_get_entity_id("sensor", "mashov", f"mashov_{mock_config_entry.entry_id}_{key}")
+        assert entity_id is not None
+        entry = registry.async_get(entity_id)
+        assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+        assert entry.entity_category is EntityCategory.DIAGNOSTIC
+        assert hass.states.get(entity_id) is None
+
+
+async def test_adaptive_schedule_plan_attribute(hass: HomeAssistant, mock_config_entry: MockConfigEntry, freezer):
+    """Test adaptive mode exposes its next-fire plan on the list sensors."""
+    freezer.move_to("2024-01-14 06:00:00-08:00")  # Sunday morning, local time
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={"schedule_type": "adaptive", "schedule_jitter_minutes": 0}
+    )
+
+    with patch("custom_components.mashov.MashovClient") as mock_client:
+        client = mock_client.return_value
+        client.async_init = AsyncMock(return_value=None)
+        client.async_close = AsyncMock(return_value=None)
+        client.async_fetch_all = AsyncMock(
+            return_value={
+                "students": [{"id": "student-123", "name": "Test Student", "slug": "student-123"}],
+                "by_slug": {"student-123": {"timetable": TEST_TIMETABLE}},
+                "holidays": [],
+            }
+        )
+
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    attrs = hass.states.get("sensor.mashov_test_student_timetable").attributes
+    plan = attrs["schedule_plan"]
+    assert attrs["schedule_type"] == "adaptive"
+    # One lesson on Sunday: school ends 08:20, then half-hourly until 11:20 and two evening refreshes
+    assert [p["at"][11:16] for p in plan][:3] == ["08:20", "08:50", "09:20"]
+    assert plan[0]["reason"] == "after_school"
+    assert attrs["next_scheduled_refresh"].startswith("2024-01-14T08:20")
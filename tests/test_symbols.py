@@ -0,0 +1,100 @@
+"""Test name interning and the symbol-table cache encoding."""
+
+from custom_components.mashov import symbols
+from custom_components.mashov.symbols import SymbolTable, decode_cache, encode_cache
+
+DATA = {
+    "students": [{"id": "s1", "name": "Test Student", "slug": "test_student"}],
+    "by_slug": {
+        "test_student": {
+            "behavior": [
+                {"lesson": 1, "subject": "Mathematics", "reporter": "Teacher A", "achva_name": "Late"},
+                {"lesson": 2, "subject": "Mathematics", "reporter": None, "achva_name": "Late"},
+            ],
+            "grades": [{"grade": 90, "subjectName": "Mathematics", "teacherName": "Teacher A"}],
+            "timetable": [{"timeTable": {"day": 1}, "groupDetails": {"groupTeachers": [{"teacherName": "Teacher A"}]}}],
+        }
+    },
+    "holidays": [{"id": 1, "name": "Hanukkah"}],
+}
+
+
+def test_intern_returns_one_object_per_name():
+    """Test equal strings come back as the same object and non-strings pass through."""
+    table = SymbolTable()
+    first = table.intern("".join(["Mathe", "matics"]))
+    assert table.intern("".join(["Math", "ematics"])) is first
+    assert table.intern(None) is None
+    assert table.intern(7) == 7
+    assert len(table) == 1
+
+    item = {"subject_name": "".join(["Mathe", "matics"]), "homework": "Page 10"}
+    assert table.intern_fields(item)["subject_name"] is first
+
+
+def test_intern_is_capped(monkeypatch):
+    """Test names past the cap are returned as-is instead of growing the table."""
+    monkeypatch.setattr(symbols, "MAX_SYMBOLS", 2)
+    table = SymbolTable()
+    for name in ("a", "b", "c"):
+        table.intern(name)
+    assert len(table) == 2
+
+
+def test_cache_round_trip():
+    """Test each name is stored once, records refer to it by index and decoding restores the data."""
+    names, encoded = encode_cache(DATA)
+
+    assert sorted(names) == ["Late", "Mathematics", "Teacher A"]
+    behavior = encoded["by_slug"]["test_student"]["behavior"]
+    assert behavior["$refs"] == ["achva_name", "reporter", "subject"]
+    rows = behavior["$rows"]
+    assert rows[0]["subject"] == rows[1]["subject"] == names.index("Mathematics")
+    assert rows[1]["reporter"] is None
+    assert encoded["holidays"] == DATA["holidays"]
+    assert encoded["students"] == DATA["students"]
+
+    table = SymbolTable()
+    decoded = decode_cache(names, encoded, table)
+    assert decoded == DATA
+    grade = decoded["by_slug"]["test_student"]["grades"][0]
+    assert grade["subjectName"] is decoded["by_slug"]["test_student"]["behavior"][1]["subject"]
+    assert table.intern("".join(["Teacher", " A"])) is grade["teacherName"]
+
+
+def test_cache_round_trip_keeps_numbers_in_name_fields():
+    """Test numbers in interned fields stay numbers instead of being read back as symbol indexes."""
+    data = {
+        "by_slug": {
+            "test_student": {
+                "grades": [
+                    {"grade": 90, "gradeType": 0, "subjectName": "Mathematics"},
+                    {"grade": 80, "gradeType": 1, "subjectName": None},
+                    {"grade": 75, "gradeType": 1},
+                    {"grade": 70, "gradeType": "Test", "subjectName": "Mathematics"},
+                ],
+                "behavior": [{"subject": 2}, {"subject": True}],
+            }
+        }
+    }
+
+    names, encoded = encode_cache(data)
+
+    assert names == ["Mathematics"]
+    grades = encoded["by_slug"]["test_student"]["grades"]
+    assert grades["$refs"] == ["subjectName"]
+    assert [g["gradeType"] for g in grades["$rows"]] == [0, 1, 1, "Test"]
+    assert [g.get("subjectName", "-") for g in grades["$rows"]] == [0, None, "-", 0]
+    assert encoded["by_slug"]["test_student"]["behavior"] == [{"subject": 2}, {"subject": True}]
+    assert decode_cache(names, encoded) == data
+
+
+def test_decode_reads_symbol_objects_of_older_caches():
+    """Test caches saved with {"$s": index} names still load, interned into the table."""
+    encoded = {"by_slug": {"test_student": {"behavior": [{"subject": {"$s": 0}, "reporter": "Teacher A"}]}}}
+    table = SymbolTable()
+    decoded = decode_cache(["Mathematics"], encoded, table)
+
+    row = decoded["by_slug"]["test_student"]["behavior"][0]
+    assert row == {"subject": "Mathematics", "reporter": "Teacher A"}
+    assert table.intern("".join(["Teacher", " A"])) is row["reporter"]
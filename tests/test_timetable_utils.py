@@ -0,0 +1,70 @@
+"""Test Mashov timetable utilities."""
+
+from datetime import date
+
+from custom_components.mashov.timetable_utils import (
+    holiday_dates,
+    mashov_day_for_date,
+    materialize_lessons,
+)
+
+from .const import TEST_HOLIDAYS, TEST_TIMETABLE, TEST_WEEKLY_PLAN
+
+# 2024-01-14 is a Sunday (Mashov day 1)
+SUNDAY = date(2024, 1, 14)
+
+
+def test_mashov_day_for_date():
+    """Test Mashov weekday numbering (Sunday=1 ... Saturday=7)."""
+    assert mashov_day_for_date(SUNDAY) == 1
+    assert mashov_day_for_date(date(2024, 1, 15)) == 2
+    assert mashov_day_for_date(date(2024, 1, 20)) == 7
+
+
+def test_holiday_dates_inclusive_end_and_clipped():
+    """Test holiday ranges are expanded with inclusive end, clipped to the window."""
+    result = holiday_dates(TEST_HOLIDAYS, date(2024, 1, 14), date(2024, 1, 21))
+    assert result == {date(2024, 1, 20): "Test Holiday"}
+
+
+def test_materialize_lessons_expands_weekly_slots():
+    """Test each timetable slot becomes one dated instance per matching weekday."""
+    lessons = materialize_lessons(TEST_TIMETABLE, [], [], SUNDAY, 14)
+
+    assert [le["date"] for le in lessons] == ["2024-01-14", "2024-01-21"]
+    assert lessons[0]["day"] == 1
+    assert lessons[0]["lesson"] == 1
+    assert lessons[0]["subject"] == "Mathematics"
+    assert lessons[0]["teacher"] == "Test Teacher"
+    assert lessons[0]["plan"] is None
+
+
+def test_materialize_lessons_skips_holidays():
+    """Test holiday dates produce no lessons."""
+    holidays = [{"start": "2024-01-21T00:00:00", "end": "2024-01-21T00:00:00", "name": "Holiday"}]
+    lessons = materialize_lessons(TEST_TIMETABLE, [], holidays, SUNDAY, 14)
+
+    assert [le["date"] for le in lessons] == ["2024-01-14"]
+
+
+def test_materialize_lessons_joins_weekly_plan():
+    """Test weekly plan text is joined by date, lesson and group."""
+    timetable = [
+        {
+            "timeTable": {"day": 2, "lesson": 1, "groupId": "group-1"},
+            "groupDetails": {"subjectName": "Mathematics"},
+        },
+        {
+            "timeTable": {"day": 2, "lesson": 2, "groupId": "group-2"},
+            "groupDetails": {"subjectName": "History"},
+        },
+    ]
+    lessons = materialize_lessons(timetable, TEST_WEEKLY_PLAN, [], date(2024, 1, 15), 1)
+
+    assert [(le["lesson"], le["plan"]) for le in lessons] == [(1, "Introduction to algebra"), (2, None)]
+
+
+def test_materialize_lessons_empty_inputs():
+    """Test empty timetable or window yields no lessons."""
+    assert materialize_lessons([], TEST_WEEKLY_PLAN, [], SUNDAY, 7) == []
+    assert materialize_lessons(TEST_TIMETABLE, [], [], SUNDAY, 0) == []
@@ -0,0 +1,38 @@
+"""Test refresh phase tracing."""
+
+from custom_components.mashov.tracing import TraceRecorder, span
+
+
+def test_span_is_noop_without_trace():
+    """Test spans outside a refresh record nothing and don't fail."""
+    with span("anything"):
+        pass
+
+
+def test_spans_aggregate_by_name(freezer):
+    """Test repeated spans of the same name are counted and summed."""
+    recorder = TraceRecorder()
+    trace = recorder.start()
+    with span("fetch"):
+        freezer.tick(0.2)
+    for _ in range(3):
+        with span("attributes.homework"):
+            freezer.tick(0.01)
+    trace.finish("ok")
+
+    result = recorder.last.as_dict()
+    assert result["status"] == "ok"
+    assert result["duration_ms"] == 230.0
+    assert result["spans"]["fetch"] == {"count": 1, "total_ms": 200.0, "max_ms": 200.0, "start_ms": 0.0}
+    assert result["spans"]["attributes.homework"]["count"] == 3
+    assert result["spans"]["attributes.homework"]["total_ms"] == 30.0
+
+
+def test_recorder_is_a_ring_buffer():
+    """Test only the last N traces are kept, newest first."""
+    recorder = TraceRecorder(size=2)
+    for _ in range(3):
+        recorder.start().finish("ok")
+
+    assert [t["id"] for t in recorder.as_list()] == [3, 2]
+    assert [t["id"] for t in recorder.as_list(limit=1)] == [3]